@@ -0,0 +1,165 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Aggregated Output Layout
+
+Merges the rules of each language into one output file per format, so an
+IDE stats, reads and glob-matches a handful of files instead of one file
+per rule. Languages with identical globs (e.g. 'cpp' and its alias 'c++',
+or 'vlang' and 'verilog' sharing '.v') form one group. A rule with several
+languages appears in the file of each of them; rules that always apply
+are merged into one file matching every path.
+
+Every rule becomes a section starting with an anchor named after its rule
+ID (e.g. '#codeguard-0-logging'), so links to a rule stay stable while the
+rules around it change.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from formats import BaseFormat, ProcessedRule
+from language_mappings import LANGUAGE_ALIASES, languages_to_globs
+
+# Output layouts of convert_rules
+LAYOUTS = ("per-rule", "aggregated")
+
+# Filename prefix of aggregated outputs; rule IDs start with 'codeguard-<tier>-'
+AGGREGATE_PREFIX = "codeguard-lang-"
+
+# Group name of the rules that always apply
+ALWAYS_GROUP = "all"
+
+
+@dataclass(slots=True)
+class RuleGroup:
+    """
+    Rules merged into one output file per format.
+
+    Attributes:
+        name: Group name used in the filename (e.g. 'python', 'verilog-vlang')
+        globs: Glob patterns shared by the languages of the group, "**/*"
+            for rules that always apply
+        languages: Languages of the group, empty for rules that always apply
+        rules: Rules of the group in filename order
+    """
+
+    name: str
+    globs: str
+    languages: tuple[str, ...]
+    rules: list[ProcessedRule] = field(default_factory=list)
+
+    @property
+    def basename(self) -> str:
+        """Output filename without extension (e.g. 'codeguard-lang-python')."""
+        return f"{AGGREGATE_PREFIX}{self.name}"
+
+
+def group_rules(rules: Iterable[ProcessedRule]) -> list[RuleGroup]:
+    """
+    Group rules by the globs of each of their languages.
+
+    Args:
+        rules: Parsed rules
+
+    Returns:
+        Groups sorted by name, each with its rules sorted by filename
+    """
+    groups: dict[str, RuleGroup] = {}
+    for rule in sorted(rules, key=lambda rule: rule.filename):
+        if not rule.languages:
+            group = groups.get("**/*")
+            if group is None:
+                group = groups["**/*"] = RuleGroup(ALWAYS_GROUP, "**/*", ())
+            group.rules.append(rule)
+            continue
+
+        for language in rule.languages:
+            globs = languages_to_globs([language])
+            if not globs:
+                # Unknown language: nothing to match it by
+                continue
+            group = groups.get(globs)
+            if group is None:
+                group = groups[globs] = RuleGroup("", globs, ())
+            if language not in group.languages:
+                group.languages += (language,)
+            if not group.rules or group.rules[-1] is not rule:
+                group.rules.append(rule)
+
+    for group in groups.values():
+        if group.languages:
+            # Aliases only name the group if their language is not in it
+            names = sorted(
+                {
+                    language
+                    for language in group.languages
+                    if LANGUAGE_ALIASES.get(language) not in group.languages
+                }
+            )
+            group.name = "-".join(name.replace("+", "p") for name in names)
+    return sorted(groups.values(), key=lambda group: group.name)
+
+
+def _rule_id(rule: ProcessedRule) -> str:
+    """Return the rule ID used as section anchor (filename without extension)."""
+    return Path(rule.filename).stem
+
+
+def build_group_content(group: RuleGroup) -> str:
+    """
+    Merge the content of a group's rules into one markdown document.
+
+    The document starts with a list of links to the rule sections, each of
+    which is introduced by an HTML anchor named after the rule ID.
+
+    Args:
+        group: Group to merge
+
+    Returns:
+        Markdown content of the group
+    """
+    title = ", ".join(group.languages) if group.languages else "all files"
+    parts = [f"# CodeGuard: {title}\n"]
+    parts.extend(
+        f"- [{rule.description}](#{_rule_id(rule)})" for rule in group.rules
+    )
+    for rule in group.rules:
+        content = rule.content
+        if rule.body is not None:
+            content += rule.body.read_text()
+        parts.append(f'\n<a id="{_rule_id(rule)}"></a>\n\n{content.strip()}')
+    return "\n".join(parts) + "\n"
+
+
+def render_group(group: RuleGroup, format_handler: BaseFormat, content: str) -> str:
+    """
+    Generate the output of a group for one format.
+
+    The group is rendered like a single rule with the merged content, so
+    every format produces its usual frontmatter.
+
+    Args:
+        group: Group to render
+        format_handler: Format to generate
+        content: Merged content from build_group_content
+
+    Returns:
+        Complete file content
+    """
+    if group.languages:
+        description = f"Security rules for {', '.join(group.languages)} files"
+    else:
+        description = "Security rules for all files"
+    count = f"{len(group.rules)} rule{'s' if len(group.rules) != 1 else ''}"
+    rule = ProcessedRule(
+        description=f"{description} ({count})",
+        languages=group.languages,
+        always_apply=not group.languages,
+        content=content,
+        filename=f"{group.basename}.md",
+    )
+    return format_handler.generate(rule, format_handler.format_globs(group.globs))
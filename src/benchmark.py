@@ -0,0 +1,668 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Converter Benchmark
+
+Synthesizes rule corpora of configurable size and times each stage of the
+conversion pipeline separately: reading, parsing, glob generation, every
+format's generate() and writing. Results are stored as JSON so runs from
+different commits can be compared.
+
+Usage:
+    python benchmark.py --sizes 10,1000,100000 --output bench.json
+    python benchmark.py --sizes 1000 --compare bench.json
+    python benchmark.py --sizes "" --startup
+    python benchmark.py --sizes "" --memory 10000
+    python benchmark.py --sizes "" --pack ../rules
+"""
+
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from corpus import (
+    STREAMING_THRESHOLD,
+    RuleCorpus,
+    build_rule,
+    find_rule_files,
+    validate_frontmatter,
+)
+from language_mappings import LANGUAGE_ALIASES, LANGUAGE_TO_EXTENSIONS
+from rule_pack import RulePack, write_pack
+from unified_to_all import create_converter
+from utils import parse_frontmatter_and_content
+from writer import write_if_changed
+
+# Bump when stages are added or measured differently
+BENCHMARK_SCHEMA = 1
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_BODY_SIZES = [512, 4096, 32768]
+
+# Cold start target for a single-rule conversion (e.g. an editor save hook)
+STARTUP_BUDGET_MS = 50
+
+_WORDS = (
+    "validate input output encode escape token secret session cookie header "
+    "request response query parameter buffer length boundary certificate key "
+    "cipher hash salt random nonce origin redirect upload path permission"
+).split()
+
+
+def synthesize_rule(
+    rng: random.Random, index: int, body_size: int, max_languages: int = 8
+) -> str:
+    """
+    Build the content of a synthetic rule file.
+
+    About one rule in ten applies to all files; the others get between one
+    and max_languages languages. Descriptions sometimes contain characters
+    that require YAML quoting.
+
+    Args:
+        rng: Random number generator (seeded for reproducible corpora)
+        index: Rule number, used in the title
+        body_size: Approximate size of the markdown body in characters
+        max_languages: Maximum number of languages per rule
+
+    Returns:
+        Rule file content with frontmatter
+    """
+    languages = [lang for lang in LANGUAGE_TO_EXTENSIONS if lang not in LANGUAGE_ALIASES]
+    description = " ".join(rng.choices(_WORDS, k=rng.randint(4, 16))).capitalize()
+    if rng.random() < 0.2:
+        description += ": " + rng.choice(_WORDS)
+
+    lines = ["---", f"description: {json.dumps(description)}"]
+    if rng.random() < 0.1:
+        lines.append("alwaysApply: true")
+    else:
+        lines.append("languages:")
+        for lang in rng.sample(languages, rng.randint(1, max_languages)):
+            lines.append(f"- {lang}")
+        lines.append("alwaysApply: false")
+    lines.extend(["---", "", f"# Synthetic rule {index}", ""])
+
+    body = []
+    size = 0
+    while size < body_size:
+        if rng.random() < 0.1:
+            line = f"## {' '.join(rng.choices(_WORDS, k=3)).title()}\n"
+        else:
+            line = "- " + " ".join(rng.choices(_WORDS, k=rng.randint(6, 18))) + "\n"
+        body.append(line)
+        size += len(line)
+
+    return "\n".join(lines) + "\n" + "".join(body)
+
+
+def synthesize_corpus(
+    directory: Path, count: int, body_sizes: list[int], seed: int = 0
+) -> list[Path]:
+    """
+    Write a synthetic corpus of rule files.
+
+    Args:
+        directory: Directory to write the rules to
+        count: Number of rules
+        body_sizes: Body sizes to pick from for each rule
+        seed: Random seed
+
+    Returns:
+        Paths of the written rule files
+    """
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = directory / f"bench-{index:06d}.md"
+        path.write_text(
+            synthesize_rule(rng, index, rng.choice(body_sizes)), encoding="utf-8"
+        )
+        paths.append(path)
+    return paths
+
+
+def run_benchmark(
+    count: int,
+    body_sizes: list[int],
+    seed: int = 0,
+    repeat: int = 1,
+    version: str = "0.0.0",
+) -> dict:
+    """
+    Time every conversion stage on a synthetic corpus.
+
+    Stages are measured in separate passes over the whole corpus so that
+    their timings do not include each other. 'write' writes every output to
+    an empty directory, 'rewrite' repeats it when all files are up to date.
+    With repeat > 1 the fastest time of each stage is reported, which is
+    the least noisy figure for comparisons between commits.
+
+    Args:
+        count: Number of rules
+        body_sizes: Body sizes to pick from for each rule
+        seed: Random seed
+        repeat: Number of times each stage is measured
+        version: Version written into the generated files
+
+    Returns:
+        Dictionary with corpus statistics and per-stage timings
+    """
+    converter = create_converter(version)
+    timings: dict[str, float] = {}
+
+    def record(stage: str, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        timings[stage] = min(elapsed, timings.get(stage, elapsed))
+
+    with tempfile.TemporaryDirectory(prefix="codeguard-bench-") as tmp:
+        tmp_path = Path(tmp)
+        paths = synthesize_corpus(tmp_path / "rules", count, body_sizes, seed)
+
+        for attempt in range(repeat):
+            output_dir = tmp_path / f"out-{attempt}"
+
+            start = time.perf_counter()
+            contents = [path.read_text(encoding="utf-8") for path in paths]
+            record("read", start)
+
+            start = time.perf_counter()
+            rules = []
+            for path, content in zip(paths, contents):
+                frontmatter, markdown_content = parse_frontmatter_and_content(content)
+                errors, _ = validate_frontmatter(frontmatter, markdown_content)
+                if errors:
+                    raise ValueError(f"Invalid synthetic rule {path.name}: {errors}")
+                rules.append(build_rule(frontmatter, markdown_content, path.name))
+            record("parse", start)
+
+            start = time.perf_counter()
+            globs = [converter.generate_globs(rule.languages) for rule in rules]
+            record("globs", start)
+
+            generated = []
+            for format_handler in converter.formats:
+                start = time.perf_counter()
+                outputs = [
+                    format_handler.generate(rule, rule_globs)
+                    for rule, rule_globs in zip(rules, globs)
+                ]
+                record(f"generate.{format_handler.get_format_name()}", start)
+                subdir = output_dir / format_handler.get_output_subpath()
+                extension = format_handler.get_file_extension()
+                generated.extend(
+                    (subdir / f"{Path(rule.filename).stem}{extension}", content)
+                    for rule, content in zip(rules, outputs)
+                )
+
+            for stage in ("write", "rewrite"):
+                start = time.perf_counter()
+                for output_file, content in generated:
+                    write_if_changed(output_file, content)
+                record(stage, start)
+
+    input_bytes = sum(len(content.encode("utf-8")) for content in contents)
+    return {
+        "rules": count,
+        "outputs": len(generated),
+        "input_bytes": input_bytes,
+        "stages": {
+            stage: {
+                "seconds": round(seconds, 6),
+                "us_per_rule": round(seconds / count * 1e6, 2) if count else 0.0,
+            }
+            for stage, seconds in timings.items()
+        },
+        "total_seconds": round(sum(timings.values()), 6),
+    }
+
+
+def run_memory_benchmark(count: int, body_sizes: list[int], seed: int) -> dict:
+    """
+    Measure the memory held per rule with tracemalloc.
+
+    The corpus is loaded once with bodies in memory and once with bodies
+    left on disk (stream_threshold=0). Rendering is measured both by
+    accumulating every ConversionResult in a list and by iterating
+    render_many, which holds one result at a time.
+
+    Args:
+        count: Number of synthetic rules
+        body_sizes: Body sizes in bytes, cycled through the rules
+        seed: Random seed for the synthetic corpus
+
+    Returns:
+        Dictionary of bytes per rule (and peak bytes of the generator)
+    """
+    with tempfile.TemporaryDirectory(prefix="codeguard-bench-") as tmp:
+        rule_files = synthesize_corpus(Path(tmp), count, body_sizes, seed)
+        file_bytes = sum(f.stat().st_size for f in rule_files)
+        converter = create_converter("0.0.0-bench")
+
+        def traced() -> int:
+            gc.collect()
+            return tracemalloc.get_traced_memory()[0]
+
+        tracemalloc.start()
+        try:
+            before = traced()
+            corpus = RuleCorpus.load(rule_files, stream_threshold=0)
+            on_disk = traced() - before
+            del corpus
+
+            before = traced()
+            corpus = RuleCorpus.load(rule_files, stream_threshold=STREAMING_THRESHOLD)
+            loaded = traced() - before
+
+            before = traced()
+            tracemalloc.reset_peak()
+            results = [converter.render(rule) for rule in corpus.rules]
+            render_list = tracemalloc.get_traced_memory()[1] - before
+            del results
+
+            before = traced()
+            tracemalloc.reset_peak()
+            for _ in converter.render_many(corpus.rules):
+                pass
+            render_generator = tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "rules": count,
+        "file_bytes_per_rule": round(file_bytes / count),
+        "loaded_bytes_per_rule": round(loaded / count),
+        "on_disk_bytes_per_rule": round(on_disk / count),
+        "render_list_bytes_per_rule": round(render_list / count),
+        "render_generator_peak_bytes": render_generator,
+    }
+
+
+def print_memory(memory: dict, baseline: dict | None = None) -> None:
+    """
+    Print memory measurements, with the change against a baseline run.
+
+    Args:
+        memory: Result of run_memory_benchmark
+        baseline: Memory result of an earlier run
+    """
+    print(f"\nMemory ({memory['rules']} rules):")
+    for key, value in memory.items():
+        if key == "rules":
+            continue
+        line = f"  {key:<30} {value:>12,}"
+        if baseline and baseline.get(key):
+            change = (value - baseline[key]) / baseline[key] * 100
+            line += f"  {change:+6.1f}%"
+        print(line)
+
+
+def _time_command(command: list[str], repeat: int) -> float:
+    """Return the fastest wall time of a command in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            command,
+            cwd=Path(__file__).parent,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_startup_benchmark(repeat: int = 10, top: int = 10) -> dict:
+    """
+    Measure the cold start of the command line tool.
+
+    Each measurement starts a fresh interpreter: an empty one as baseline,
+    one importing unified_to_all, and a full conversion of a single rule.
+    The slowest imports are taken from python -X importtime.
+
+    Args:
+        repeat: Number of runs per measurement (the fastest is reported)
+        top: Number of slowest imports to report
+
+    Returns:
+        Dictionary with wall times in milliseconds and the slowest imports
+    """
+    python = sys.executable
+    with tempfile.TemporaryDirectory(prefix="codeguard-bench-") as tmp:
+        tmp_path = Path(tmp)
+        rule_file = synthesize_corpus(tmp_path / "rules", 1, [4096])[0]
+        timings = {
+            "interpreter_ms": _time_command([python, "-c", "pass"], repeat),
+            "import_ms": _time_command([python, "-c", "import unified_to_all"], repeat),
+            "convert_one_ms": _time_command(
+                # cursor only: SKILL.md needs the template next to a rules folder
+                [
+                    python,
+                    "unified_to_all.py",
+                    str(rule_file),
+                    str(tmp_path / "out"),
+                    "--formats",
+                    "cursor",
+                ],
+                repeat,
+            ),
+        }
+
+    importtime = subprocess.run(
+        [python, "-X", "importtime", "-c", "import unified_to_all"],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    imports = []
+    for line in importtime.splitlines()[1:]:
+        # "import time:  self [us] | cumulative | imported package"
+        _, _, fields = line.partition(":")
+        self_us, cumulative_us, module = fields.split("|")
+        imports.append(
+            {
+                "module": module.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    imports.sort(key=lambda item: item["self_us"], reverse=True)
+
+    return {**{k: round(v, 1) for k, v in timings.items()}, "slowest_imports": imports[:top]}
+
+
+def print_startup(startup: dict, baseline: dict | None = None) -> None:
+    """
+    Print startup timings, with the change against a baseline run.
+
+    Args:
+        startup: Result of run_startup_benchmark
+        baseline: Startup result of an earlier run
+    """
+    print("\nStartup:")
+    for key in ("interpreter_ms", "import_ms", "convert_one_ms"):
+        line = f"  {key:<22} {startup[key]:>10.1f} ms"
+        if baseline and baseline.get(key):
+            change = (startup[key] - baseline[key]) / baseline[key] * 100
+            line += f"  {change:+6.1f}%"
+        print(line)
+    status = "within" if startup["convert_one_ms"] <= STARTUP_BUDGET_MS else "over"
+    print(f"  Single-rule conversion is {status} the {STARTUP_BUDGET_MS} ms budget")
+    print("  Slowest imports (self time):")
+    for item in startup["slowest_imports"]:
+        print(f"    {item['module']:<30} {item['self_us'] / 1000:>7.1f} ms")
+
+
+def _best_ms(function, repeat: int) -> float:
+    """Return the fastest wall time of a call in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_pack_benchmark(rules_dir: Path, repeat: int = 10, lookups: int = 10000) -> dict:
+    """
+    Compare loading a rule folder by parsing it with loading its rule pack.
+
+    In-process timings are the fastest of several runs with warm file
+    caches. The cold timings start a fresh interpreter that parses the
+    folder, or opens the pack and loads every rule, so they include
+    interpreter startup and imports.
+
+    Args:
+        rules_dir: Folder with rule files (e.g. rules/)
+        repeat: Number of runs per measurement (the fastest is reported)
+        lookups: Number of random lookups by rule ID to average
+
+    Returns:
+        Dictionary with wall times and the pack size
+    """
+    rule_files = find_rule_files(rules_dir)
+    corpus = RuleCorpus.load(rule_files)
+    python = sys.executable
+
+    with tempfile.TemporaryDirectory(prefix="codeguard-bench-") as tmp:
+        pack_path = Path(tmp) / "rules.pack"
+        write_pack(corpus.rules, pack_path)
+
+        def load_pack():
+            with RulePack(pack_path) as pack:
+                for rule_id in pack.rule_ids():
+                    pack.get(rule_id)
+
+        with RulePack(pack_path) as pack:
+            rule_ids = list(pack.rule_ids())
+            samples = [random.choice(rule_ids) for _ in range(lookups)]
+            language = max(pack.languages, key=lambda lang: len(pack.rules_for_language(lang)))
+            lookup_ms = _best_ms(lambda: [pack.get(rule_id) for rule_id in samples], repeat)
+            filter_ms = _best_ms(lambda: pack.rules_for_language(language), repeat)
+
+        results = {
+            "rules": len(corpus),
+            "rules_bytes": sum(f.stat().st_size for f in rule_files),
+            "pack_bytes": pack_path.stat().st_size,
+            "parse_ms": _best_ms(lambda: RuleCorpus.load(rule_files), repeat),
+            "pack_open_ms": _best_ms(lambda: RulePack(pack_path).close(), repeat),
+            "pack_load_ms": _best_ms(load_pack, repeat),
+            "pack_lookup_us": lookup_ms * 1000 / lookups,
+            "pack_filter_us": filter_ms * 1000,
+            "cold_parse_ms": _time_command(
+                [
+                    python,
+                    "-c",
+                    "import sys; from corpus import RuleCorpus, find_rule_files; "
+                    "RuleCorpus.load(find_rule_files(sys.argv[1]))",
+                    str(Path(rules_dir).resolve()),
+                ],
+                repeat,
+            ),
+            "cold_pack_ms": _time_command(
+                [
+                    python,
+                    "-c",
+                    "import sys; from rule_pack import RulePack; "
+                    "pack = RulePack(sys.argv[1]); [pack.get(i) for i in pack.rule_ids()]",
+                    str(pack_path),
+                ],
+                repeat,
+            ),
+        }
+
+    return {
+        key: round(value, 3) if isinstance(value, float) else value
+        for key, value in results.items()
+    }
+
+
+def print_pack(pack: dict, baseline: dict | None = None) -> None:
+    """
+    Print rule pack timings, with the change against a baseline run.
+
+    Args:
+        pack: Result of run_pack_benchmark
+        baseline: Pack result of an earlier run
+    """
+    print(
+        f"\nRule pack ({pack['rules']} rules, {pack['rules_bytes']:,} bytes of "
+        f"markdown, {pack['pack_bytes']:,} bytes packed):"
+    )
+    for key, unit in (
+        ("parse_ms", "ms"),
+        ("pack_open_ms", "ms"),
+        ("pack_load_ms", "ms"),
+        ("pack_lookup_us", "us"),
+        ("pack_filter_us", "us"),
+        ("cold_parse_ms", "ms"),
+        ("cold_pack_ms", "ms"),
+    ):
+        line = f"  {key:<22} {pack[key]:>10.3f} {unit}"
+        if baseline and baseline.get(key):
+            change = (pack[key] - baseline[key]) / baseline[key] * 100
+            line += f"  {change:+6.1f}%"
+        print(line)
+    if pack["pack_load_ms"]:
+        print(f"  Loading the pack is {pack['parse_ms'] / pack['pack_load_ms']:.1f}x faster than parsing")
+
+
+def _git_commit() -> str | None:
+    """Return the current git commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_run(run: dict, baseline: dict | None = None) -> None:
+    """
+    Print the stage timings of one run, with the change against a baseline run.
+
+    Args:
+        run: Result of run_benchmark
+        baseline: Result for the same corpus size from an earlier run
+    """
+    print(f"\n{run['rules']} rules ({run['input_bytes'] / 1e6:.1f} MB input):")
+    base_stages = baseline["stages"] if baseline else {}
+    for stage, timing in run["stages"].items():
+        line = f"  {stage:<22} {timing['seconds']:>10.4f}s {timing['us_per_rule']:>12.1f} µs/rule"
+        base = base_stages.get(stage)
+        if base and base["seconds"]:
+            change = (timing["seconds"] - base["seconds"]) / base["seconds"] * 100
+            line += f"  {change:+6.1f}%"
+        print(line)
+    print(f"  {'total':<22} {run['total_seconds']:>10.4f}s")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the stages of the rule converter on synthetic corpora.",
+        epilog=(
+            "Examples:\n"
+            "  python benchmark.py --sizes 10,1000,100000 --output bench.json\n"
+            "  python benchmark.py --compare bench.json\n"
+            "  python benchmark.py --sizes '' --startup\n"
+            "  python benchmark.py --sizes '' --pack ../rules"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(map(str, DEFAULT_SIZES)),
+        help="comma-separated corpus sizes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--body-sizes",
+        default=",".join(map(str, DEFAULT_BODY_SIZES)),
+        help="comma-separated rule body sizes in characters (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="measure each stage N times and keep the fastest (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="also measure interpreter startup, import time and a single-rule run",
+    )
+    parser.add_argument(
+        "--memory",
+        type=int,
+        default=0,
+        metavar="COUNT",
+        help="also measure memory per rule for a corpus of COUNT rules",
+    )
+    parser.add_argument(
+        "--pack",
+        metavar="RULES_DIR",
+        help="also compare parsing a rule folder with loading its rule pack",
+    )
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument(
+        "--compare", help="JSON results of an earlier run to compare against"
+    )
+    args = parser.parse_args()
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size]
+        body_sizes = [int(size) for size in args.body_sizes.split(",")]
+    except ValueError:
+        parser.error("--sizes and --body-sizes must be comma-separated integers")
+
+    baseline = {}
+    baseline_runs = {}
+    if args.compare:
+        try:
+            baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot read {args.compare}: {e}")
+            sys.exit(1)
+        baseline_runs = {run["rules"]: run for run in baseline.get("runs", [])}
+        print(f"Comparing against {args.compare} (commit {baseline.get('commit')})")
+
+    results = {
+        "schema": BENCHMARK_SCHEMA,
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "body_sizes": body_sizes,
+        "runs": [],
+    }
+
+    for size in sizes:
+        run = run_benchmark(size, body_sizes, args.seed, max(args.repeat, 1))
+        results["runs"].append(run)
+        print_run(run, baseline_runs.get(size))
+
+    if args.startup:
+        results["startup"] = run_startup_benchmark(max(args.repeat, 1) * 3)
+        print_startup(results["startup"], baseline.get("startup"))
+
+    if args.memory > 0:
+        results["memory"] = run_memory_benchmark(args.memory, body_sizes, args.seed)
+        print_memory(results["memory"], baseline.get("memory"))
+
+    if args.pack:
+        random.seed(args.seed)
+        results["pack"] = run_pack_benchmark(Path(args.pack), max(args.repeat, 1) * 3)
+        print_pack(results["pack"], baseline.get("pack"))
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
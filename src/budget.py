@@ -0,0 +1,283 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Token Budget
+
+Estimates how much of an agent's context window the generated rule files
+take, totals it per language and trims rules to fit a per-language budget.
+
+Token counts are estimated without a tokenizer: ASCII text is counted at
+CHARS_PER_TOKEN characters per token and every other character (e.g.
+Japanese) as one token, which errs on the side of larger counts.
+"""
+
+from dataclasses import replace
+from typing import NamedTuple
+
+from corpus import RuleEntry, intern_languages
+from manifest import LanguageIndex
+from rule_body import RuleBody
+
+# Average number of ASCII characters per token (English prose and code)
+CHARS_PER_TOKEN = 4
+
+# Bytes counted at a time for rule bodies streamed from disk
+_CHUNK_SIZE = 1024 * 1024
+
+# UTF-8 bytes that are not ASCII, and the continuation bytes among them
+_NON_ASCII_BYTES = bytes(range(0x80, 0x100))
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+# Row label of rules that apply to every language
+ALWAYS_APPLY = "(always)"
+
+
+class RuleSize(NamedTuple):
+    """
+    Estimated size of a generated rule file.
+
+    A plain tuple, so it is stored as [bytes, tokens] in the language index
+    and the output cache.
+
+    Attributes:
+        bytes: Size in bytes (UTF-8)
+        tokens: Estimated number of tokens
+    """
+
+    bytes: int
+    tokens: int
+
+
+def _count_characters(data: bytes) -> tuple[int, int]:
+    """Return (ASCII characters, other characters) of UTF-8 encoded text."""
+    non_ascii = len(data) - len(data.translate(None, _NON_ASCII_BYTES))
+    if not non_ascii:
+        return len(data), 0
+    continuation = len(data) - len(data.translate(None, _CONTINUATION_BYTES))
+    return len(data) - non_ascii, non_ascii - continuation
+
+
+def estimate_size(*parts: str | bytes | RuleBody) -> RuleSize:
+    """
+    Estimate the size of text made of several parts.
+
+    Args:
+        *parts: Text, UTF-8 bytes, or a rule body streamed from disk
+
+    Returns:
+        RuleSize of the concatenated parts
+    """
+    size_bytes = ascii_chars = other_chars = 0
+    for part in parts:
+        if isinstance(part, str):
+            if part.isascii():
+                size_bytes += len(part)
+                ascii_chars += len(part)
+                continue
+            part = part.encode("utf-8")
+
+        if isinstance(part, RuleBody):
+            chunks = []
+            with part.view() as data:
+                for offset in range(0, len(data), _CHUNK_SIZE):
+                    chunks.append(_count_characters(bytes(data[offset : offset + _CHUNK_SIZE])))
+            size_bytes += part.length
+        else:
+            chunks = [_count_characters(bytes(part))]
+            size_bytes += len(part)
+
+        for ascii_count, other_count in chunks:
+            ascii_chars += ascii_count
+            other_chars += other_count
+
+    tokens = -(-ascii_chars // CHARS_PER_TOKEN) + other_chars
+    return RuleSize(size_bytes, tokens)
+
+
+def measure_result(result) -> RuleSize:
+    """
+    Estimate the largest output of a converted rule.
+
+    The body shared by the outputs is measured once.
+
+    Args:
+        result: ConversionResult of one rule
+
+    Returns:
+        RuleSize of the largest output file
+    """
+    body_sizes = {}
+    largest = RuleSize(0, 0)
+    for output in result.outputs.values():
+        if output.body is None:
+            size = estimate_size(output.content)
+        else:
+            body = body_sizes.get(id(output.body))
+            if body is None:
+                body = body_sizes[id(output.body)] = estimate_size(output.body)
+            frame = estimate_size(output.content, output.suffix)
+            size = RuleSize(body.bytes + frame.bytes, body.tokens + frame.tokens)
+        largest = max(largest, size, key=lambda item: item.tokens)
+    return largest
+
+
+def language_totals(index: LanguageIndex) -> dict[str, tuple[int, RuleSize]]:
+    """
+    Total the rule sizes of an output directory per language.
+
+    Rules that apply to every language are totaled under ALWAYS_APPLY and
+    also counted in every language, since they are loaded for all files.
+
+    Args:
+        index: Language index with rule sizes
+
+    Returns:
+        Mapping of language to (number of rules, total RuleSize), sorted by
+        language with ALWAYS_APPLY first
+    """
+    always = [
+        RuleSize(*index.sizes.get(rule_key, (0, 0)))
+        for rule_key, languages in index.rules.items()
+        if not languages
+    ]
+    always_total = RuleSize(sum(s.bytes for s in always), sum(s.tokens for s in always))
+
+    totals = {}
+    for language, rule_keys in sorted(index.language_to_rules().items()):
+        sizes = [RuleSize(*index.sizes.get(rule_key, (0, 0))) for rule_key in rule_keys]
+        totals[language] = (
+            len(sizes) + len(always),
+            RuleSize(
+                sum(s.bytes for s in sizes) + always_total.bytes,
+                sum(s.tokens for s in sizes) + always_total.tokens,
+            ),
+        )
+    return {ALWAYS_APPLY: (len(always), always_total), **totals}
+
+
+def format_budget_report(
+    index: LanguageIndex, budget: int | None = None
+) -> str:
+    """
+    Render the per-language totals of an output directory as a table.
+
+    Args:
+        index: Language index with rule sizes
+        budget: Token budget per language, marks languages over it
+
+    Returns:
+        Markdown table of rules, bytes and estimated tokens per language
+    """
+    lines = [
+        "| Language | Rules | Bytes | Tokens (est.) |",
+        "|----------|------:|------:|--------------:|",
+    ]
+    for language, (count, size) in language_totals(index).items():
+        marker = " ⚠️" if budget is not None and size.tokens > budget else ""
+        lines.append(
+            f"| {language} | {count} | {size.bytes:,} | {size.tokens:,}{marker} |"
+        )
+    return "\n".join(lines)
+
+
+def _tier(filename: str) -> int:
+    """Return the tier of a rule ID like 'codeguard-1-...' (higher is more important)."""
+    parts = filename.split("-", 2)
+    return int(parts[1]) if len(parts) == 3 and parts[1].isdigit() else 0
+
+
+def plan_budget(
+    rules: list[tuple[str, tuple[str, ...], RuleSize]], budget: int
+) -> dict[str, tuple[str, ...]]:
+    """
+    Choose the languages each rule is kept for within a per-language budget.
+
+    Rules that apply to every language are always kept and count against
+    every language. The other rules are taken greedily by priority: higher
+    tier first ('codeguard-1-...' before 'codeguard-0-...'), then smaller
+    rules, then by filename. A rule keeps each of its languages that still
+    has room for it.
+
+    Args:
+        rules: (filename, languages, size) of every rule; empty languages
+            means the rule always applies
+        budget: Token budget per language
+
+    Returns:
+        Languages kept per filename (empty for rules that always apply or
+        were dropped for every language)
+    """
+    always_tokens = sum(size.tokens for _, languages, size in rules if not languages)
+    remaining = {}
+
+    kept = {}
+    ordered = sorted(
+        (rule for rule in rules if rule[1]),
+        key=lambda rule: (-_tier(rule[0]), rule[2].tokens, rule[0]),
+    )
+    for filename, languages, size in ordered:
+        kept_languages = []
+        for language in languages:
+            left = remaining.setdefault(language, budget - always_tokens)
+            if size.tokens <= left:
+                remaining[language] = left - size.tokens
+                kept_languages.append(language)
+        kept[filename] = tuple(kept_languages)
+
+    for filename, languages, _ in rules:
+        if not languages:
+            kept[filename] = ()
+    return kept
+
+
+def apply_token_budget(
+    entries: list[RuleEntry], converter, budget: int
+) -> tuple[list[RuleEntry], dict[str, list[str]]]:
+    """
+    Trim the languages of rules to fit a per-language token budget.
+
+    Rules keep only the languages chosen by plan_budget, which narrows the
+    globs of their outputs; rules left without languages are dropped.
+    Invalid entries are passed through so their errors are still reported.
+
+    Args:
+        entries: Loaded rules
+        converter: RuleConverter used to measure the outputs
+        budget: Token budget per language
+
+    Returns:
+        Tuple of (entries to convert, dropped languages per trimmed rule
+        filename; an empty list means the whole rule was dropped)
+    """
+    measured = [
+        (entry.filename, entry.rule.languages, measure_result(converter.render(entry.rule)))
+        for entry in entries
+        if entry.rule is not None
+    ]
+    plan = plan_budget(measured, budget)
+
+    kept_entries = []
+    trimmed = {}
+    for entry in entries:
+        if entry.rule is None or not entry.rule.languages:
+            kept_entries.append(entry)
+            continue
+
+        languages = plan[entry.filename]
+        if languages == entry.rule.languages:
+            kept_entries.append(entry)
+            continue
+
+        if not languages:
+            trimmed[entry.filename] = []
+            continue
+        trimmed[entry.filename] = [
+            language for language in entry.rule.languages if language not in languages
+        ]
+        kept_entries.append(
+            replace(entry, rule=replace(entry.rule, languages=intern_languages(languages)))
+        )
+
+    return kept_entries, trimmed
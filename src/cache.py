@@ -0,0 +1,287 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Output Cache
+
+Content-addressed on-disk cache of generated rule files, shared between
+all repositories and runs on a machine. A rule whose content, filename,
+format, version and generator are unchanged is served by copying the
+cached file instead of parsing and converting it again.
+
+Usage:
+    python cache.py              # show location, size and entry count
+    python cache.py --clear      # delete all cached outputs
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+from converter import GENERATOR_VERSION
+from language_mappings import LANGUAGE_TO_EXTENSIONS
+from writer import atomic_write_bytes
+
+# Bump when the cache layout changes; old layouts are ignored
+CACHE_SCHEMA = 1
+
+# Default size limit of the cache in bytes
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Generated globs depend on the language mappings, so they are part of every key
+_MAPPINGS_FINGERPRINT = hashlib.sha256(
+    json.dumps(LANGUAGE_TO_EXTENSIONS, sort_keys=True).encode("utf-8")
+).hexdigest()
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the cache directory used when none is given.
+
+    Returns:
+        $CODEGUARD_CACHE_DIR, else $XDG_CACHE_HOME/codeguard, else ~/.cache/codeguard
+    """
+    if os.environ.get("CODEGUARD_CACHE_DIR"):
+        return Path(os.environ["CODEGUARD_CACHE_DIR"])
+    if os.environ.get("XDG_CACHE_HOME"):
+        return Path(os.environ["XDG_CACHE_HOME"]) / "codeguard"
+    return Path.home() / ".cache" / "codeguard"
+
+
+def _digest(*parts: object) -> str:
+    """Hash key components into a cache key."""
+    return hashlib.sha256("\0".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedRule:
+    """
+    Represents the cached conversion of a single rule file.
+
+    Attributes:
+        languages: Languages the rule applies to (empty if always applies)
+        objects: Cached output file per format name
+        size: Estimated (bytes, tokens) of the rule's output, if recorded
+    """
+
+    languages: list[str]
+    objects: dict[str, Path]
+    size: tuple[int, int] | None = None
+
+
+class OutputCache:
+    """
+    Size-bounded cache of generated outputs, keyed by rule content.
+
+    Each output is stored under a key derived from (rule content hash, rule
+    filename, format name, format version, GENERATOR_VERSION, language
+    mappings); the rule's languages are stored next to them. The
+    modification time of a cached file records its last use, and evict()
+    removes the least recently used files once the cache exceeds its size
+    limit. Files are written atomically, so concurrent runs can share a
+    cache.
+
+    Example:
+        cache = OutputCache()
+        cached = cache.lookup(content_hash, "my-rule.md", formats)
+        if cached is None:
+            ...  # convert, write outputs
+            cache.store(content_hash, "my-rule.md", languages, output_files)
+        cache.evict()
+        print(cache.stats)
+    """
+
+    def __init__(self, directory: Path | None = None, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Cache directory (default: default_cache_dir())
+            max_size: Size limit in bytes enforced by evict()
+        """
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.root = self.directory / f"v{CACHE_SCHEMA}"
+        self.max_size = max_size
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    def _path(self, key: str, suffix: str = "") -> Path:
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def _rule_key(self, content_hash: str, filename: str) -> str:
+        return _digest(content_hash, filename, GENERATOR_VERSION, _MAPPINGS_FINGERPRINT)
+
+    def _output_key(self, content_hash: str, filename: str, format_handler) -> str:
+        return _digest(
+            content_hash,
+            filename,
+            format_handler.get_format_name(),
+            format_handler.version,
+            GENERATOR_VERSION,
+            _MAPPINGS_FINGERPRINT,
+        )
+
+    def lookup(self, content_hash: str, filename: str, formats: list) -> CachedRule | None:
+        """
+        Find the cached outputs of a rule for every given format.
+
+        A hit marks the cached files as recently used.
+
+        Args:
+            content_hash: SHA-256 of the rule file
+            filename: Rule filename
+            formats: BaseFormat instances that must all be cached
+
+        Returns:
+            CachedRule, or None unless every format is cached
+        """
+        rule_path = self._path(self._rule_key(content_hash, filename), ".json")
+        try:
+            data = json.loads(rule_path.read_text(encoding="utf-8"))
+            languages = data["languages"]
+            size = tuple(data["size"]) if data.get("size") else None
+            objects = {
+                format_handler.get_format_name(): self._path(
+                    self._output_key(content_hash, filename, format_handler)
+                )
+                for format_handler in formats
+            }
+            for cached_file in (rule_path, *objects.values()):
+                os.utime(cached_file)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return CachedRule(languages=list(languages), objects=objects, size=size)
+
+    def store(
+        self,
+        content_hash: str,
+        filename: str,
+        languages: list[str],
+        outputs: dict,
+        size: tuple[int, int] | None = None,
+    ) -> None:
+        """
+        Add the generated outputs of a rule to the cache.
+
+        Failures (e.g. a read-only cache directory) are ignored; the cache
+        is an optimization only.
+
+        Args:
+            content_hash: SHA-256 of the rule file
+            filename: Rule filename
+            languages: Languages the rule applies to
+            outputs: Mapping of BaseFormat instance to the generated file
+            size: Estimated (bytes, tokens) of the rule's output
+        """
+        try:
+            for format_handler, output_file in outputs.items():
+                cached_file = self._path(
+                    self._output_key(content_hash, filename, format_handler)
+                )
+                cached_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = cached_file.with_name(f".{cached_file.name}.{os.getpid()}.tmp")
+                shutil.copyfile(output_file, tmp_file)
+                os.replace(tmp_file, cached_file)
+
+            rule_path = self._path(self._rule_key(content_hash, filename), ".json")
+            rule_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(
+                rule_path,
+                json.dumps({"languages": list(languages), "size": size}).encode("utf-8"),
+            )
+        except OSError:
+            return
+        self.stats["stored"] += 1
+
+    def _files(self) -> list[tuple[float, int, Path]]:
+        """Return (mtime, size, path) of every cached file."""
+        files = []
+        if not self.root.is_dir():
+            return files
+        for subdir in os.scandir(self.root):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        return files
+
+    def size(self) -> tuple[int, int]:
+        """
+        Measure the cache.
+
+        Returns:
+            Tuple of (number of files, total size in bytes)
+        """
+        files = self._files()
+        return len(files), sum(size for _, size, _ in files)
+
+    def evict(self) -> int:
+        """
+        Delete least recently used files until the cache fits its size limit.
+
+        Returns:
+            Number of deleted files
+        """
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        for _, size, cached_file in sorted(files):
+            if total <= self.max_size:
+                break
+            try:
+                cached_file.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        self.stats["evicted"] += evicted
+        return evicted
+
+    def clear(self) -> None:
+        """Delete every cached file."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def summary(self) -> str:
+        """Return a one-line summary of this run's statistics."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        rate = self.stats["hits"] / lookups * 100 if lookups else 0.0
+        return (
+            f"Cache: {self.stats['hits']} hits, {self.stats['misses']} misses "
+            f"({rate:.0f}% hit rate), {self.stats['stored']} stored, "
+            f"{self.stats['evicted']} evicted"
+        )
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the output cache.")
+    parser.add_argument(
+        "--cache-dir", help=f"cache directory (default: {default_cache_dir()})"
+    )
+    parser.add_argument("--clear", action="store_true", help="delete all cached outputs")
+    args = parser.parse_args()
+
+    cache = OutputCache(args.cache_dir)
+    if args.clear:
+        cache.clear()
+        print(f"Cleared {cache.directory}")
+        return
+
+    count, total = cache.size()
+    print(f"Cache directory: {cache.directory}")
+    print(f"Entries: {count} files, {total / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
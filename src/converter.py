@@ -8,36 +8,65 @@ Rule Converter
 Converts unified markdown rules to multiple IDE formats.
 Handles parsing, validation, and format generation.
 """
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, replace
 from pathlib import Path
 
+from corpus import build_rule, load_streamed_rule, validate_frontmatter
 from language_mappings import languages_to_globs
+from rule_body import RuleBody
 from utils import parse_frontmatter_and_content
 from formats import (
     BaseFormat,
     ProcessedRule,
 )
 
+# Bump when the generated output changes for the same rule content and version,
+# so that incremental builds do not reuse outputs from an older generator.
+GENERATOR_VERSION = 1
 
-@dataclass
+
+@dataclass(slots=True)
 class FormatOutput:
     """
     Represents the output for a single format.
 
+    Formats that copy the rule content verbatim share one body between all
+    outputs of a rule: content then holds only the text before the body,
+    and the file consists of content, body and suffix (see full_content).
+
     Attributes:
-        content: The fully formatted content with frontmatter
+        content: The fully formatted content with frontmatter, or the text
+            before the body if body is set
         extension: File extension including dot (e.g., '.mdc')
         subpath: Subdirectory path (e.g., '.cursor/rules', 'skills/software-security/rules')
         outputs_to_ide_rules: Whether this format outputs to ide_rules/ or project root
+        body: Rule body shared by the outputs of a rule, either the content
+            text or, for large rules, a RuleBody streamed from disk
+        suffix: Text after the body
     """
 
     content: str
     extension: str
     subpath: str
     outputs_to_ide_rules: bool
+    body: str | RuleBody | None = None
+    suffix: str = ""
+
+    def full_content(self) -> str:
+        """
+        Return the complete file content.
+
+        Returns:
+            content, body and suffix joined (loads a streamed body)
+        """
+        if self.body is None:
+            return self.content
+        body = self.body if isinstance(self.body, str) else self.body.read_text()
+        return f"{self.content}{body}{self.suffix}"
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversionResult:
     """
     Represents the complete result of converting a rule file.
@@ -46,7 +75,8 @@ class ConversionResult:
         filename: Original filename (e.g., 'my-rule.md')
         basename: Filename without extension (e.g., 'my-rule')
         outputs: Dictionary mapping format names to their outputs
-        languages: List of programming languages the rule applies to, empty list if always applies
+        languages: Programming languages the rule applies to, empty if always applies
+
     Example:
         result = ConversionResult(
             filename="my-rule.md",
@@ -59,14 +89,14 @@ class ConversionResult:
                     outputs_to_ide_rules=True
                 )
             },
-            languages=["python", "javascript"]
+            languages=("python", "javascript")
         )
     """
 
     filename: str
     basename: str
     outputs: dict[str, FormatOutput]
-    languages: list[str]
+    languages: tuple[str, ...]
 
 
 class RuleConverter:
@@ -80,14 +110,16 @@ class RuleConverter:
         - parse_rule(): Parse markdown file with YAML frontmatter
         - generate_globs(): Convert languages to glob patterns
         - convert(): Convert a rule file to all registered formats (returns ConversionResult)
+        - render(): Convert an already parsed ProcessedRule (returns ConversionResult)
+        - render_many(): Convert parsed rules one at a time (yields ConversionResults)
 
     Example:
         # Create converter
         from converter import RuleConverter, ConversionResult, FormatOutput
         from formats import CursorFormat, WindsurfFormat
-        from utils import get_version_from_pyproject
+        from utils import get_version
 
-        version = get_version_from_pyproject()
+        version = get_version()
         converter = RuleConverter(formats=[
             CursorFormat(version),
             WindsurfFormat(version)
@@ -101,7 +133,7 @@ class RuleConverter:
             for format_name, output in result.outputs.items():
                 # output is FormatOutput dataclass
                 print(f"{format_name}: {output.extension}")
-                save_file(output.content, output.subpath)
+                save_file(output.full_content(), output.subpath)
         except ValueError as e:
             print(f"Invalid rule: {e}")
     """
@@ -132,47 +164,12 @@ class RuleConverter:
         # Parse frontmatter and content using shared utility
         frontmatter, markdown_content = parse_frontmatter_and_content(content)
 
-        if not frontmatter:
-            raise ValueError(f"Missing or invalid frontmatter in {filename}")
-
-        # Validate required description field
-        if "description" not in frontmatter or not frontmatter["description"].strip():
-            raise ValueError(f"Missing required 'description' field in {filename}")
-
-        always_apply = frontmatter.get("alwaysApply", False)
+        # Validate with the same checks as validate_unified_rules.py
+        errors, _ = validate_frontmatter(frontmatter, markdown_content)
+        if errors:
+            raise ValueError(f"Invalid rule {filename}: {'; '.join(errors)}")
 
-        # Validate languages field based on alwaysApply setting
-        if always_apply:
-            # If alwaysApply is true, languages should not be specified or should be empty
-            if "languages" in frontmatter and frontmatter["languages"]:
-                raise ValueError(
-                    f"When 'alwaysApply' is true, 'languages' should not be specified or should be empty in {filename}"
-                )
-            languages = []  # No languages when always applying
-        else:
-            # If alwaysApply is false, languages is required
-            if "languages" not in frontmatter:
-                raise ValueError(
-                    f"Missing required 'languages' field in {filename} (required when alwaysApply is false)"
-                )
-
-            languages = frontmatter["languages"]
-            if not isinstance(languages, list) or not languages:
-                raise ValueError(
-                    f"'languages' must be a non-empty list in {filename} when alwaysApply is false"
-                )
-
-        # Adding rule_id to the beginning of the content
-        rule_id = Path(filename).stem
-        markdown_content = f"rule_id: {rule_id}\n\n{markdown_content}"
-
-        return ProcessedRule(
-            description=frontmatter["description"],
-            languages=[lang.lower() for lang in languages],
-            always_apply=always_apply,
-            content=markdown_content,
-            filename=filename,
-        )
+        return build_rule(frontmatter, markdown_content, filename)
 
     def generate_globs(self, languages: list[str]) -> str:
         """
@@ -213,37 +210,97 @@ class RuleConverter:
                 result = converter.convert("rules/my-rule.md")
                 for format_name, output in result.outputs.items():
                     path = f"{output.subpath}/{result.basename}{output.extension}"
-                    write_file(path, output.content)
+                    write_file(path, output.full_content())
             except (FileNotFoundError, ValueError) as e:
                 print(f"Error: {e}")
         """
         filepath = Path(filepath)
-        filename = filepath.name
-        basename = filepath.stem
 
-        # Read the rule file (may raise FileNotFoundError)
+        # Large rules are parsed without reading their body (may raise FileNotFoundError)
+        entry = load_streamed_rule(filepath)
+        if entry is not None:
+            return self.render(entry.rule)
+
+        # Read and parse the rule file
         content = filepath.read_text(encoding="utf-8")
 
-        # Parse and validate (may raise ValueError)
-        rule = self.parse_rule(content, filename)
+        # Validate (may raise ValueError)
+        rule = self.parse_rule(content, filepath.name)
+
+        return self.render(rule)
 
+    def render(self, rule: ProcessedRule) -> ConversionResult:
+        """
+        Generate all registered formats for an already parsed rule.
+
+        Formats that support generate_parts only generate the text around
+        the content, which all outputs share as their body instead of
+        holding a copy each. For rules with a streamed body the body stays
+        on disk.
+
+        Args:
+            rule: Parsed and validated rule (e.g. from RuleCorpus)
+
+        Returns:
+            ConversionResult with filename, basename, and format outputs
+        """
         # Generate globs once for all formats
         globs = self.generate_globs(rule.languages)
 
+        # Shared body: the streamed body, or the whole content
+        if rule.body is not None:
+            body, preamble = rule.body, rule.content
+        else:
+            body, preamble = rule.content, ""
+
+        # Rule with the body loaded, for formats that cannot share it
+        full_rule = rule if rule.body is None else None
+
         # Generate output for each format
         outputs = {}
         for format_handler in self.formats:
             format_name = format_handler.get_format_name()
+            format_globs = format_handler.format_globs(globs)
+            parts = format_handler.generate_parts(rule, format_globs)
+            if parts is not None:
+                prefix, suffix = parts
+                content = f"{prefix}{preamble}"
+            else:
+                if full_rule is None:
+                    full_rule = replace(
+                        rule, content=rule.content + rule.body.read_text(), body=None
+                    )
+                content = format_handler.generate(full_rule, format_globs)
+                suffix = ""
+
             outputs[format_name] = FormatOutput(
-                content=format_handler.generate(rule, globs),
+                content=content,
                 extension=format_handler.get_file_extension(),
                 subpath=format_handler.get_output_subpath(),
                 outputs_to_ide_rules=format_handler.outputs_to_ide_rules(),
+                body=body if parts is not None else None,
+                suffix=suffix,
             )
 
         return ConversionResult(
-            filename=filename,
-            basename=basename,
+            filename=rule.filename,
+            basename=Path(rule.filename).stem,
             outputs=outputs,
             languages=rule.languages,
         )
+
+    def render_many(self, rules: Iterable[ProcessedRule]) -> Iterator[ConversionResult]:
+        """
+        Generate all registered formats for many parsed rules, lazily.
+
+        Each result is created when it is requested, so writing and dropping
+        results one by one keeps memory flat regardless of corpus size.
+
+        Args:
+            rules: Parsed and validated rules (e.g. RuleCorpus.rules or a generator)
+
+        Yields:
+            ConversionResult per rule, in input order
+        """
+        for rule in rules:
+            yield self.render(rule)
@@ -0,0 +1,512 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Rule Corpus
+
+Reads and parses each unified rule file once, producing both validation
+diagnostics and ProcessedRule objects for conversion.
+Shared by validate_unified_rules.py and unified_to_all.py.
+"""
+
+import codecs
+import hashlib
+import mmap
+import os
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from formats import ProcessedRule
+from language_mappings import LANGUAGE_TO_EXTENSIONS
+from manifest import hash_content
+from rule_body import RuleBody
+from utils import (
+    is_ignored,
+    parse_frontmatter,
+    parse_frontmatter_and_content,
+    read_ignore_file,
+)
+
+# Rule files of at least this size are parsed without loading their body
+STREAMING_THRESHOLD = 1024 * 1024
+
+# Bytes hashed and decoded at a time when streaming a rule file
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Characters removed by str.strip() that are encoded as a single byte
+_ASCII_WHITESPACE = frozenset(b" \t\n\x0b\x0c\r\x1c\x1d\x1e\x1f")
+
+# Ignore file honored by discover_rule_files, one glob pattern per line
+IGNORE_FILENAME = ".codeguardignore"
+
+# Canonical language tuples, shared by every rule with the same languages
+_LANGUAGE_TUPLES: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+@dataclass(slots=True)
+class RuleEntry:
+    """
+    Represents one rule file of the corpus after a single read and parse.
+
+    Attributes:
+        path: Path of the rule file
+        content_hash: SHA-256 of the file content, None if it could not be read
+        errors: Validation errors (the rule cannot be converted if non-empty)
+        warnings: Validation warnings
+        rule: Parsed rule, None if there are errors
+    """
+
+    path: Path
+    content_hash: str | None = None
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    rule: ProcessedRule | None = None
+
+    @property
+    def filename(self) -> str:
+        """Rule filename (e.g., 'my-rule.md')."""
+        return self.path.name
+
+
+def validate_frontmatter(
+    frontmatter: dict | None, markdown_content: str
+) -> tuple[list[str], list[str]]:
+    """
+    Validate parsed rule frontmatter and content.
+
+    Args:
+        frontmatter: Parsed YAML frontmatter (None if missing or invalid)
+        markdown_content: Markdown content after the frontmatter
+
+    Returns:
+        Tuple of (errors, warnings)
+    """
+    errors = []
+    warnings = []
+
+    if not isinstance(frontmatter, dict):
+        errors.append("Missing or invalid YAML frontmatter")
+        return errors, warnings
+
+    # Check required fields
+    description = frontmatter.get("description")
+    if "description" not in frontmatter:
+        errors.append("Missing required field: description")
+    elif not isinstance(description, str):
+        errors.append("description must be a string")
+    elif not description.strip():
+        errors.append("description cannot be empty")
+
+    # Validate languages and alwaysApply logic
+    languages = frontmatter.get("languages")
+    always_apply = frontmatter.get("alwaysApply", False)
+
+    if languages and not (
+        isinstance(languages, list) and all(isinstance(lang, str) for lang in languages)
+    ):
+        errors.append("languages must be a list of language names")
+    elif always_apply and languages:
+        errors.append("Rules with alwaysApply=true should not have languages")
+    elif not always_apply and not languages:
+        errors.append("Rules must have either languages or alwaysApply=true")
+    elif languages:
+        # Validate language names
+        unknown = [
+            lang for lang in languages if lang.lower() not in LANGUAGE_TO_EXTENSIONS
+        ]
+        if unknown:
+            warnings.append(f"Unknown languages: {', '.join(unknown)}")
+
+    # Check content exists
+    if not markdown_content.strip():
+        errors.append("Rule content cannot be empty")
+
+    return errors, warnings
+
+
+def intern_languages(languages: list[str]) -> tuple[str, ...]:
+    """
+    Return the shared tuple for a list of language names.
+
+    Args:
+        languages: Lowercase language names
+
+    Returns:
+        Tuple equal to languages, the same object for every equal list
+    """
+    key = tuple(languages)
+    shared = _LANGUAGE_TUPLES.get(key)
+    if shared is None:
+        shared = _LANGUAGE_TUPLES[key] = tuple(sys.intern(lang) for lang in key)
+    return shared
+
+
+def build_rule(frontmatter: dict, markdown_content: str, filename: str) -> ProcessedRule:
+    """
+    Build a ProcessedRule from frontmatter that passed validate_frontmatter.
+
+    Args:
+        frontmatter: Validated frontmatter
+        markdown_content: Markdown content after the frontmatter
+        filename: Rule filename
+
+    Returns:
+        ProcessedRule with the rule_id line prepended to the content, and
+        interned description, filename and languages
+    """
+    always_apply = frontmatter.get("alwaysApply", False)
+    languages = [] if always_apply else frontmatter["languages"]
+
+    # Adding rule_id to the beginning of the content
+    rule_id = Path(filename).stem
+    markdown_content = f"rule_id: {rule_id}\n\n{markdown_content}"
+
+    return ProcessedRule(
+        description=sys.intern(frontmatter["description"]),
+        languages=intern_languages([lang.lower() for lang in languages]),
+        always_apply=always_apply,
+        content=markdown_content,
+        filename=sys.intern(filename),
+    )
+
+
+def load_rule(path: Path, stream_threshold: int = STREAMING_THRESHOLD) -> RuleEntry:
+    """
+    Read, parse and validate a single rule file.
+
+    Errors are recorded on the entry instead of being raised.
+
+    Args:
+        path: Path to the rule file
+        stream_threshold: Size from which the body is left on disk (see
+            load_streamed_rule); 0 keeps the body of every rule on disk
+
+    Returns:
+        RuleEntry with diagnostics and, if valid, the parsed rule
+    """
+    entry = RuleEntry(path=path if isinstance(path, Path) else Path(path))
+
+    try:
+        streamed = load_streamed_rule(entry.path, stream_threshold)
+        if streamed is not None:
+            return streamed
+
+        data = entry.path.read_bytes()
+        entry.content_hash = hash_content(data)
+        # Same newline handling as Path.read_text (universal newlines)
+        content = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        frontmatter, markdown_content = parse_frontmatter_and_content(content)
+        entry.errors, entry.warnings = validate_frontmatter(
+            frontmatter, markdown_content
+        )
+        if not entry.errors:
+            entry.rule = build_rule(frontmatter, markdown_content, entry.filename)
+    except Exception as e:
+        entry.errors.append(f"Error reading file: {str(e)}")
+
+    return entry
+
+
+def load_streamed_rule(
+    path: Path, threshold: int = STREAMING_THRESHOLD
+) -> RuleEntry | None:
+    """
+    Parse a large rule file without loading its body into memory.
+
+    Only the frontmatter is decoded. The body is hashed and checked to be
+    valid UTF-8 chunk by chunk through a memory map, and the parsed rule
+    refers to it through a RuleBody. Files that are small, or that need the
+    regular path to be handled exactly like load_rule does (CRLF newlines,
+    invalid frontmatter, non-ASCII whitespace around the body), are left to
+    load_rule.
+
+    Args:
+        path: Path to the rule file
+        threshold: Smallest file size in bytes that is streamed
+
+    Returns:
+        Valid RuleEntry whose rule has a body, or None if the file is not streamed
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    # Entry and body share one Path object (a Path costs a few hundred bytes)
+    path = path if isinstance(path, Path) else Path(path)
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size < threshold or stat.st_size == 0:
+            return None
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Same delimiters as parse_frontmatter_and_content
+            if data[:4] != b"---\n" or data.find(b"\r") != -1:
+                return None
+            closing = data.find(b"\n---\n")
+            if closing == -1:
+                return None
+
+            # Same stripping as parse_frontmatter_and_content
+            start, stop = closing + 5, len(data)
+            while start < stop and data[start] in _ASCII_WHITESPACE:
+                start += 1
+            while stop > start and data[stop - 1] in _ASCII_WHITESPACE:
+                stop -= 1
+            head = data[start : start + 4].decode("utf-8", "ignore")
+            tail = data[max(start, stop - 4) : stop].decode("utf-8", "ignore")
+            if not head or head[0].isspace() or not tail or tail[-1].isspace():
+                return None
+
+            digest = hashlib.sha256()
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            try:
+                for offset in range(0, len(data), _STREAM_CHUNK_SIZE):
+                    chunk = data[offset : offset + _STREAM_CHUNK_SIZE]
+                    digest.update(chunk)
+                    decoder.decode(chunk)
+                decoder.decode(b"", final=True)
+                frontmatter = parse_frontmatter(data[4:closing].decode("utf-8"))
+            except Exception:
+                return None
+
+    # The body is known to be non-empty, so its first characters stand in for it
+    errors, warnings = validate_frontmatter(frontmatter, head)
+    if errors:
+        return None
+
+    rule = build_rule(frontmatter, "", path.name)
+    rule.body = RuleBody(
+        path=path,
+        offset=start,
+        length=stop - start,
+        file_size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+    )
+    return RuleEntry(
+        path=path,
+        content_hash=digest.hexdigest(),
+        warnings=warnings,
+        rule=rule,
+    )
+
+
+def find_rule_files(input_path: str | Path) -> list[Path]:
+    """
+    Determine the rule files for a file or directory argument.
+
+    A directory yields all *.md files directly inside it except README.md.
+
+    Args:
+        input_path: Path to a single .md file or folder containing .md files
+
+    Returns:
+        List of rule file paths
+
+    Raises:
+        FileNotFoundError: If the path does not exist
+        ValueError: If the file is not a .md file or the folder has no rules
+    """
+    path = Path(input_path)
+
+    if not path.exists():
+        raise FileNotFoundError(f"{input_path} does not exist")
+
+    if path.is_file():
+        if path.suffix != ".md":
+            raise ValueError(f"{input_path} is not a .md file")
+        return [path]
+
+    files = [f for f in path.glob("*.md") if f.name.lower() != "readme.md"]
+    if not files:
+        raise ValueError(f"No .md files found in {input_path}")
+    return files
+
+
+def _share_strings(entry: RuleEntry) -> RuleEntry:
+    """Intern the strings of an entry loaded in a worker process (pickling copies them)."""
+    rule = entry.rule
+    if rule is not None:
+        rule.description = sys.intern(rule.description)
+        rule.filename = sys.intern(rule.filename)
+        rule.languages = intern_languages(rule.languages)
+    return entry
+
+
+def iter_rules(
+    paths: list[Path], jobs: int = 1, stream_threshold: int = STREAMING_THRESHOLD
+) -> Iterator[RuleEntry]:
+    """
+    Load rule files lazily, optionally in a process pool.
+
+    Entries are yielded in the order of paths regardless of the number of
+    jobs, so a caller that converts and drops each entry never holds more
+    than a few parsed rules at a time.
+
+    Args:
+        paths: Rule files to load
+        jobs: Number of worker processes (1 loads in the calling process)
+        stream_threshold: Size from which rule bodies stay on disk (see load_rule)
+
+    Yields:
+        One RuleEntry per path
+    """
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield load_rule(path, stream_threshold)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    chunksize = max(1, len(paths) // (jobs * 4))
+    load = partial(load_rule, stream_threshold=stream_threshold)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for entry in executor.map(load, paths, chunksize=chunksize):
+            yield _share_strings(entry)
+
+
+def discover_rule_files(
+    roots: list[str | Path], recursive: bool = True
+) -> tuple[list[Path], dict[Path, Path]]:
+    """
+    Determine the rule files of several rule files and folders.
+
+    Folders are walked with os.scandir, in name order. Only *.md files are
+    rules; README.md files, hidden entries and everything matched by a
+    .codeguardignore file are skipped (see utils.read_ignore_file for the
+    pattern syntax).
+
+    Rules are identified by their rule_id (filename without extension), so
+    each ID is converted once; the first root that provides it wins.
+
+    Args:
+        roots: Rule files and folders, in priority order
+        recursive: Also discover rules in subfolders
+
+    Returns:
+        Tuple of (rule files, skipped duplicate -> rule file kept instead)
+
+    Raises:
+        FileNotFoundError: If a root does not exist
+        ValueError: If a file root is not a .md file or no rules were found
+    """
+    rule_files = []
+    duplicates = {}
+    by_rule_id = {}
+
+    def add(rule_file: Path) -> None:
+        kept = by_rule_id.setdefault(rule_file.stem, rule_file)
+        if kept is rule_file:
+            rule_files.append(rule_file)
+        elif kept != rule_file:
+            duplicates[rule_file] = kept
+
+    for root in map(Path, roots):
+        if not root.exists():
+            raise FileNotFoundError(f"{root} does not exist")
+        if root.is_file():
+            if root.suffix != ".md":
+                raise ValueError(f"{root} is not a .md file")
+            add(root)
+            continue
+
+        # Depth-first walk; each folder inherits the ignore patterns of its parents
+        stack = [(root, read_ignore_file(root, IGNORE_FILENAME))]
+        while stack:
+            directory, patterns = stack.pop()
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+
+            subdirectories = []
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                is_dir = entry.is_dir(follow_symlinks=False)
+                entry_path = Path(entry.path)
+                if patterns and is_ignored(entry_path, is_dir, patterns):
+                    continue
+                if is_dir:
+                    if recursive:
+                        subdirectories.append(entry_path)
+                elif (
+                    entry.name.endswith(".md")
+                    and entry.name.lower() != "readme.md"
+                    and entry.is_file()
+                ):
+                    add(entry_path)
+
+            for subdirectory in reversed(subdirectories):
+                stack.append(
+                    (subdirectory, patterns + read_ignore_file(subdirectory, IGNORE_FILENAME))
+                )
+
+    if not rule_files:
+        raise ValueError(f"No .md files found in {', '.join(map(str, roots))}")
+    return rule_files, duplicates
+
+
+class RuleCorpus:
+    """
+    A set of rule files that have each been read and parsed exactly once.
+
+    The same corpus can be validated (errors and warnings per entry) and
+    converted (ProcessedRule per valid entry) without touching the files again.
+
+    Example:
+        corpus = RuleCorpus.load(find_rule_files("rules/"))
+        for entry in corpus:
+            if entry.errors:
+                print(f"{entry.filename}: {entry.errors}")
+            else:
+                result = converter.render(entry.rule)
+    """
+
+    def __init__(self, entries: list[RuleEntry]):
+        """
+        Initialize the corpus.
+
+        Args:
+            entries: Loaded rule entries, in processing order
+        """
+        self.entries = entries
+
+    @classmethod
+    def load(
+        cls,
+        paths: list[Path],
+        jobs: int = 1,
+        stream_threshold: int = STREAMING_THRESHOLD,
+    ) -> "RuleCorpus":
+        """
+        Load rule files, optionally in a process pool.
+
+        Entries keep the order of paths regardless of the number of jobs.
+
+        Args:
+            paths: Rule files to load
+            jobs: Number of worker processes (1 loads in the calling process)
+            stream_threshold: Size from which rule bodies stay on disk; 0
+                keeps every body on disk, for services holding many rules
+
+        Returns:
+            RuleCorpus with one entry per path
+        """
+        return cls(list(iter_rules(paths, jobs, stream_threshold)))
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def has_errors(self) -> bool:
+        """Whether any rule failed validation."""
+        return any(entry.errors for entry in self.entries)
+
+    @property
+    def rules(self) -> list[ProcessedRule]:
+        """Parsed rules of all valid entries."""
+        return [entry.rule for entry in self.entries if entry.rule is not None]
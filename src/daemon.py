@@ -0,0 +1,448 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Conversion Daemon
+
+Keeps the parsed rule corpus and a RuleIndex in memory and answers
+requests from editor integrations over a Unix socket, so a save no longer
+pays for interpreter start, imports and a full corpus parse.
+
+The protocol is one JSON object per line in each direction:
+
+    {"command": "convert", "rule": "codeguard-1-crypto-algorithms.md"}
+    {"command": "convert"}                      # every rule
+    {"command": "skill"}                        # regenerate SKILL.md
+    {"command": "match", "paths": ["src/app.py"]}
+    {"command": "status"}
+    {"command": "shutdown"}
+
+Every response has "ok" and "elapsed_ms", plus either the command's
+results or an "error" message. Rule files are polled for changes before
+each request, and changed rules are re-parsed before the request is handled.
+
+Usage:
+    python daemon.py serve rules/ . &
+    python daemon.py match src/app.py src/Dockerfile
+    python daemon.py convert codeguard-1-crypto-algorithms.md
+    python daemon.py stop
+"""
+
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from budget import RuleSize, measure_result
+from corpus import RuleCorpus, RuleEntry
+from manifest import LANGUAGE_INDEX_FILENAME, LanguageIndex
+from rule_index import RuleIndex
+from unified_to_all import (
+    SKILL_TEMPLATE_NAME,
+    create_converter,
+    new_results,
+    write_rule_outputs,
+    write_skill_md,
+)
+from utils import get_version
+from watcher import RuleWatcher
+
+
+def default_socket_path() -> Path:
+    """
+    Return the socket path used when none is given.
+
+    Returns:
+        codeguard-<uid>.sock in $XDG_RUNTIME_DIR, else in the temp directory
+    """
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(directory) / f"codeguard-{os.getuid()}.sock"
+
+
+class ConversionDaemon:
+    """
+    In-memory state of the daemon: parsed rules, rule index and outputs.
+
+    Requests are serialized by a lock, so handle() can be called from
+    several connection threads.
+
+    Example:
+        daemon = ConversionDaemon("rules/", ".")
+        daemon.handle({"command": "match", "paths": ["src/app.py"]})
+        # {'ok': True, 'rules': {'src/app.py': [...]}, 'elapsed_ms': 0.1}
+    """
+
+    def __init__(
+        self,
+        input_path: str,
+        output_dir: str = ".",
+        formats: list[str] | None = None,
+    ):
+        """
+        Load and index every rule.
+
+        Args:
+            input_path: Path to a single .md file or folder containing .md files
+            output_dir: Output directory (default: current directory)
+            formats: Names of the formats to generate (default: all built-in formats)
+        """
+        self.path = Path(input_path)
+        self.output_base = Path(output_dir)
+        self.converter = create_converter(get_version(), formats)
+        self.format_names = [f.get_format_name() for f in self.converter.formats]
+        rules_dir = self.path if self.path.is_dir() else self.path.parent
+        self.template_path = rules_dir / SKILL_TEMPLATE_NAME
+
+        self.entries: dict[str, RuleEntry] = {}
+        self.index = RuleIndex()
+        # Output paths of every rule converted by this daemon
+        self.rule_outputs: dict[str, list[str]] = {}
+        # Output sizes per (rule filename, content hash), for SKILL.md requests
+        self.rule_sizes: dict[tuple[str, str], RuleSize] = {}
+        self.stats = {"requests": 0, "reloaded": 0}
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+
+        self.watcher = RuleWatcher([self.path])
+        self._reload(set(self.watcher.current), set())
+
+    def _is_rule(self, file: Path) -> bool:
+        if self.path.is_file():
+            return file == self.path
+        return file.suffix == ".md" and file.name.lower() != "readme.md"
+
+    def _reload(self, changed: set[Path], removed: set[Path]) -> None:
+        """Re-parse changed rules and forget removed ones, deleting their outputs."""
+        for entry in RuleCorpus.load(sorted(f for f in changed if self._is_rule(f))):
+            self.entries[entry.filename] = entry
+            if entry.rule is not None:
+                self.index.add_rule(entry.rule)
+            else:
+                self.index.remove_rule(entry.path.stem)
+            self.stats["reloaded"] += 1
+
+        for file in removed:
+            if self.entries.pop(file.name, None) is None:
+                continue
+            self.index.remove_rule(file.stem)
+            for output in self.rule_outputs.pop(file.name, []):
+                (self.output_base / output).unlink(missing_ok=True)
+            self.stats["reloaded"] += 1
+
+    def refresh(self) -> None:
+        """Pick up rule files changed since the last request."""
+        changed, removed = self.watcher.poll()
+        if changed or removed:
+            self._reload(changed, removed)
+
+    def convert(self, rule: str | None = None) -> dict[str, list[str]]:
+        """
+        Write the outputs of one rule, or of every rule.
+
+        Args:
+            rule: Rule filename, with or without .md (default: every rule)
+
+        Returns:
+            Results dictionary as returned by convert_rules
+
+        Raises:
+            ValueError: If the rule is unknown
+        """
+        if rule is None:
+            filenames = list(self.entries)
+        else:
+            filename = Path(rule).name
+            if not filename.endswith(".md"):
+                filename += ".md"
+            if filename not in self.entries:
+                raise ValueError(f"Unknown rule: {rule}")
+            filenames = [filename]
+
+        results = new_results()
+        for filename in filenames:
+            entry = self.entries[filename]
+            if entry.rule is None:
+                results["errors"].append(
+                    f"{filename}: Validation error - {'; '.join(entry.errors)}"
+                )
+                continue
+            result = self.converter.render(entry.rule)
+            self.rule_outputs[filename] = write_rule_outputs(
+                result, self.output_base, results
+            )
+            results["success"].append(filename)
+        return results
+
+    def skill(self) -> dict[str, list[str]]:
+        """
+        Regenerate SKILL.md from the languages of the loaded rules.
+
+        Returns:
+            Results dictionary whose 'written'/'unchanged' lists name SKILL.md
+
+        Raises:
+            ValueError: If the claudecode format is not selected
+            FileNotFoundError: If the SKILL.md template does not exist
+        """
+        if "claudecode" not in self.format_names:
+            raise ValueError("SKILL.md is only generated with the claudecode format")
+
+        # Only rules that changed since the last request are rendered again
+        entries = [entry for entry in self.entries.values() if entry.rule is not None]
+        keys = {entry.filename: (entry.filename, entry.content_hash) for entry in entries}
+        stale = [entry.rule for entry in entries if keys[entry.filename] not in self.rule_sizes]
+        sizes = {key: self.rule_sizes[key] for key in keys.values() if key in self.rule_sizes}
+        for result in self.converter.render_many(stale):
+            sizes[keys[result.filename]] = measure_result(result)
+        self.rule_sizes = sizes
+
+        language_index = LanguageIndex(
+            self.output_base / LANGUAGE_INDEX_FILENAME,
+            {entry.filename: entry.rule.languages for entry in entries},
+            {entry.filename: sizes[keys[entry.filename]] for entry in entries},
+        )
+        language_to_rules = language_index.language_to_rules()
+
+        results = new_results()
+        if language_to_rules:
+            write_skill_md(language_to_rules, self.template_path, self.output_base, results)
+            # Keep later single-file CLI runs consistent with this table
+            language_index.save()
+        return results
+
+    def match(self, paths: list[str]) -> dict[str, list[str]]:
+        """
+        Resolve the rules that apply to file paths.
+
+        Args:
+            paths: File paths
+
+        Returns:
+            Mapping of path to sorted rule IDs
+        """
+        return {path: list(rule_ids) for path, rule_ids in self.index.match_many(paths)}
+
+    def status(self) -> dict:
+        """Return counters describing the daemon state."""
+        return {
+            "input_path": str(self.path),
+            "output_dir": str(self.output_base),
+            "formats": self.format_names,
+            "rules": sum(1 for entry in self.entries.values() if entry.rule is not None),
+            "invalid": sum(1 for entry in self.entries.values() if entry.rule is None),
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            **self.stats,
+        }
+
+    def handle(self, request: dict) -> dict:
+        """
+        Execute one request.
+
+        Errors are reported in the response instead of being raised.
+
+        Args:
+            request: Decoded request object with a "command" key
+
+        Returns:
+            Response object with "ok" and "elapsed_ms"
+        """
+        started = time.perf_counter()
+        command = request.get("command")
+        with self.lock:
+            self.stats["requests"] += 1
+            try:
+                self.refresh()
+                if command == "convert":
+                    rule = request.get("rule")
+                    if rule is not None and not isinstance(rule, str):
+                        raise ValueError("convert needs 'rule' to be a string")
+                    response = {"ok": True, **self.convert(rule)}
+                elif command == "skill":
+                    response = {"ok": True, **self.skill()}
+                elif command == "match":
+                    paths = request.get("paths")
+                    if paths is None and "path" in request:
+                        paths = [request["path"]]
+                    if not isinstance(paths, list) or not all(
+                        isinstance(path, str) for path in paths
+                    ):
+                        raise ValueError("match needs 'paths' (a list of strings) or 'path'")
+                    response = {"ok": True, "rules": self.match(paths)}
+                elif command == "status":
+                    response = {"ok": True, **self.status()}
+                elif command == "shutdown":
+                    response = {"ok": True}
+                else:
+                    raise ValueError(f"Unknown command: {command}")
+            except (ValueError, OSError, RuntimeError) as e:
+                response = {"ok": False, "error": str(e)}
+            except Exception as e:
+                # A bug must not drop the client's connection or the daemon
+                response = {"ok": False, "error": f"Unexpected error: {e!r}"}
+        response["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return response
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads JSON requests line by line until the client disconnects."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                request = {}
+                response = {"ok": False, "error": f"Invalid request: {e}"}
+            else:
+                response = self.server.conversion_daemon.handle(request)
+
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            if request.get("command") == "shutdown":
+                # shutdown() waits for serve_forever, so it cannot run in this thread
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+def serve(daemon: ConversionDaemon, socket_path: Path | None = None) -> None:
+    """
+    Answer requests on a Unix socket until a shutdown request or Ctrl+C.
+
+    A stale socket file left by a crashed daemon is replaced; the socket is
+    only accessible by the current user.
+
+    Args:
+        daemon: Loaded daemon state
+        socket_path: Socket path (default: default_socket_path())
+
+    Raises:
+        RuntimeError: If another daemon is listening on the socket
+    """
+    socket_path = Path(socket_path or default_socket_path())
+    if socket_path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(socket_path))
+            except OSError:
+                socket_path.unlink()
+            else:
+                raise RuntimeError(f"A daemon is already listening on {socket_path}")
+
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), _RequestHandler)
+    server.daemon_threads = True
+    server.conversion_daemon = daemon
+    os.chmod(socket_path, 0o600)
+
+    status = daemon.status()
+    print(
+        f"Loaded {status['rules']} rules ({status['invalid']} invalid). "
+        f"Listening on {socket_path} (Ctrl+C to stop)",
+        flush=True,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+        print("Stopped daemon")
+
+
+def send_request(
+    request: dict, socket_path: Path | None = None, timeout: float = 30.0
+) -> dict:
+    """
+    Send one request to a running daemon.
+
+    Args:
+        request: Request object with a "command" key
+        socket_path: Socket path (default: default_socket_path())
+        timeout: Seconds to wait for the response
+
+    Returns:
+        Decoded response object
+
+    Raises:
+        OSError: If no daemon is listening on the socket
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path or default_socket_path()))
+        client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with client.makefile("rb") as responses:
+            return json.loads(responses.readline())
+
+
+def main():
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(
+        description="Serve rule conversions and lookups from memory over a Unix socket.",
+        epilog="Examples:\n"
+        "  python daemon.py serve rules/ . &\n"
+        "  python daemon.py convert codeguard-1-crypto-algorithms.md\n"
+        "  python daemon.py match src/app.py\n"
+        "  python daemon.py stop",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--socket", help=f"socket path (default: {default_socket_path()})"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="load the rules and start serving")
+    serve_parser.add_argument("input_path", help="rule file or folder containing .md files")
+    serve_parser.add_argument(
+        "output_dir", nargs="?", default=".", help="output directory (default: .)"
+    )
+    serve_parser.add_argument(
+        "--formats",
+        help="comma-separated formats to generate (default: all built-in formats)",
+    )
+
+    convert_parser = commands.add_parser("convert", help="write the outputs of rules")
+    convert_parser.add_argument("rule", nargs="?", help="rule filename (default: all)")
+    commands.add_parser("skill", help="regenerate SKILL.md")
+    match_parser = commands.add_parser("match", help="list the rules that apply to paths")
+    match_parser.add_argument("paths", nargs="+", help="file paths")
+    commands.add_parser("status", help="show the daemon state")
+    commands.add_parser("stop", help="stop the daemon")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        formats = None
+        if args.formats:
+            formats = [name.strip() for name in args.formats.split(",") if name.strip()]
+        try:
+            serve(ConversionDaemon(args.input_path, args.output_dir, formats), args.socket)
+        except (ValueError, RuntimeError) as e:
+            parser.error(str(e))
+        return
+
+    request = {"command": "shutdown" if args.command == "stop" else args.command}
+    if args.command == "convert" and args.rule:
+        request["rule"] = args.rule
+    elif args.command == "match":
+        request["paths"] = args.paths
+
+    try:
+        response = send_request(request, args.socket)
+    except OSError as e:
+        print(f"Error: cannot reach daemon at {args.socket or default_socket_path()}: {e}")
+        sys.exit(1)
+
+    print(json.dumps(response, indent=2))
+    if not response["ok"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,23 +13,127 @@ Available Formats:
 - CopilotFormat: Generates .instructions.md files for GitHub Copilot
 - ClaudeCodeFormat: Generates .md files for Claude Code plugins
 
+Format modules are imported lazily, only when a format is selected.
+Additional formats are discovered through the "codeguard.formats" entry
+point group; each entry point names a BaseFormat subclass:
+
+    [project.entry-points."codeguard.formats"]
+    zed = "codeguard_zed:ZedFormat"
+
 Usage:
-    from formats import BaseFormat, ProcessedRule, CursorFormat, WindsurfFormat, CopilotFormat, ClaudeCodeFormat
+    from formats import create_formats
 
     version = "1.0.0"
-    formats = [
-        CursorFormat(version),
-        WindsurfFormat(version),
-        CopilotFormat(version),
-        ClaudeCodeFormat(version),
-    ]
+    formats = create_formats(["cursor", "copilot"], version)
+
+    # Format classes can still be imported directly
+    from formats import BaseFormat, ProcessedRule, CursorFormat
 """
 
+import importlib
+
 from formats.base import BaseFormat, ProcessedRule
-from formats.cursor import CursorFormat
-from formats.windsurf import WindsurfFormat
-from formats.copilot import CopilotFormat
-from formats.claudecode import ClaudeCodeFormat
+
+# Entry point group for third-party formats
+ENTRY_POINT_GROUP = "codeguard.formats"
+
+# Built-in formats in output order: format name -> "module:ClassName"
+BUILTIN_FORMATS = {
+    "cursor": "formats.cursor:CursorFormat",
+    "windsurf": "formats.windsurf:WindsurfFormat",
+    "copilot": "formats.copilot:CopilotFormat",
+    "claudecode": "formats.claudecode:ClaudeCodeFormat",
+}
+
+# Class name -> format name, for `from formats import CursorFormat`
+_BUILTIN_CLASSES = {
+    target.rsplit(":", 1)[1]: name for name, target in BUILTIN_FORMATS.items()
+}
+
+_plugin_formats = None
+
+
+def _discover_plugins() -> dict:
+    """Return the entry points of third-party formats by name (without importing them)."""
+    global _plugin_formats
+    if _plugin_formats is None:
+        # importlib.metadata is slow to import; only load it when plugins are needed
+        from importlib.metadata import entry_points
+
+        _plugin_formats = {
+            entry_point.name: entry_point
+            for entry_point in entry_points(group=ENTRY_POINT_GROUP)
+            if entry_point.name not in BUILTIN_FORMATS
+        }
+    return _plugin_formats
+
+
+def available_formats() -> list[str]:
+    """
+    List the names of all known formats without importing them.
+
+    Returns:
+        Built-in format names in output order, followed by plugin formats
+    """
+    return list(BUILTIN_FORMATS) + sorted(_discover_plugins())
+
+
+def get_format_class(name: str) -> type[BaseFormat]:
+    """
+    Import and return the class of a format.
+
+    Args:
+        name: Format name (e.g. 'cursor')
+
+    Returns:
+        BaseFormat subclass
+
+    Raises:
+        ValueError: If the format is unknown or its entry point is not a BaseFormat
+    """
+    if name in BUILTIN_FORMATS:
+        module_name, class_name = BUILTIN_FORMATS[name].split(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+    entry_point = _discover_plugins().get(name)
+    if entry_point is None:
+        raise ValueError(
+            f"Unknown format: {name} (available: {', '.join(available_formats())})"
+        )
+
+    format_class = entry_point.load()
+    if not (isinstance(format_class, type) and issubclass(format_class, BaseFormat)):
+        raise ValueError(
+            f"Format {name} ({entry_point.value}) is not a BaseFormat subclass"
+        )
+    return format_class
+
+
+def create_formats(names: list[str] | None, version: str) -> list[BaseFormat]:
+    """
+    Instantiate formats by name.
+
+    Args:
+        names: Format names in output order, or None for all built-in formats
+        version: Version string to include in generated files
+
+    Returns:
+        List of BaseFormat instances
+
+    Raises:
+        ValueError: If a format is unknown
+    """
+    if names is None:
+        names = list(BUILTIN_FORMATS)
+    return [get_format_class(name)(version) for name in names]
+
+
+def __getattr__(name: str):
+    # Built-in format classes are imported on first access
+    if name in _BUILTIN_CLASSES:
+        return get_format_class(_BUILTIN_CLASSES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "BaseFormat",
@@ -38,4 +142,9 @@ __all__ = [
     "WindsurfFormat",
     "CopilotFormat",
     "ClaudeCodeFormat",
+    "BUILTIN_FORMATS",
+    "ENTRY_POINT_GROUP",
+    "available_formats",
+    "create_formats",
+    "get_format_class",
 ]
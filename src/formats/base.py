@@ -9,29 +9,38 @@ Abstract base class for all IDE rule formats.
 Defines the interface that all format implementations must follow.
 """
 
-import yaml
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
+from rule_body import RuleBody
+from utils import format_yaml_field
 
-@dataclass
+
+@dataclass(slots=True)
 class ProcessedRule:
     """
     Represents a processed rule with required frontmatter.
 
+    Rules are slotted and their strings and language tuples are interned
+    (see corpus.build_rule), so corpora of many thousands of rules mostly
+    cost the size of their content.
+
     Attributes:
         description: Human-readable description of the rule
-        languages: List of programming languages this rule applies to
+        languages: Programming languages this rule applies to
         always_apply: Whether this rule should apply to all files
         content: The actual rule content in markdown format
         filename: Original filename of the rule
+        body: Body of a large rule that is streamed from disk. When set,
+            the rule content is content followed by the body.
     """
 
     description: str
-    languages: list[str]
+    languages: tuple[str, ...]
     always_apply: bool
     content: str
     filename: str
+    body: RuleBody | None = None
 
 
 class BaseFormat(ABC):
@@ -96,6 +105,36 @@ class BaseFormat(ABC):
         """
         return True
 
+    def supports_aggregation(self) -> bool:
+        """
+        Return whether the rules of a language may be merged into one file.
+
+        Returns:
+            True if the format can take the aggregated layout (see
+            aggregate.py); by default formats writing to ide_rules/ can
+
+        Override this method to keep one file per rule in every layout
+        (e.g. Claude Code, whose SKILL.md links the individual rule files)
+        """
+        return self.outputs_to_ide_rules()
+
+    def format_globs(self, globs: str) -> str:
+        """
+        Return the globs as written by this format.
+
+        Override this method to return compress_globs(globs) for an IDE
+        whose matcher is documented to expand brace patterns such as
+        '**/*.{c,h}' inside a glob list. None of the built-in formats do:
+        Cursor and Copilot do not document brace support.
+
+        Args:
+            globs: Comma-separated glob patterns from languages_to_globs
+
+        Returns:
+            The globs unchanged
+        """
+        return globs
+
     @abstractmethod
     def generate(self, rule: ProcessedRule, globs: str) -> str:
         """
@@ -110,6 +149,54 @@ class BaseFormat(ABC):
         """
         pass
 
+    def get_frontmatter_lines(self, rule: ProcessedRule, globs: str) -> list[str] | None:
+        """
+        Return the YAML frontmatter lines for formats that copy the rule content verbatim.
+
+        Override this together with generate() so that large rule bodies can
+        be streamed into the output instead of being loaded into memory.
+
+        Args:
+            rule: The processed rule to format
+            globs: Glob patterns for file matching
+
+        Returns:
+            List of YAML lines, or None if the format does not support streaming
+        """
+        return None
+
+    def generate_parts(self, rule: ProcessedRule, globs: str) -> tuple[str, str] | None:
+        """
+        Return the text generated before and after the rule content.
+
+        generate(rule, globs) equals prefix + rule.content + suffix for
+        formats that support streaming.
+
+        Args:
+            rule: The processed rule to format
+            globs: Glob patterns for file matching
+
+        Returns:
+            Tuple of (prefix, suffix), or None if the format does not support streaming
+        """
+        lines = self.get_frontmatter_lines(rule, globs)
+        if lines is None:
+            return None
+        return self._yaml_frontmatter_parts(lines)
+
+    def _yaml_frontmatter_parts(self, lines: list[str]) -> tuple[str, str]:
+        """
+        Helper to build the text around the content of a file with YAML frontmatter.
+
+        Args:
+            lines: List of YAML lines to include in frontmatter
+
+        Returns:
+            Tuple of (frontmatter block, text after the content)
+        """
+        yaml_str = "\n".join(lines)
+        return f"---\n{yaml_str}\n---\n\n", "\n"
+
     def _build_yaml_frontmatter(self, lines: list[str], content: str) -> str:
         """
         Helper to build complete file with YAML frontmatter.
@@ -121,8 +208,8 @@ class BaseFormat(ABC):
         Returns:
             Complete formatted string with frontmatter and content
         """
-        yaml_str = "\n".join(lines)
-        return f"---\n{yaml_str}\n---\n\n{content}\n"
+        prefix, suffix = self._yaml_frontmatter_parts(lines)
+        return f"{prefix}{content}{suffix}"
 
     def _format_yaml_field(self, field_name: str, value: str) -> str:
         """
@@ -136,10 +223,5 @@ class BaseFormat(ABC):
             Properly formatted YAML string, or empty string if value is empty
         """
         if value and value.strip():
-            yaml_dump = yaml.dump(
-                {field_name: value},
-                default_flow_style=False,
-                allow_unicode=True,
-            )
-            return yaml_dump.strip()
+            return format_yaml_field(field_name, value)
         return ""
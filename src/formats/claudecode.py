@@ -56,6 +56,21 @@ class ClaudeCodeFormat(BaseFormat):
         Returns:
             Complete markdown with original YAML frontmatter preserved
         """
+        return self._build_yaml_frontmatter(
+            self.get_frontmatter_lines(rule, globs), rule.content
+        )
+
+    def get_frontmatter_lines(self, rule: ProcessedRule, globs: str) -> list[str]:
+        """
+        Build the Claude Code YAML frontmatter lines.
+
+        Args:
+            rule: The processed rule to format
+            globs: Glob patterns for file matching
+
+        Returns:
+            List of YAML lines
+        """
         # Build YAML frontmatter
         yaml_lines = []
         
@@ -74,5 +89,5 @@ class ClaudeCodeFormat(BaseFormat):
         # Add alwaysApply
         yaml_lines.append(f"alwaysApply: {str(rule.always_apply).lower()}")
         
-        return self._build_yaml_frontmatter(yaml_lines, rule.content)
+        return yaml_lines
 
@@ -44,6 +44,21 @@ class CopilotFormat(BaseFormat):
         Returns:
             Formatted .instructions.md content
         """
+        return self._build_yaml_frontmatter(
+            self.get_frontmatter_lines(rule, globs), rule.content
+        )
+
+    def get_frontmatter_lines(self, rule: ProcessedRule, globs: str) -> list[str]:
+        """
+        Build the Copilot YAML frontmatter lines.
+
+        Args:
+            rule: The processed rule to format
+            globs: Glob patterns for file matching
+
+        Returns:
+            List of YAML lines
+        """
         yaml_lines = []
 
         # Add applyTo (Copilot's equivalent of globs)
@@ -57,4 +72,4 @@ class CopilotFormat(BaseFormat):
         # Add version
         yaml_lines.append(f"version: {self.version}")
 
-        return self._build_yaml_frontmatter(yaml_lines, rule.content)
+        return yaml_lines
@@ -45,6 +45,21 @@ class CursorFormat(BaseFormat):
         Returns:
             Formatted .mdc content
         """
+        return self._build_yaml_frontmatter(
+            self.get_frontmatter_lines(rule, globs), rule.content
+        )
+
+    def get_frontmatter_lines(self, rule: ProcessedRule, globs: str) -> list[str]:
+        """
+        Build the Cursor YAML frontmatter lines.
+
+        Args:
+            rule: The processed rule to format
+            globs: Glob patterns for file matching
+
+        Returns:
+            List of YAML lines
+        """
         yaml_lines = []
 
         # Add description if present
@@ -60,4 +75,4 @@ class CursorFormat(BaseFormat):
         if rule.always_apply:
             yaml_lines.append("alwaysApply: true")
 
-        return self._build_yaml_frontmatter(yaml_lines, rule.content)
+        return yaml_lines
@@ -45,6 +45,21 @@ class WindsurfFormat(BaseFormat):
         Returns:
             Formatted .md content
         """
+        return self._build_yaml_frontmatter(
+            self.get_frontmatter_lines(rule, globs), rule.content
+        )
+
+    def get_frontmatter_lines(self, rule: ProcessedRule, globs: str) -> list[str]:
+        """
+        Build the Windsurf YAML frontmatter lines.
+
+        Args:
+            rule: The processed rule to format
+            globs: Glob patterns for file matching
+
+        Returns:
+            List of YAML lines
+        """
         yaml_lines = []
 
         # Use trigger: always_on for rules that should always apply
@@ -62,4 +77,4 @@ class WindsurfFormat(BaseFormat):
         # Add version
         yaml_lines.append(f"version: {self.version}")
 
-        return self._build_yaml_frontmatter(yaml_lines, rule.content)
+        return yaml_lines
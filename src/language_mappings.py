@@ -7,6 +7,11 @@ Shared language mappings for all rule tools.
 Single source of truth for language-to-extension mappings.
 """
 
+import fnmatch
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
 # Master mapping of languages to file extensions
 LANGUAGE_TO_EXTENSIONS = {
     "python": [".py", ".pyx", ".pyi"],
@@ -80,6 +85,50 @@ for lang, exts in LANGUAGE_TO_EXTENSIONS.items():
         if ext not in EXTENSION_TO_LANGUAGE:
             EXTENSION_TO_LANGUAGE[ext] = lang
 
+# Alternative names of the same language (see the "Alias" entries above).
+# Extensions shared by different languages, such as '.v', are not aliases.
+LANGUAGE_ALIASES = {
+    "c++": "cpp",
+}
+
+
+def _build_extension_indexes() -> tuple[
+    dict[str, tuple[str, ...]], tuple[tuple[str, tuple[str, ...]], ...]
+]:
+    """
+    Precompute exact lookup tables from LANGUAGE_TO_EXTENSIONS.
+
+    Returns:
+        Tuple of (extension index keyed by extension such as '.py',
+        filename patterns such as ('Dockerfile*', ('docker',)))
+    """
+    extension_index: dict[str, list[str]] = {}
+    patterns: dict[str, list[str]] = {}
+    for lang, exts in LANGUAGE_TO_EXTENSIONS.items():
+        if lang in LANGUAGE_ALIASES:
+            continue
+        for ext in exts:
+            table = patterns if "*" in ext else extension_index
+            languages = table.setdefault(ext, [])
+            if lang not in languages:
+                languages.append(lang)
+    return (
+        {ext: tuple(langs) for ext, langs in extension_index.items()},
+        tuple((pattern, tuple(langs)) for pattern, langs in patterns.items()),
+    )
+
+
+# Exact extension -> languages index (e.g. '.v' -> ('vlang', 'verilog')),
+# and filename patterns that are not plain extensions (e.g. 'Dockerfile*')
+EXTENSION_INDEX, FILENAME_PATTERNS = _build_extension_indexes()
+
+# Case-insensitive fallback for extensions (e.g. '.PY' -> python)
+_EXTENSION_INDEX_LOWER: dict[str, tuple[str, ...]] = {}
+for _ext, _langs in EXTENSION_INDEX.items():
+    _merged = _EXTENSION_INDEX_LOWER.get(_ext.lower(), ())
+    _EXTENSION_INDEX_LOWER[_ext.lower()] = _merged + tuple(
+        lang for lang in _langs if lang not in _merged
+    )
 
 def languages_to_globs(languages: list[str]) -> str:
     """
@@ -107,30 +156,188 @@ def languages_to_globs(languages: list[str]) -> str:
     return ",".join(sorted(set(extensions)))
 
 
-def globs_to_languages(globs: str) -> list[str]:
+@lru_cache(maxsize=1024)
+def compress_globs(globs: str) -> str:
+    """
+    Collapse the extension globs of a glob list into one brace pattern.
+
+    '**/*.c,**/*.h,Dockerfile*' becomes '**/*.{c,h},Dockerfile*': plain
+    '**/*.<ext>' patterns are merged and deduplicated, every other pattern
+    is kept as is. Extensions differing only in case (e.g. '.r' and '.R')
+    both stay in the brace group, since IDE glob matchers are
+    case-sensitive. Expanding the braces again (see globs_to_languages)
+    yields exactly the input patterns, so both forms match the same files.
+
+    Args:
+        globs: Comma-separated glob patterns (e.g. from languages_to_globs)
+
+    Returns:
+        Comma-separated glob patterns, extension globs first
+    """
+    if not globs:
+        return globs
+
+    extensions = []
+    others = []
+    for pattern in _split_globs(globs):
+        extension = pattern[5:] if pattern.startswith("**/*.") else ""
+        if extension and not any(c in extension for c in "*?[]{},/"):
+            if extension not in extensions:
+                extensions.append(extension)
+        elif pattern not in others:
+            others.append(pattern)
+
+    if len(extensions) > 1:
+        merged = [f"**/*.{{{','.join(sorted(extensions))}}}"]
+    else:
+        merged = [f"**/*.{extension}" for extension in extensions]
+    return ",".join(merged + others)
+
+
+_BRACES = re.compile(r"\{([^{}]*)\}")
+
+
+def languages_for_extension(extension: str) -> tuple[str, ...]:
+    """
+    Look up the languages that use a file extension.
+
+    Ambiguity policy: an extension declared by several languages resolves
+    to all of them, in LANGUAGE_TO_EXTENSIONS order (e.g. '.v' -> vlang and
+    verilog). Aliases with identical extension lists resolve only to the
+    first declared name (e.g. '.cpp' -> cpp, not c++). Extensions are
+    matched exactly first and case-insensitively if there is no exact entry
+    (so '.R' and '.r' stay distinct, while '.PY' still finds python).
+
+    Args:
+        extension: Extension including the dot (e.g. '.py')
+
+    Returns:
+        Tuple of language names, empty if the extension is unknown
+    """
+    languages = EXTENSION_INDEX.get(extension)
+    if languages is None:
+        languages = _EXTENSION_INDEX_LOWER.get(extension.lower(), ())
+    return languages
+
+
+def languages_for_filename(filename: str) -> tuple[str, ...]:
+    """
+    Look up the languages of a file by name (no directory components).
+
+    Filename patterns such as 'Dockerfile*' are checked first, then the
+    last extension of the name.
+
+    Args:
+        filename: File name (e.g. 'app.py', 'Dockerfile.dev')
+
+    Returns:
+        Tuple of language names, empty if no language matches
+    """
+    for pattern, languages in FILENAME_PATTERNS:
+        if fnmatch.fnmatchcase(filename, pattern):
+            return languages
+    dot = filename.rfind(".")
+    if dot <= 0:
+        return ()
+    return languages_for_extension(filename[dot:])
+
+
+def _expand_braces(pattern: str) -> list[str]:
+    """Expand brace alternatives, e.g. '*.{c,h}' -> ['*.c', '*.h']."""
+    match = _BRACES.search(pattern)
+    if not match:
+        return [pattern]
+    expanded = []
+    for alternative in match.group(1).split(","):
+        expanded.extend(
+            _expand_braces(pattern[: match.start()] + alternative + pattern[match.end() :])
+        )
+    return expanded
+
+
+@lru_cache(maxsize=4096)
+def languages_for_glob(pattern: str) -> tuple[str, ...]:
+    """
+    Resolve a single glob pattern to the languages it targets.
+
+    Only the last path segment is considered. Supported forms are extension
+    globs ('**/*.py', 'src/*.tsx', '**/*.{c,h}'), the filename patterns of
+    LANGUAGE_TO_EXTENSIONS ('Dockerfile*') and literal file names
+    ('Dockerfile', 'main.go'). Multi-part extensions fall back to their last
+    part ('*.d.ts' -> typescript). See languages_for_extension for how
+    shared extensions are resolved.
+
+    Args:
+        pattern: Glob pattern (e.g. '**/*.py')
+
+    Returns:
+        Tuple of language names in first-match order, empty for universal or
+        unknown patterns
+    """
+    languages = []
+    for alternative in _expand_braces(pattern.strip()):
+        name = alternative.rsplit("/", 1)[-1]
+        found = ()
+        for filename_pattern, pattern_languages in FILENAME_PATTERNS:
+            if fnmatch.fnmatchcase(name, filename_pattern):
+                found = pattern_languages
+                break
+        else:
+            if name.startswith("*.") and not any(c in name[1:] for c in "*?["):
+                extension = name[1:]
+                found = languages_for_extension(extension)
+                if not found:
+                    found = languages_for_extension(extension[extension.rfind(".") :])
+            elif not any(c in name for c in "*?["):
+                found = languages_for_filename(name)
+        for lang in found:
+            if lang not in languages:
+                languages.append(lang)
+    return tuple(languages)
+
+
+def globs_to_languages(globs: str | Iterable[str]) -> list[str]:
     """
     Convert glob patterns to list of languages.
-    
+
+    Each pattern is resolved with exact lookups in the precomputed
+    extension index (see languages_for_glob), so overlapping extensions
+    such as '.c' and '.cpp' no longer match each other.
+
     Args:
-        globs: Comma-separated glob patterns (e.g., '**/*.py,**/*.js')
-    
+        globs: Comma-separated glob patterns (e.g. '**/*.py,**/*.js') or an
+            iterable of patterns (e.g. the lines of a large glob list)
+
     Returns:
         Sorted list of language names that match the glob patterns
         Empty list if no patterns or universal glob provided
     """
-    if not globs or globs in ["**", "*", "**/*"]:
+    if not globs:
         return []
+    if isinstance(globs, str):
+        if globs in ["**", "*", "**/*"]:
+            return []
+        globs = _split_globs(globs)
 
     languages = set()
-    patterns = globs.split(",")
+    for pattern in globs:
+        languages.update(languages_for_glob(pattern))
 
-    for pattern in patterns:
-        pattern = pattern.strip().lower()
+    return sorted(languages)
 
-        # Check for file extensions and patterns
-        for ext, lang in EXTENSION_TO_LANGUAGE.items():
-            if ext.lower() in pattern:
-                languages.add(lang)
-                break  # One match per pattern is enough
 
-    return sorted(languages)
+def _split_globs(globs: str) -> list[str]:
+    """Split a comma-separated glob list, keeping commas inside braces."""
+    patterns = []
+    depth = 0
+    start = 0
+    for index, ch in enumerate(globs):
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth = max(depth - 1, 0)
+        elif ch == "," and depth == 0:
+            patterns.append(globs[start:index])
+            start = index + 1
+    patterns.append(globs[start:])
+    return patterns
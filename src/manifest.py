@@ -0,0 +1,403 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Build Manifest
+
+Persists what the previous conversion run produced so the next run can skip
+rules whose content has not changed and prune outputs of deleted rules.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from writer import write_if_changed
+
+# Name of the manifest file written to the output directory
+MANIFEST_FILENAME = ".codeguard-manifest.json"
+
+# Bump when the manifest layout changes
+MANIFEST_SCHEMA = 1
+
+
+def hash_content(data: bytes) -> str:
+    """
+    Compute the content hash used to detect changed rule files.
+
+    Args:
+        data: Raw file bytes
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    """
+    Compute hash_content for a file without reading it into memory at once.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex-encoded SHA-256 digest
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """
+    Represents the recorded conversion of a single rule file.
+
+    Attributes:
+        content_hash: SHA-256 of the rule file at conversion time
+        languages: Languages the rule applies to (empty if always applies)
+        outputs: Generated files, relative to the output directory (POSIX style)
+    """
+
+    content_hash: str
+    languages: list[str]
+    outputs: list[str] = field(default_factory=list)
+
+
+class BuildManifest:
+    """
+    Maps rule filenames to the hash, languages and outputs of their last conversion.
+
+    A manifest is only reused when it was produced by the same version,
+    generator and set of formats; otherwise it loads empty and every rule
+    is converted again.
+
+    Example:
+        manifest = BuildManifest.load(output_base / MANIFEST_FILENAME, fingerprint)
+        if manifest.is_current("my-rule.md", content_hash, output_base):
+            ...  # skip conversion
+        manifest.record("my-rule.md", content_hash, ["python"], outputs)
+        manifest.save()
+    """
+
+    def __init__(self, path: Path, fingerprint: dict[str, object]):
+        """
+        Initialize an empty manifest.
+
+        Args:
+            path: Location of the manifest file
+            fingerprint: Settings that must match for entries to be reused
+                (e.g. version, generator version, format names)
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.entries: dict[str, ManifestEntry] = {}
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: dict[str, object]) -> "BuildManifest":
+        """
+        Load a manifest from disk.
+
+        Missing, unreadable or outdated manifests yield an empty manifest.
+
+        Args:
+            path: Location of the manifest file
+            fingerprint: Settings of the current run
+
+        Returns:
+            BuildManifest with reusable entries, if any
+        """
+        manifest = cls(path, fingerprint)
+        try:
+            data = json.loads(manifest.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return manifest
+
+        if (
+            not isinstance(data, dict)
+            or data.get("schema") != MANIFEST_SCHEMA
+            or data.get("fingerprint") != fingerprint
+        ):
+            return manifest
+
+        for rule_key, entry in data.get("rules", {}).items():
+            try:
+                manifest.entries[rule_key] = ManifestEntry(
+                    content_hash=entry["content_hash"],
+                    languages=list(entry["languages"]),
+                    outputs=list(entry["outputs"]),
+                )
+            except (KeyError, TypeError):
+                continue
+
+        return manifest
+
+    def is_current(
+        self,
+        rule_key: str,
+        content_hash: str,
+        output_base: Path,
+        languages: list[str] | tuple[str, ...] | None = None,
+    ) -> bool:
+        """
+        Check whether a rule's recorded outputs are still up to date.
+
+        Args:
+            rule_key: Rule filename
+            content_hash: Hash of the rule's current content
+            output_base: Output directory the recorded paths are relative to
+            languages: Languages the rule is generated for in this run, if
+                known. They can differ from the rule file's (e.g. when a
+                token budget trims them), so they must match the recorded
+                languages too.
+
+        Returns:
+            True if the hash (and languages) match and every recorded output
+            still exists
+        """
+        entry = self.entries.get(rule_key)
+        if entry is None or entry.content_hash != content_hash:
+            return False
+        if languages is not None and list(languages) != entry.languages:
+            return False
+        return all((output_base / output).is_file() for output in entry.outputs)
+
+    def record(
+        self,
+        rule_key: str,
+        content_hash: str,
+        languages: list[str],
+        outputs: list[str],
+    ) -> None:
+        """
+        Record a successful conversion.
+
+        Args:
+            rule_key: Rule filename
+            content_hash: Hash of the converted content
+            languages: Languages the rule applies to
+            outputs: Generated files relative to the output directory
+        """
+        self.entries[rule_key] = ManifestEntry(
+            content_hash=content_hash,
+            languages=list(languages),
+            outputs=list(outputs),
+        )
+
+    def remove(self, rule_key: str) -> ManifestEntry | None:
+        """
+        Forget a rule.
+
+        Args:
+            rule_key: Rule filename
+
+        Returns:
+            The removed entry, or None if the rule was not recorded
+        """
+        return self.entries.pop(rule_key, None)
+
+    def prune(self, current_keys: set[str], output_base: Path) -> list[str]:
+        """
+        Remove entries for rules that no longer exist and delete their outputs.
+
+        Outputs still claimed by a remaining entry are kept.
+
+        Args:
+            current_keys: Filenames of the rules present in this run
+            output_base: Output directory the recorded paths are relative to
+
+        Returns:
+            Sorted list of deleted output paths (relative to output_base)
+        """
+        stale_entries = [
+            self.entries.pop(rule_key)
+            for rule_key in sorted(set(self.entries) - current_keys)
+        ]
+        claimed = {
+            output for entry in self.entries.values() for output in entry.outputs
+        }
+
+        removed = []
+        for entry in stale_entries:
+            for output in entry.outputs:
+                if output in claimed:
+                    continue
+                output_file = output_base / output
+                if output_file.is_file():
+                    output_file.unlink()
+                    removed.append(output)
+
+        return sorted(removed)
+
+    def save(self) -> None:
+        """Write the manifest to disk."""
+        data = {
+            "schema": MANIFEST_SCHEMA,
+            "fingerprint": self.fingerprint,
+            "rules": {
+                rule_key: {
+                    "content_hash": entry.content_hash,
+                    "languages": entry.languages,
+                    "outputs": entry.outputs,
+                }
+                for rule_key, entry in sorted(self.entries.items())
+            },
+        }
+        write_if_changed(
+            self.path, json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+        )
+
+
+# Name of the language index written to the output directory
+LANGUAGE_INDEX_FILENAME = ".codeguard-languages.json"
+
+
+class LanguageIndex:
+    """
+    Persisted languages of every converted rule, the source of the SKILL.md table.
+
+    Each run updates the entries of the rules it converted or removed, so
+    single-file and incremental runs produce the table of the whole corpus
+    without re-parsing it. The index also keeps the estimated size of each
+    rule's generated output, as (bytes, tokens), for token budget reports.
+
+    Example:
+        index = LanguageIndex.load(output_base / LANGUAGE_INDEX_FILENAME)
+        index.update("my-rule.md", ["python"], (5120, 1280))
+        language_to_rules = index.language_to_rules()
+        index.save()
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        rules: dict[str, list[str]] | None = None,
+        sizes: dict[str, tuple[int, int]] | None = None,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            path: Location of the index file
+            rules: Languages per rule filename
+            sizes: Estimated (bytes, tokens) of the output per rule filename
+        """
+        self.path = Path(path)
+        self.rules: dict[str, list[str]] = dict(rules or {})
+        self.sizes: dict[str, tuple[int, int]] = dict(sizes or {})
+        self.exists = False
+
+    @classmethod
+    def load(cls, path: Path) -> "LanguageIndex":
+        """
+        Load the index from disk.
+
+        Missing, unreadable or outdated files yield an empty index whose
+        exists attribute is False.
+
+        Args:
+            path: Location of the index file
+
+        Returns:
+            LanguageIndex
+        """
+        index = cls(path)
+        try:
+            data = json.loads(index.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return index
+
+        if not isinstance(data, dict) or data.get("schema") != MANIFEST_SCHEMA:
+            return index
+
+        for rule_key, languages in data.get("rules", {}).items():
+            if isinstance(languages, list):
+                index.rules[rule_key] = [str(language) for language in languages]
+        for rule_key, size in data.get("sizes", {}).items():
+            try:
+                size_bytes, tokens = size
+                index.sizes[rule_key] = (int(size_bytes), int(tokens))
+            except (TypeError, ValueError):
+                continue
+        index.exists = True
+        return index
+
+    def update(
+        self,
+        rule_key: str,
+        languages: list[str],
+        size: tuple[int, int] | None = None,
+    ) -> None:
+        """
+        Record the languages of a converted rule.
+
+        Args:
+            rule_key: Rule filename
+            languages: Languages the rule applies to (empty if always applies)
+            size: Estimated (bytes, tokens) of the rule's output; the
+                recorded size is kept if omitted
+        """
+        self.rules[rule_key] = list(languages)
+        if size is not None:
+            self.sizes[rule_key] = tuple(size)
+
+    def remove(self, rule_key: str) -> None:
+        """
+        Forget a rule (removed, or no longer converting).
+
+        Args:
+            rule_key: Rule filename
+        """
+        self.rules.pop(rule_key, None)
+        self.sizes.pop(rule_key, None)
+
+    def prune(self, current_keys: set[str]) -> None:
+        """
+        Forget every rule that is not in current_keys.
+
+        Args:
+            current_keys: Filenames of the rules present in a full run
+        """
+        for rule_key in set(self.rules) - current_keys:
+            self.remove(rule_key)
+
+    def language_to_rules(self) -> dict[str, list[str]]:
+        """
+        Invert the index for the SKILL.md table.
+
+        Returns:
+            Dictionary mapping languages to the filenames of their rules
+        """
+        language_to_rules: dict[str, list[str]] = {}
+        for rule_key, languages in self.rules.items():
+            for language in languages:
+                language_to_rules.setdefault(language, []).append(rule_key)
+        return language_to_rules
+
+    def save(self) -> bool:
+        """
+        Write the index to disk if it changed.
+
+        Returns:
+            True if the file was written
+        """
+        data = {
+            "schema": MANIFEST_SCHEMA,
+            "rules": {
+                rule_key: languages for rule_key, languages in sorted(self.rules.items())
+            },
+            "sizes": {
+                rule_key: list(size)
+                for rule_key, size in sorted(self.sizes.items())
+                if rule_key in self.rules
+            },
+        }
+        self.exists = True
+        return write_if_changed(
+            self.path, json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+        )
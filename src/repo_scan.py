@@ -0,0 +1,191 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Repository Scan
+
+Finds the languages used in a target repository from a histogram of its
+file extensions, so rules for languages that do not occur in it can be
+left out (see convert_rules' target_repo option).
+
+Usage:
+    python repo_scan.py ../my-service
+"""
+
+import fnmatch
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from language_mappings import FILENAME_PATTERNS, LANGUAGE_ALIASES, languages_for_extension
+from utils import is_ignored, read_ignore_file
+
+# Version control folders, never scanned
+SKIPPED_DIRECTORIES = frozenset({".git", ".hg", ".svn"})
+
+GITIGNORE_FILENAME = ".gitignore"
+
+
+@dataclass(slots=True)
+class RepoScan:
+    """
+    File statistics of a repository.
+
+    Attributes:
+        root: Scanned folder
+        files: Number of files that were not ignored
+        extensions: Number of files per extension (e.g. {'.go': 120})
+        languages: Number of files per language
+    """
+
+    root: Path
+    files: int = 0
+    extensions: Counter = field(default_factory=Counter)
+    languages: Counter = field(default_factory=Counter)
+
+    def present_languages(self) -> frozenset[str]:
+        """
+        Return the languages with at least one file, including aliases.
+
+        Aliases are included so rules declaring 'c++' match a repository
+        with '.cpp' files (which resolve to 'cpp').
+        """
+        present = set(self.languages)
+        present.update(
+            alias for alias, language in LANGUAGE_ALIASES.items() if language in present
+        )
+        return frozenset(present)
+
+
+def _filename_matchers():
+    """Compile FILENAME_PATTERNS into (matcher, languages) pairs."""
+    matchers = []
+    for pattern, languages in FILENAME_PATTERNS:
+        literal = pattern[:-1]
+        if pattern.endswith("*") and not any(c in literal for c in "*?["):
+            # 'Dockerfile*' is a plain prefix test
+            matches = lambda name, prefix=literal: name.startswith(prefix)
+        else:
+            matches = lambda name, pattern=pattern: fnmatch.fnmatchcase(name, pattern)
+        matchers.append((matches, languages))
+    return matchers
+
+
+def scan_repository(root: str | Path) -> RepoScan:
+    """
+    Count the files of a repository per extension and language.
+
+    The folder tree is walked once with os.scandir. Version control
+    folders and symlinked folders are skipped, and .gitignore files (plus
+    .git/info/exclude) are honored with the pattern subset described in
+    utils.read_ignore_file. Languages are resolved once per distinct
+    extension; an extension shared by several languages (e.g. '.v')
+    counts for all of them. Files matching FILENAME_PATTERNS count for the
+    pattern's languages as well as for their extension.
+
+    Args:
+        root: Repository folder
+
+    Returns:
+        RepoScan of the repository
+
+    Raises:
+        NotADirectoryError: If root is not a folder
+    """
+    root = Path(root)
+    if not root.is_dir():
+        raise NotADirectoryError(f"Not a directory: {root}")
+
+    extensions = Counter()
+    pattern_files = Counter()
+    matchers = _filename_matchers()
+    files = 0
+
+    root_patterns = read_ignore_file(root / ".git" / "info", "exclude")
+    root_patterns = [(root, pattern, dir_only) for _, pattern, dir_only in root_patterns]
+    stack = [(root, root_patterns + read_ignore_file(root, GITIGNORE_FILENAME))]
+    while stack:
+        directory, patterns = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                scanned = list(it)
+        except (PermissionError, FileNotFoundError):
+            continue
+
+        for entry in scanned:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir and name in SKIPPED_DIRECTORIES:
+                continue
+            if patterns and is_ignored(Path(entry.path), is_dir, patterns):
+                continue
+            if is_dir:
+                subdirectory = Path(entry.path)
+                stack.append(
+                    (subdirectory, patterns + read_ignore_file(subdirectory, GITIGNORE_FILENAME))
+                )
+                continue
+
+            files += 1
+            for matches, languages in matchers:
+                if matches(name):
+                    pattern_files[languages] += 1
+                    break
+            # A pattern match does not replace the extension:
+            # 'docker-compose.yml' counts for docker and yaml
+            dot = name.rfind(".")
+            if dot > 0:
+                extensions[name[dot:]] += 1
+
+    scan = RepoScan(root=root, files=files, extensions=extensions)
+    for extension, count in extensions.items():
+        for language in languages_for_extension(extension):
+            scan.languages[language] += count
+    for languages, count in pattern_files.items():
+        for language in languages:
+            scan.languages[language] += count
+    return scan
+
+
+def main():
+    """Print the extension and language histogram of a repository."""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Show which languages a repository uses.",
+        epilog="Example:\n  python repo_scan.py ../my-service --top 10",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("root", help="repository folder")
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="number of extensions to list (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    scan = scan_repository(args.root)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print(f"Scanned {scan.files} files in {scan.root} ({elapsed_ms:.1f} ms)\n")
+    print("| Language | Files |")
+    print("|----------|------:|")
+    for language, count in scan.languages.most_common():
+        print(f"| {language} | {count} |")
+
+    print("\n| Extension | Files |")
+    print("|-----------|------:|")
+    for extension, count in scan.extensions.most_common(args.top):
+        print(f"| {extension} | {count} |")
+
+
+if __name__ == "__main__":
+    main()
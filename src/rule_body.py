@@ -0,0 +1,75 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Rule Body
+
+Reference to the markdown body of a large rule file that stays on disk.
+Outputs are written by copying the body straight from a memory map of the
+rule file instead of building the full text in memory.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True, slots=True)
+class RuleBody:
+    """
+    Byte range of a rule body inside its source file.
+
+    The range covers the body after frontmatter stripping, so it can be
+    copied unchanged into every output. The file's size and modification
+    time are recorded to detect changes between parsing and writing.
+
+    Attributes:
+        path: Rule file
+        offset: Start of the body in bytes
+        length: Length of the body in bytes
+        file_size: Size of the rule file when it was parsed
+        mtime_ns: Modification time of the rule file when it was parsed
+
+    Example:
+        with body.view() as data:
+            output.write(data)
+    """
+
+    path: Path
+    offset: int
+    length: int
+    file_size: int
+    mtime_ns: int
+
+    @contextmanager
+    def view(self):
+        """
+        Map the body into memory.
+
+        Yields:
+            Read-only memoryview of the body bytes (valid inside the block)
+
+        Raises:
+            RuntimeError: If the rule file changed since it was parsed
+        """
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size != self.file_size or stat.st_mtime_ns != self.mtime_ns:
+                raise RuntimeError(f"{self.path.name} changed since it was parsed")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as whole:
+                    with whole[self.offset : self.offset + self.length] as view:
+                        yield view
+
+    def read_text(self) -> str:
+        """
+        Load the body as text, for consumers that need the whole string.
+
+        Returns:
+            Body text
+        """
+        with self.view() as data:
+            return str(data, "utf-8")
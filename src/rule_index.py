@@ -0,0 +1,202 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Rule Index
+
+Answers "which rules apply to this file?" for single paths or very large
+path listings, using the same glob patterns that are written into the IDE
+rule files.
+"""
+
+import fnmatch
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from corpus import RuleCorpus, find_rule_files
+from formats import ProcessedRule
+from language_mappings import languages_to_globs
+
+
+class RuleIndex:
+    """
+    Maps file paths to applicable rule IDs in constant time per path.
+
+    Each rule's globs (from languages_to_globs, "**/*" for always-apply
+    rules) are split into extension globs ('**/*.py'), which are stored in
+    a hash table keyed by extension, and filename globs ('Dockerfile*'),
+    which are matched against the file name. Results are cached per
+    (extension, matched filename patterns), so resolving a path is one
+    rfind, a prefix test per filename pattern and one dictionary lookup.
+
+    Matching is case-sensitive, like the IDE glob matchers, and considers
+    only the file name, so 'Dockerfile*' applies in every directory.
+
+    Example:
+        index = RuleIndex.from_corpus(RuleCorpus.load(find_rule_files("rules/")))
+        index.match("src/foo/bar.tsx")
+        # ('codeguard-0-api-web-services', ..., 'codeguard-1-hardcoded-credentials')
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._universal: set[str] = set()
+        self._by_extension: dict[str, set[str]] = {}
+        self._by_pattern: dict[str, set[str]] = {}
+        self._rule_ids: set[str] = set()
+        self._pattern_matchers: list[tuple[str, Callable[[str], bool]]] = []
+        self._cache: dict[tuple[str, tuple[str, ...]], tuple[str, ...]] = {}
+
+    @classmethod
+    def from_rules(cls, rules: Iterable[ProcessedRule]) -> "RuleIndex":
+        """
+        Build an index from parsed rules.
+
+        Args:
+            rules: Parsed rules (e.g. RuleCorpus.rules)
+
+        Returns:
+            RuleIndex containing every rule
+        """
+        index = cls()
+        for rule in rules:
+            index.add_rule(rule)
+        return index
+
+    @classmethod
+    def from_corpus(cls, corpus: RuleCorpus) -> "RuleIndex":
+        """Build an index from the valid rules of a corpus."""
+        return cls.from_rules(corpus.rules)
+
+    def __len__(self) -> int:
+        return len(self._rule_ids)
+
+    def add_rule(self, rule: ProcessedRule) -> None:
+        """
+        Add a rule to the index, replacing an earlier rule with the same ID.
+
+        Args:
+            rule: Parsed rule
+        """
+        rule_id = Path(rule.filename).stem
+        self.remove_rule(rule_id)
+        self._rule_ids.add(rule_id)
+
+        # Same globs as RuleConverter.generate_globs
+        globs = languages_to_globs(rule.languages) or "**/*"
+        for glob in globs.split(","):
+            name = glob.rsplit("/", 1)[-1]
+            if name == "*":
+                self._universal.add(rule_id)
+            elif name.startswith("*.") and not any(c in name[1:] for c in "*?["):
+                self._by_extension.setdefault(name[1:], set()).add(rule_id)
+            else:
+                self._by_pattern.setdefault(name, set()).add(rule_id)
+
+        self._invalidate()
+
+    def remove_rule(self, rule_id: str) -> None:
+        """
+        Remove a rule from the index if present.
+
+        Args:
+            rule_id: Rule filename without extension
+        """
+        if rule_id not in self._rule_ids:
+            return
+        self._rule_ids.discard(rule_id)
+        self._universal.discard(rule_id)
+        for table in (self._by_extension, self._by_pattern):
+            for key in [key for key, ids in table.items() if rule_id in ids]:
+                table[key].discard(rule_id)
+                if not table[key]:
+                    del table[key]
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Drop cached results and recompile the filename pattern matchers."""
+        self._cache.clear()
+        self._pattern_matchers = []
+        for pattern in self._by_pattern:
+            literal = pattern[:-1]
+            if pattern.endswith("*") and not any(c in literal for c in "*?["):
+                # 'Dockerfile*' is a plain prefix test
+                matches = lambda name, prefix=literal: name.startswith(prefix)
+            else:
+                matches = lambda name, pattern=pattern: fnmatch.fnmatchcase(name, pattern)
+            self._pattern_matchers.append((pattern, matches))
+
+    def match(self, path: str) -> tuple[str, ...]:
+        """
+        Return the rules that apply to a file path.
+
+        Args:
+            path: File path, relative or absolute ('/' or os.sep separated)
+
+        Returns:
+            Sorted tuple of rule IDs
+        """
+        name = path.rsplit("/", 1)[-1]
+        if os.sep != "/":
+            name = name.rsplit(os.sep, 1)[-1]
+
+        dot = name.rfind(".")
+        extension = name[dot:] if dot >= 0 else ""
+
+        patterns = ()
+        if self._pattern_matchers:
+            patterns = tuple(
+                pattern for pattern, matches in self._pattern_matchers if matches(name)
+            )
+
+        key = (extension, patterns)
+        result = self._cache.get(key)
+        if result is None:
+            rule_ids = set(self._universal)
+            rule_ids.update(self._by_extension.get(extension, ()))
+            for pattern in patterns:
+                rule_ids.update(self._by_pattern[pattern])
+            result = self._cache[key] = tuple(sorted(rule_ids))
+        return result
+
+    def match_many(self, paths: Iterable[str]) -> Iterator[tuple[str, tuple[str, ...]]]:
+        """
+        Resolve many paths lazily.
+
+        Args:
+            paths: File paths, e.g. the lines of a repository listing
+
+        Yields:
+            Tuples of (path, sorted rule IDs)
+        """
+        match = self.match
+        for path in paths:
+            yield path, match(path)
+
+
+def main():
+    """Print the rules that apply to each path given as argument or on stdin."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="List the rules that apply to file paths.",
+        epilog="Example:\n  git ls-files | python rule_index.py rules/",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("rules", help="rule file or folder containing .md files")
+    parser.add_argument("paths", nargs="*", help="paths to resolve (default: stdin)")
+    args = parser.parse_args()
+
+    index = RuleIndex.from_corpus(RuleCorpus.load(find_rule_files(args.rules)))
+    paths = args.paths or (line.rstrip("\n") for line in sys.stdin)
+
+    write = sys.stdout.write
+    for path, rule_ids in index.match_many(paths):
+        write(f"{path}\t{','.join(rule_ids)}\n")
+
+
+if __name__ == "__main__":
+    main()
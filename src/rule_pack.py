@@ -0,0 +1,457 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Rule Pack
+
+Compiled, read-only form of a rule corpus for tools that load the rules
+again and again (bots, daemons, editor plugins). A pack is memory-mapped,
+so opening it reads only the header, looking up a rule by ID touches one
+hash slot and one index record, and filtering by language scans only the
+fixed-size index records. Markdown and YAML are never parsed.
+
+Layout (little-endian):
+
+    header      magic, schema, rule count, language count, size of the
+                language table, bitset size, slot count (_HEADER)
+    languages   language names separated by '\\n'; bit i of a language
+                bitset stands for the i-th name
+    slots       slot count x u32: record number + 1 of the rule whose
+                CRC-32 of its ID maps to the slot (linear probing), 0 if
+                the slot is empty
+    records     one per rule, sorted by rule ID: offset of its strings,
+                lengths of its ID, description and languages, offset and
+                length of its body, flags (_RECORD), followed by its
+                language bitset
+    strings     per rule its ID, description and '\\n'-separated languages
+                in declaration order (UTF-8)
+    bodies      rule content (UTF-8)
+
+Usage:
+    python rule_pack.py rules/ rules.pack
+    python rule_pack.py --show rules.pack
+"""
+
+import mmap
+import struct
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from corpus import intern_languages
+from formats import ProcessedRule
+from writer import write_parts_if_changed
+
+PACK_MAGIC = b"CGRPACK\0"
+
+# Bump when the pack layout changes
+PACK_SCHEMA = 1
+
+# magic, schema, rules, languages, language table bytes, bitset bytes, slots
+_HEADER = struct.Struct("<8sIIIIII")
+
+# Strings offset, ID/description/languages lengths, body offset/length, flags
+_RECORD = struct.Struct("<QIIIQQB")
+
+_SLOT = struct.Struct("<I")
+
+# Record flags
+_ALWAYS_APPLY = 1
+
+
+def _rule_id(rule: ProcessedRule) -> str:
+    """Return the ID of a rule (filename without extension)."""
+    return Path(rule.filename).stem
+
+
+def _slot_count(rule_count: int) -> int:
+    """Return the number of hash slots: a power of two, at most half full."""
+    slots = 1
+    while slots < rule_count * 2:
+        slots *= 2
+    return slots
+
+
+def _rule_hash(rule_id: bytes) -> int:
+    """Return the hash of an encoded rule ID (stable across processes)."""
+    return zlib.crc32(rule_id)
+
+
+def build_pack(rules: Iterable[ProcessedRule]) -> list[bytes]:
+    """
+    Compile rules into the parts of a pack file.
+
+    Args:
+        rules: Parsed rules; their IDs must be unique
+
+    Returns:
+        Consecutive pieces of the pack file
+
+    Raises:
+        ValueError: If two rules have the same ID
+    """
+    by_id = {}
+    for rule in rules:
+        rule_id = _rule_id(rule)
+        if rule_id in by_id:
+            raise ValueError(f"Duplicate rule ID in pack: {rule_id}")
+        by_id[rule_id] = rule
+    rule_ids = sorted(by_id)
+
+    languages = sorted({language for rule in by_id.values() for language in rule.languages})
+    language_bits = {language: 1 << index for index, language in enumerate(languages)}
+    language_table = "\n".join(languages).encode("utf-8")
+    bitset_size = (len(languages) + 7) // 8
+    slot_count = _slot_count(len(rule_ids))
+
+    record_size = _RECORD.size + bitset_size
+    strings_offset = (
+        _HEADER.size
+        + len(language_table)
+        + slot_count * _SLOT.size
+        + len(rule_ids) * record_size
+    )
+
+    encoded_ids = [rule_id.encode("utf-8") for rule_id in rule_ids]
+    rule_strings = [
+        (
+            encoded_id,
+            by_id[rule_id].description.encode("utf-8"),
+            "\n".join(by_id[rule_id].languages).encode("utf-8"),
+        )
+        for rule_id, encoded_id in zip(rule_ids, encoded_ids)
+    ]
+    strings = b"".join(value for values in rule_strings for value in values)
+
+    bodies = []
+    for rule_id in rule_ids:
+        rule = by_id[rule_id]
+        body = rule.content.encode("utf-8")
+        if rule.body is not None:
+            with rule.body.view() as data:
+                body += data
+        bodies.append(body)
+
+    slots = [0] * slot_count
+    records = []
+    string_position = strings_offset
+    body_position = strings_offset + len(strings)
+    for number, (rule_id, (encoded_id, description, rule_languages), body) in enumerate(
+        zip(rule_ids, rule_strings, bodies)
+    ):
+        rule = by_id[rule_id]
+        slot = _rule_hash(encoded_id) & (slot_count - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = number + 1
+
+        bitset = 0
+        for language in rule.languages:
+            bitset |= language_bits[language]
+        records.append(
+            _RECORD.pack(
+                string_position,
+                len(encoded_id),
+                len(description),
+                len(rule_languages),
+                body_position,
+                len(body),
+                _ALWAYS_APPLY if rule.always_apply else 0,
+            )
+            + bitset.to_bytes(bitset_size, "little")
+        )
+        string_position += len(encoded_id) + len(description) + len(rule_languages)
+        body_position += len(body)
+
+    header = _HEADER.pack(
+        PACK_MAGIC,
+        PACK_SCHEMA,
+        len(rule_ids),
+        len(languages),
+        len(language_table),
+        bitset_size,
+        slot_count,
+    )
+    slot_table = struct.pack(f"<{slot_count}I", *slots)
+    return [header, language_table, slot_table, b"".join(records), strings, *bodies]
+
+
+def write_pack(rules: Iterable[ProcessedRule], path: str | Path) -> bool:
+    """
+    Compile rules into a pack file, unless it already has this content.
+
+    Args:
+        rules: Parsed rules; their IDs must be unique
+        path: Pack file to write (parent directories are created)
+
+    Returns:
+        True if the file was written, False if it was already up to date
+
+    Raises:
+        ValueError: If two rules have the same ID
+    """
+    return write_parts_if_changed(Path(path), build_pack(rules))
+
+
+class RulePack:
+    """
+    Read-only, memory-mapped view of a pack file.
+
+    Example:
+        with RulePack("rules.pack") as pack:
+            rule = pack.get("codeguard-1-hardcoded-credentials")
+            python_rules = pack.rules_for_language("python")
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Open a pack file and read its header.
+
+        Args:
+            path: Pack file written by write_pack
+
+        Raises:
+            OSError: If the file cannot be opened
+            ValueError: If the file is not a pack of a supported schema
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty file
+                raise ValueError(f"Not a rule pack: {self.path}") from None
+
+        try:
+            (
+                magic,
+                schema,
+                self._rule_count,
+                language_count,
+                table_size,
+                self._bitset_size,
+                self._slot_count,
+            ) = _HEADER.unpack_from(self._data)
+        except struct.error:
+            self.close()
+            raise ValueError(f"Not a rule pack: {self.path}") from None
+        if magic != PACK_MAGIC or schema != PACK_SCHEMA:
+            self.close()
+            raise ValueError(f"Not a rule pack of schema {PACK_SCHEMA}: {self.path}")
+
+        table_end = _HEADER.size + table_size
+        table = self._data[_HEADER.size : table_end].decode("utf-8")
+        self.languages: tuple[str, ...] = tuple(table.split("\n")) if language_count else ()
+        self._language_numbers = {
+            language: index for index, language in enumerate(self.languages)
+        }
+        self._rule_languages: dict[bytes, tuple[str, ...]] = {}
+
+        self._slots_offset = table_end
+        self._records_offset = table_end + self._slot_count * _SLOT.size
+        self._record_size = _RECORD.size + self._bitset_size
+
+    def close(self) -> None:
+        """Unmap the pack file."""
+        self._data.close()
+
+    def __enter__(self) -> "RulePack":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._rule_count
+
+    def __contains__(self, rule_id: str) -> bool:
+        return self._find(rule_id) is not None
+
+    def _record(self, number: int) -> tuple[tuple, int]:
+        """Return the fields and language bitset of the record with this number."""
+        offset = self._records_offset + number * self._record_size
+        fields = _RECORD.unpack_from(self._data, offset)
+        bitset_offset = offset + _RECORD.size
+        bitset = int.from_bytes(
+            self._data[bitset_offset : bitset_offset + self._bitset_size], "little"
+        )
+        return fields, bitset
+
+    def _string(self, offset: int, length: int) -> str:
+        return self._data[offset : offset + length].decode("utf-8")
+
+    def _find(self, rule_id: str) -> tuple[tuple, int] | None:
+        """Return the record of a rule, or None if the pack does not have it."""
+        if not self._rule_count:
+            return None
+        encoded = rule_id.encode("utf-8")
+        mask = self._slot_count - 1
+        slot = _rule_hash(encoded) & mask
+        while True:
+            (number,) = _SLOT.unpack_from(self._data, self._slots_offset + slot * _SLOT.size)
+            if not number:
+                return None
+            record = self._record(number - 1)
+            strings_offset, id_length = record[0][:2]
+            if self._data[strings_offset : strings_offset + id_length] == encoded:
+                return record
+            slot = (slot + 1) & mask
+
+    def _languages(self, offset: int, length: int) -> tuple[str, ...]:
+        """Decode the languages of a rule (cached per distinct list)."""
+        encoded = self._data[offset : offset + length]
+        languages = self._rule_languages.get(encoded)
+        if languages is None:
+            names = encoded.decode("utf-8").split("\n") if encoded else []
+            languages = self._rule_languages[encoded] = intern_languages(names)
+        return languages
+
+    def rule_ids(self) -> Iterator[str]:
+        """
+        Iterate over the IDs of all rules.
+
+        Yields:
+            Rule IDs in sorted order
+        """
+        for number in range(self._rule_count):
+            (strings_offset, id_length, *_), _ = self._record(number)
+            yield self._string(strings_offset, id_length)
+
+    def get(self, rule_id: str) -> ProcessedRule:
+        """
+        Load a rule.
+
+        Args:
+            rule_id: Rule ID (filename without extension)
+
+        Returns:
+            ProcessedRule with its content decoded from the pack
+
+        Raises:
+            KeyError: If the pack has no rule with this ID
+        """
+        record = self._find(rule_id)
+        if record is None:
+            raise KeyError(rule_id)
+        (
+            strings_offset,
+            id_length,
+            description_length,
+            languages_length,
+            body_offset,
+            body_length,
+            flags,
+        ), _ = record
+        description_offset = strings_offset + id_length
+        return ProcessedRule(
+            description=self._string(description_offset, description_length),
+            languages=self._languages(
+                description_offset + description_length, languages_length
+            ),
+            always_apply=bool(flags & _ALWAYS_APPLY),
+            content=self._string(body_offset, body_length),
+            filename=f"{rule_id}.md",
+        )
+
+    def content(self, rule_id: str) -> memoryview:
+        """
+        Return the content of a rule without decoding it.
+
+        Args:
+            rule_id: Rule ID (filename without extension)
+
+        Returns:
+            Read-only view of the UTF-8 content, valid until the pack is closed
+
+        Raises:
+            KeyError: If the pack has no rule with this ID
+        """
+        record = self._find(rule_id)
+        if record is None:
+            raise KeyError(rule_id)
+        body_offset, body_length = record[0][4:6]
+        return memoryview(self._data)[body_offset : body_offset + body_length]
+
+    def rules_for_language(self, language: str, include_always: bool = True) -> list[str]:
+        """
+        Find the rules that apply to files of a language.
+
+        Only the flags and language bitsets of the index records are read,
+        and the IDs of the matching rules.
+
+        Args:
+            language: Language name (e.g. 'python')
+            include_always: Also return rules that apply to every language
+
+        Returns:
+            Rule IDs in sorted order
+        """
+        index = self._language_numbers.get(language)
+        if index is None:
+            if not include_always:
+                return []
+            byte_index = mask = 0
+        else:
+            # Byte of the language's bit after the flags, and the bit in it
+            byte_index, mask = index // 8 + 1, 1 << index % 8
+
+        data = self._data
+        flags_offset = self._records_offset + _RECORD.size - 1
+        rule_ids = []
+        for offset in range(
+            flags_offset, flags_offset + self._rule_count * self._record_size, self._record_size
+        ):
+            if (include_always and data[offset] & _ALWAYS_APPLY) or (
+                mask and data[offset + byte_index] & mask
+            ):
+                strings_offset, id_length = _RECORD.unpack_from(
+                    data, offset - _RECORD.size + 1
+                )[:2]
+                rule_ids.append(self._string(strings_offset, id_length))
+        return rule_ids
+
+
+def main():
+    """Compile rules into a pack file, or list the rules of a pack."""
+    import argparse
+    import sys
+
+    from corpus import RuleCorpus, find_rule_files
+
+    parser = argparse.ArgumentParser(
+        description="Compile rules into a memory-mappable pack file.",
+        epilog="Examples:\n"
+        "  python rule_pack.py rules/ rules.pack\n"
+        "  python rule_pack.py --show rules.pack",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("paths", nargs="+", help="rule folder and pack file, or a pack with --show")
+    parser.add_argument(
+        "--show", action="store_true", help="list the rules of a pack file"
+    )
+    args = parser.parse_args()
+
+    if args.show:
+        with RulePack(args.paths[0]) as pack:
+            print(f"{pack.path}: {len(pack)} rules, {len(pack.languages)} languages")
+            for rule_id in pack.rule_ids():
+                rule = pack.get(rule_id)
+                languages = ", ".join(rule.languages) or "(always)"
+                print(f"  {rule_id}: {languages}")
+        return
+
+    if len(args.paths) != 2:
+        parser.error("expected a rule folder and a pack file")
+    corpus = RuleCorpus.load(find_rule_files(args.paths[0]))
+    if corpus.has_errors:
+        for entry in corpus:
+            if entry.errors:
+                print(f"❌ {entry.filename}: {'; '.join(entry.errors)}")
+        sys.exit(1)
+    changed = write_pack(corpus.rules, args.paths[1])
+    print(f"{'Wrote' if changed else 'Unchanged'}: {args.paths[1]} ({len(corpus)} rules)")
+
+
+if __name__ == "__main__":
+    main()
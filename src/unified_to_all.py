@@ -9,21 +9,370 @@ Converts unified markdown format to all IDE formats (Cursor, Windsurf, Copilot,
 Single source of truth for AI coding rules.
 """
 
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterable, Iterator
+from functools import partial
 from pathlib import Path
-from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from converter import GENERATOR_VERSION, ConversionResult, RuleConverter
+from formats import (
+    BUILTIN_FORMATS,
+    BaseFormat,
+    ProcessedRule,
+    available_formats,
+    create_formats,
+)
+from manifest import (
+    LANGUAGE_INDEX_FILENAME,
+    MANIFEST_FILENAME,
+    BuildManifest,
+    LanguageIndex,
+    hash_file,
+)
+from utils import get_version
+from writer import write_bytes_if_changed, write_if_changed, write_shared_body
+
+# The modules of optional stages are imported where they are used, so that
+# a plain conversion does not pay for them at startup
+if TYPE_CHECKING:
+    import threading
+
+    from aggregate import RuleGroup
+    from budget import RuleSize
+    from cache import CachedRule, OutputCache
+    from corpus import RuleCorpus, RuleEntry
+
+
+# SKILL.md template expected next to the rule files
+SKILL_TEMPLATE_NAME = "codeguard-SKILLS.md.template"
 
-from converter import RuleConverter
-from formats import CursorFormat, WindsurfFormat, CopilotFormat, ClaudeCodeFormat
-from utils import get_version_from_pyproject
+# SKILL.md location relative to the output directory
+SKILL_OUTPUT_PATH = Path("skills") / "software-security" / "SKILL.md"
 
 
-def update_skill_md(language_to_rules: dict[str, list[str]], skill_path: str) -> None:
+def create_converter(version: str, formats: list[str] | None = None) -> RuleConverter:
     """
-    Update SKILL.md with language-to-rules mapping table.
+    Create a RuleConverter for the selected formats.
+
+    Args:
+        version: Version string to include in generated files
+        formats: Format names (see formats.available_formats), None for all
+            built-in formats
+
+    Returns:
+        RuleConverter generating the selected formats
+
+    Raises:
+        ValueError: If a format is unknown
+    """
+    # Only the selected format modules are imported
+    return RuleConverter(formats=create_formats(formats, version))
+
+
+def new_results() -> dict[str, list[str]]:
+    """Return an empty results dictionary as returned by convert_rules."""
+    return {
+        "success": [],
+        "errors": [],
+        "skipped": [],
+        "excluded": [],
+        "written": [],
+        "unchanged": [],
+        "removed": [],
+    }
+
+
+def write_rule_outputs(
+    result: ConversionResult, output_base: Path, results: dict[str, list[str]]
+) -> list[str]:
+    """
+    Write every format output of a converted rule.
+
+    Outputs that share the rule body get it encoded once and written with
+    scatter I/O. Files that already have the generated content are left
+    untouched.
+
+    Args:
+        result: Conversion result of one rule
+        output_base: Output directory
+        results: Results dictionary whose 'written'/'unchanged' lists are updated
+
+    Returns:
+        Output paths relative to output_base, in format order
+    """
+    ide_rules_dir = output_base / "ide_rules"
+    output_files = []
+    output_paths = []
+    written = {}
+
+    # Outputs sharing a body, grouped by body object (one group per rule)
+    shared = {}
+    for format_name, output in result.outputs.items():
+        # Construct output path
+        # Use format's output preference (ide_rules/ or project root)
+        base_dir = ide_rules_dir if output.outputs_to_ide_rules else output_base
+
+        output_file = base_dir / output.subpath / f"{result.basename}{output.extension}"
+        output_files.append(output_file)
+        output_paths.append(output_file.relative_to(output_base).as_posix())
+
+        if output.body is None:
+            # Write the file unless it already has this content
+            written[output_file] = write_if_changed(output_file, output.content)
+        else:
+            shared.setdefault(id(output.body), (output.body, []))[1].append(
+                (
+                    output_file,
+                    output.content.encode("utf-8"),
+                    output.suffix.encode("utf-8"),
+                )
+            )
+
+    # Encode each shared body once and write all its outputs
+    for body, files in shared.values():
+        if isinstance(body, str):
+            changed = write_shared_body(files, body.encode("utf-8"))
+        else:
+            # Copy the streamed body from the rule file into the outputs
+            with body.view() as data:
+                changed = write_shared_body(files, data)
+        written.update(zip((output_file for output_file, _, _ in files), changed))
+
+    for output_file, output_path in zip(output_files, output_paths):
+        if written[output_file]:
+            results["written"].append(output_path)
+        else:
+            results["unchanged"].append(output_path)
+
+    return output_paths
+
+
+def write_cached_outputs(
+    cached: CachedRule,
+    basename: str,
+    formats: list[BaseFormat],
+    output_base: Path,
+    results: dict[str, list[str]],
+) -> list[str]:
+    """
+    Copy the cached outputs of a rule into the output directory.
+
+    Paths are the same as those of write_rule_outputs; files that already
+    have the cached content are left untouched.
+
+    Args:
+        cached: Cache entry of the rule
+        basename: Rule filename without extension
+        formats: Formats to write, in format order
+        output_base: Output directory
+        results: Results dictionary whose 'written'/'unchanged' lists are updated
+
+    Returns:
+        Output paths relative to output_base, in format order
+
+    Raises:
+        OSError: If a cached file disappeared (e.g. evicted by another run)
+    """
+    ide_rules_dir = output_base / "ide_rules"
+    output_paths = []
+    for format_handler in formats:
+        base_dir = ide_rules_dir if format_handler.outputs_to_ide_rules() else output_base
+        output_file = (
+            base_dir
+            / format_handler.get_output_subpath()
+            / f"{basename}{format_handler.get_file_extension()}"
+        )
+
+        data = cached.objects[format_handler.get_format_name()].read_bytes()
+        output_path = output_file.relative_to(output_base).as_posix()
+        if write_bytes_if_changed(output_file, data):
+            results["written"].append(output_path)
+        else:
+            results["unchanged"].append(output_path)
+        output_paths.append(output_path)
+
+    return output_paths
+
+
+def _format_directory(format_handler: BaseFormat, output_base: Path) -> Path:
+    """Return the folder a format writes its rule files to."""
+    ide_rules_dir = output_base / "ide_rules"
+    base_dir = ide_rules_dir if format_handler.outputs_to_ide_rules() else output_base
+    return base_dir / format_handler.get_output_subpath()
+
+
+def write_aggregated_outputs(
+    groups: list[RuleGroup],
+    formats: list[BaseFormat],
+    output_base: Path,
+    results: dict[str, list[str]],
+) -> list[str]:
+    """
+    Write one file per rule group and format (see aggregate.py).
+
+    Args:
+        groups: Rule groups from group_rules
+        formats: Formats taking the aggregated layout
+        output_base: Output directory
+        results: Results dictionary whose 'written'/'unchanged' lists are updated
+
+    Returns:
+        Output paths relative to output_base
+    """
+    from aggregate import build_group_content, render_group
+
+    output_paths = []
+    for group in groups:
+        content = build_group_content(group)
+        output_files = []
+        for format_handler in formats:
+            output_file = (
+                _format_directory(format_handler, output_base)
+                / f"{group.basename}{format_handler.get_file_extension()}"
+            )
+            output_path = output_file.relative_to(output_base).as_posix()
+            if write_if_changed(output_file, render_group(group, format_handler, content)):
+                results["written"].append(output_path)
+            else:
+                results["unchanged"].append(output_path)
+            output_paths.append(output_path)
+            output_files.append(output_file.name)
+        count = f"{len(group.rules)} rule{'s' if len(group.rules) != 1 else ''}"
+        print(f"Aggregated: {group.name} ({count}) → {', '.join(output_files)}")
+    return output_paths
+
+
+def remove_layout_outputs(
+    formats: list[BaseFormat],
+    output_base: Path,
+    aggregated: bool,
+    rule_ids: set[str],
+    keep: set[str],
+) -> list[str]:
+    """
+    Delete outputs of the other layout, so an IDE never sees a rule twice.
+
+    In the aggregated layout the per-rule files of the given rules are
+    deleted, together with aggregated files of groups that no longer exist.
+    In the per-rule layout every aggregated file is deleted.
+
+    Args:
+        formats: Formats that support the aggregated layout
+        output_base: Output directory
+        aggregated: Whether this run used the aggregated layout
+        rule_ids: IDs of the rules of this run
+        keep: Output paths (relative to output_base) written by this run
+
+    Returns:
+        Sorted list of deleted output paths (relative to output_base)
+    """
+    from aggregate import AGGREGATE_PREFIX
+
+    removed = []
+    for format_handler in formats:
+        directory = _format_directory(format_handler, output_base)
+        extension = format_handler.get_file_extension()
+        try:
+            with os.scandir(directory) as it:
+                names = [entry.name for entry in it if entry.is_file()]
+        except FileNotFoundError:
+            continue
+
+        for name in names:
+            if not name.endswith(extension):
+                continue
+            stem = name[: -len(extension)]
+            if stem.startswith(AGGREGATE_PREFIX):
+                stale = not aggregated
+            else:
+                stale = aggregated and stem in rule_ids
+            output_path = (directory / name).relative_to(output_base).as_posix()
+            if stale and output_path not in keep:
+                (directory / name).unlink()
+                removed.append(output_path)
+    return sorted(removed)
+
+
+def remove_rule_outputs(
+    formats: list[BaseFormat], output_base: Path, rule_ids: set[str]
+) -> list[str]:
+    """
+    Delete the per-rule outputs of rules that are not generated in this run.
+
+    Used for rules of the input that were left out (excluded by the target
+    repository or dropped by the token budget), whose outputs of earlier
+    runs would otherwise stay active in the IDE.
+
+    Args:
+        formats: Formats writing one file per rule
+        output_base: Output directory
+        rule_ids: IDs of the rules whose outputs are deleted
+
+    Returns:
+        Sorted list of deleted output paths (relative to output_base)
+    """
+    removed = []
+    for format_handler in formats:
+        directory = _format_directory(format_handler, output_base)
+        extension = format_handler.get_file_extension()
+        for rule_id in rule_ids:
+            output_file = directory / f"{rule_id}{extension}"
+            if output_file.is_file():
+                output_file.unlink()
+                removed.append(output_file.relative_to(output_base).as_posix())
+    return sorted(removed)
+
+
+def write_skill_md(
+    language_to_rules: dict[str, list[str]],
+    template_path: Path,
+    output_base: Path,
+    results: dict[str, list[str]],
+) -> None:
+    """
+    Fill the SKILL.md template with language mappings and write it if it changed.
 
     Args:
         language_to_rules: Dictionary mapping languages to rule files
-        skill_path: Path to SKILL.md file
+        template_path: SKILL.md template with language mappings markers
+        output_base: Output directory
+        results: Results dictionary whose 'written'/'unchanged' lists are updated
+
+    Raises:
+        FileNotFoundError: If the template does not exist
+    """
+    if not template_path.exists():
+        raise FileNotFoundError(f"Template not found at {template_path}")
+
+    skill_content = render_skill_md(
+        language_to_rules, template_path.read_text(encoding="utf-8")
+    )
+    output_skill_path = output_base / SKILL_OUTPUT_PATH
+    skill_path = SKILL_OUTPUT_PATH.as_posix()
+    if write_if_changed(output_skill_path, skill_content):
+        results["written"].append(skill_path)
+        print(f"Updated SKILL.md with language mappings")
+    else:
+        results["unchanged"].append(skill_path)
+
+
+def render_skill_md(language_to_rules: dict[str, list[str]], content: str) -> str:
+    """
+    Replace the language mappings section of a SKILL.md template with the table.
+
+    Args:
+        language_to_rules: Dictionary mapping languages to rule files
+        content: SKILL.md template content containing the section markers
+
+    Returns:
+        SKILL.md content with the language-to-rules table
+
+    Raises:
+        RuntimeError: If the language mappings markers are missing
     """
     # Generate markdown table
     table_lines = [
@@ -42,10 +391,6 @@ def update_skill_md(language_to_rules: dict[str, list[str]], skill_path: str) ->
     start_marker = "<!-- LANGUAGE_MAPPINGS_START -->"
     end_marker = "<!-- LANGUAGE_MAPPINGS_END -->"
 
-    # Read SKILL.md
-    skill_file = Path(skill_path)
-    content = skill_file.read_text(encoding="utf-8")
-
     if not start_marker in content or not end_marker in content:
         raise RuntimeError(
             "Invalid SKILLS.md template: Language mappings section not found in SKILL.md"
@@ -55,158 +400,1137 @@ def update_skill_md(language_to_rules: dict[str, list[str]], skill_path: str) ->
     start_idx = content.index(start_marker)
     end_idx = content.index(end_marker) + len(end_marker)
     new_section = f"\n\n{table}\n\n"
-    updated_content = content[:start_idx] + new_section + content[end_idx:]
+    return content[:start_idx] + new_section + content[end_idx:]
+
+
+def parse_skill_table(content: str) -> dict[str, list[str]]:
+    """
+    Read the language-to-rules table back from a generated SKILL.md.
+
+    The table is found by its shape rather than its header text (the first
+    two-column table), since translated copies of SKILL.md localize the
+    header (e.g. '| 言語 | 適用するルールファイル |').
+
+    Args:
+        content: SKILL.md content as written by render_skill_md
+
+    Returns:
+        Dictionary mapping languages to rule files (empty if there is no table)
+    """
+    language_to_rules = {}
+    lines = iter(content.splitlines())
+    previous = ""
+    for line in lines:
+        cells = line.split("|")
+        if (
+            len(cells) == 4
+            and not cells[0]
+            and not cells[3]
+            and all(cell.strip() and not cell.strip(" -:") for cell in cells[1:3])
+            and len(previous.split("|")) == 4
+        ):
+            # Separator row below the header
+            break
+        previous = line
+    else:
+        return language_to_rules
+    for line in lines:
+        cells = line.split("|")
+        if len(cells) != 4 or cells[0] or cells[3]:
+            break
+        language_to_rules[cells[1].strip()] = [
+            rule.strip() for rule in cells[2].split(",") if rule.strip()
+        ]
+    return language_to_rules
+
+
+def load_language_index(output_base: Path) -> LanguageIndex:
+    """
+    Load the language index of an output directory.
+
+    Output directories generated before the index existed are seeded from
+    the table of their SKILL.md, so a first single-file run keeps the other
+    rules in the table.
+
+    Args:
+        output_base: Output directory
+
+    Returns:
+        LanguageIndex of the output directory
+    """
+    index = LanguageIndex.load(output_base / LANGUAGE_INDEX_FILENAME)
+    skill_file = output_base / SKILL_OUTPUT_PATH
+    if not index.exists and skill_file.is_file():
+        table = parse_skill_table(skill_file.read_text(encoding="utf-8"))
+        for language, rules in table.items():
+            for rule in rules:
+                index.rules.setdefault(rule, []).append(language)
+    return index
+
+
+def update_skill_md(language_to_rules: dict[str, list[str]], skill_path: str) -> bool:
+    """
+    Update SKILL.md with language-to-rules mapping table.
+
+    Args:
+        language_to_rules: Dictionary mapping languages to rule files
+        skill_path: Path to SKILL.md file
+
+    Returns:
+        True if SKILL.md was rewritten, False if it was already up to date
+    """
+    skill_file = Path(skill_path)
+    content = skill_file.read_text(encoding="utf-8")
+    updated_content = render_skill_md(language_to_rules, content)
 
     # Write back to SKILL.md
-    skill_file.write_text(updated_content, encoding="utf-8")
+    if not write_if_changed(skill_file, updated_content):
+        return False
     print(f"Updated SKILL.md with language mappings")
+    return True
+
+
+def collect_rule_files(
+    input_paths: list[Path], recursive: bool = False, warn: bool = True
+) -> list[Path]:
+    """
+    Determine the rule files of one or more rule files and folders.
+
+    A single folder without recursion is listed like find_rule_files; in
+    every other case discover_rule_files walks the roots, and rules whose
+    rule_id was already provided by an earlier root are skipped with a
+    warning.
+
+    Args:
+        input_paths: Rule files and folders, in priority order
+        recursive: Also discover rules in subfolders
+        warn: Print a warning for every skipped duplicate
+
+    Returns:
+        List of rule file paths
+
+    Raises:
+        FileNotFoundError: If a path does not exist
+        ValueError: If a file is not a .md file or no rules were found
+    """
+    from corpus import discover_rule_files, find_rule_files
+
+    if len(input_paths) == 1 and not recursive:
+        return find_rule_files(input_paths[0])
+
+    rule_files, duplicates = discover_rule_files(input_paths, recursive)
+    if warn:
+        for duplicate, kept in duplicates.items():
+            print(f"Warning: skipping {duplicate}, rule ID already provided by {kept}")
+    return rule_files
 
 
-def convert_rules(input_path: str, output_dir: str = ".") -> dict[str, list[str]]:
+def convert_rules(
+    input_path: str | list[str],
+    output_dir: str = ".",
+    incremental: bool = False,
+    jobs: int = 1,
+    corpus: RuleCorpus | None = None,
+    cache: OutputCache | None = None,
+    formats: list[str] | None = None,
+    recursive: bool = False,
+    token_budget: int | None = None,
+    token_report: bool = False,
+    target_repo: str | None = None,
+    layout: str = "per-rule",
+    pack_path: str | None = None,
+) -> dict[str, list[str]]:
     """
     Convert rule file(s) to all supported IDE formats using RuleConverter.
 
     Args:
-        input_path: Path to a single .md file or folder containing .md files
+        input_path: Path to a single .md file or folder containing .md files,
+            or a list of them converted in one run (see collect_rule_files).
+            The SKILL.md template is taken from the first folder that has one.
         output_dir: Output directory (default: current directory)
+        incremental: Skip rules whose content is unchanged since the last
+            incremental run and delete outputs of rules that were removed.
+            State is kept in a build manifest in the output directory.
+        jobs: Number of worker processes used to read, parse and render
+            rules (only to read and parse them in incremental runs); outputs
+            are written in input order, so they are identical to a serial run.
+        corpus: Already loaded rules to convert (e.g. from
+            validate_and_convert); loaded from input_path if omitted
+        cache: Output cache shared between runs. Rules with cached outputs
+            are copied from the cache without being parsed or converted.
+        formats: Names of the formats to generate (default: all built-in
+            formats). SKILL.md is only written with the claudecode format;
+            its table covers every rule converted into output_dir so far
+            (see LanguageIndex), not only the rules of this run.
+        recursive: Also convert rules in subfolders of the input folders,
+            honoring .codeguardignore files
+        token_budget: Estimated tokens allowed per language. Rules are
+            trimmed to fit (see budget.apply_token_budget): they lose the
+            languages without room for them, or are not generated at all.
+            The output cache is not used in this mode.
+        token_report: Print the estimated bytes and tokens per language of
+            all rules in output_dir (always printed with token_budget)
+        target_repo: Repository the rules are generated for. It is scanned
+            once (see repo_scan.scan_repository) and rules for languages
+            without files in it are not generated ('excluded'); rules that
+            always apply are kept. Exclusion happens before token_budget
+            is applied. Outputs of excluded rules left by earlier runs are
+            deleted in runs over whole directories.
+        layout: 'per-rule' writes one file per rule and format; 'aggregated'
+            merges the rules of each language into one file per format (see
+            aggregate.py) for formats that support it, while the others
+            (Claude Code) keep one file per rule. Files of the other layout
+            are deleted in runs over whole directories.
+        pack_path: Also compile the converted rules into a pack file at this
+            path (see rule_pack.py), for tools that load the rules often
 
     Returns:
-        Dictionary with 'success' and 'errors' lists:
+        Dictionary with rule lists ('success', 'errors', 'skipped',
+        'excluded') and
+        output file lists relative to output_dir ('written', 'unchanged',
+        'removed'):
         {
             "success": ["rule1.md", "rule2.md"],
-            "errors": ["rule3.md: error message"]
+            "errors": ["rule3.md: error message"],
+            "skipped": ["rule4.md"],
+            "written": ["ide_rules/.cursor/rules/rule1.mdc", ...],
+            "unchanged": ["ide_rules/.cursor/rules/rule2.mdc", ...],
+            "removed": ["ide_rules/.cursor/rules/old-rule.mdc"]
         }
 
     Example:
         results = convert_rules("rules/", "/output/path")
         print(f"Converted {len(results['success'])} rules")
+
+        # Several packs in one run
+        convert_rules(["rules/", "additional_rules/"], ".", recursive=True)
     """
-    version = get_version_from_pyproject()
+    version = get_version()
+    converter = create_converter(version, formats)
+    format_names = [f.get_format_name() for f in converter.formats]
+    converter, layout_formats, aggregated_formats = _split_layout(converter, layout)
+    input_paths = [Path(p) for p in _as_list(input_path)]
+    path = input_paths[0]
+    # Only a run over whole directories knows which rules were deleted
+    full_run = all(p.is_dir() for p in input_paths)
 
-    # Specify all formats that should be generated here
-    all_formats = [
-        CursorFormat(version),
-        WindsurfFormat(version),
-        CopilotFormat(version),
-        ClaudeCodeFormat(version),
-    ]
+    present_languages = None
+    if target_repo is not None:
+        present_languages = _scan_target_repo(target_repo)
 
-    converter = RuleConverter(formats=all_formats)
-    path = Path(input_path)
+    # A budget, the aggregated layout and the pack need every rule parsed
+    collect_rules = bool(aggregated_formats) or pack_path is not None
+    if corpus is None and (token_budget is not None or collect_rules):
+        from corpus import RuleCorpus
 
-    if not path.exists():
-        raise FileNotFoundError(f"{input_path} does not exist")
+        corpus = RuleCorpus.load(collect_rule_files(input_paths, recursive), jobs=jobs)
 
-    # Determine files to process
-    if path.is_file():
-        if path.suffix != ".md":
-            raise ValueError(f"{input_path} is not a .md file")
-        files_to_process = [path]
+    excluded = []
+    trimmed = {}
+    input_files = None
+    if token_budget is not None:
+        input_files = [entry.path for entry in corpus]
+        corpus, excluded, trimmed = _apply_budget(
+            corpus, converter, token_budget, present_languages
+        )
+        # Cached outputs have the untrimmed globs
+        cache = None
+
+    # Incremental runs skip most rules, so workers only parse them
+    rule_files, entries, cached_rules = _load_entries(
+        input_paths, recursive, jobs, corpus, cache, converter, render=not incremental
+    )
+    if input_files is not None:
+        # Rules left out by the budget are still part of the input
+        rule_files = input_files
+    if len(input_paths) == 1 and path.is_file():
         print(f"Converting file: {path.name}")
     else:
-        files_to_process = list(path.glob("*.md"))
-        if not files_to_process:
-            raise ValueError(f"No .md files found in {input_path}")
-        print(f"Converting {len(files_to_process)} files from: {path.name}")
+        sources = ", ".join(p.name for p in input_paths)
+        print(f"Converting {len(rule_files)} files from: {sources}")
 
     # Setup output directory
     output_base = Path(output_dir)
-    ide_rules_dir = output_base / "ide_rules"
 
-    results = {"success": [], "errors": []}
+    results = new_results()
+
+    for filename in excluded:
+        print(f"Excluded: {filename} (no files of its languages in the target repository)")
+        results["excluded"].append(filename)
+
+    for filename, dropped in sorted(trimmed.items()):
+        if dropped:
+            print(f"Trimmed: {filename} (over budget for {', '.join(dropped)})")
+        else:
+            print(f"Trimmed: {filename} (over budget for all its languages)")
+
+    # Languages and sizes of every rule in the output directory, for SKILL.md
+    # and token reports
+    write_skill = "claudecode" in format_names
+    language_index = load_language_index(output_base)
+
+    manifest = None
+    if incremental:
+        fingerprint = {
+            "version": version,
+            "generator": GENERATOR_VERSION,
+            "formats": format_names,
+        }
+        if aggregated_formats:
+            fingerprint["layout"] = layout
+        if token_budget is not None:
+            fingerprint["token_budget"] = token_budget
+        manifest = BuildManifest.load(output_base / MANIFEST_FILENAME, fingerprint)
 
-    language_to_rules = defaultdict(list)
+    # Rules of the aggregated outputs and the pack
+    converted_rules = []
 
     # Process each file
-    for md_file in files_to_process:
-        try:
-            # Convert the file (raises exceptions on error)
-            result = converter.convert(md_file)
-
-            # Write each format
-            output_files = []
-            for format_name, output in result.outputs.items():
-                # Construct output path
-                # Use format's output preference (ide_rules/ or project root)
-                base_dir = ide_rules_dir if output.outputs_to_ide_rules else output_base
-                
-                output_file = (
-                    base_dir
-                    / output.subpath
-                    / f"{result.basename}{output.extension}"
+    for entry, rendered in entries:
+        if present_languages is not None and _is_excluded_entry(
+            entry, cached_rules, present_languages
+        ):
+            print(
+                f"Excluded: {entry.filename} "
+                "(no files of its languages in the target repository)"
+            )
+            results["excluded"].append(entry.filename)
+            excluded.append(entry.filename)
+            continue
+
+        if manifest is not None:
+            # Skip rules whose recorded outputs are still current
+            if entry.content_hash is not None and manifest.is_current(
+                entry.filename,
+                entry.content_hash,
+                output_base,
+                entry.rule.languages if entry.rule is not None else None,
+            ):
+                results["skipped"].append(entry.filename)
+                language_index.update(
+                    entry.filename, manifest.entries[entry.filename].languages
                 )
+                if collect_rules:
+                    converted_rules.append(entry.rule)
+                continue
+            # Forget the old entry until the rule converts successfully
+            manifest.remove(entry.filename)
 
-                # Create directory if it doesn't exist and write file
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-                output_file.write_text(output.content, encoding="utf-8")
-                output_files.append(output_file.name)
+        try:
+            entry, output_paths, languages, size = _write_entry(
+                entry,
+                cached_rules.get(entry.path),
+                converter,
+                output_base,
+                results,
+                cache,
+                rendered,
+            )
+            output_files = [Path(output_path).name for output_path in output_paths]
 
-            print(f"Success: {result.filename} → {', '.join(output_files)}")
-            results["success"].append(result.filename)
+            if output_files:
+                print(f"Success: {entry.filename} → {', '.join(output_files)}")
+            else:
+                print(f"Success: {entry.filename}")
+            results["success"].append(entry.filename)
+            if collect_rules:
+                converted_rules.append(entry.rule)
 
-            # Update language mappings for SKILL.md
-            for language in result.languages:
-                language_to_rules[language].append(result.filename)
+            if manifest is not None:
+                manifest.record(
+                    entry.filename,
+                    entry.content_hash,
+                    languages,
+                    output_paths,
+                )
 
-        except FileNotFoundError as e:
-            error_msg = f"{md_file.name}: File not found - {e}"
-            print(f"Error: {error_msg}")
-            results["errors"].append(error_msg)
+            # Update language mappings for SKILL.md
+            language_index.update(entry.filename, languages, size)
 
         except ValueError as e:
-            error_msg = f"{md_file.name}: Validation error - {e}"
+            error_msg = f"{entry.filename}: Validation error - {e}"
             print(f"Error: {error_msg}")
             results["errors"].append(error_msg)
+            language_index.remove(entry.filename)
 
         except Exception as e:
-            error_msg = f"{md_file.name}: Unexpected error - {e}"
+            error_msg = f"{entry.filename}: Unexpected error - {e}"
             print(f"Error: {error_msg}")
             results["errors"].append(error_msg)
+            language_index.remove(entry.filename)
 
-    # Summary
-    print(
-        f"\nResults: {len(results['success'])} success, {len(results['errors'])} errors"
+    # Outputs of excluded and dropped rules left by earlier runs are removed
+    # like those of deleted rules
+    left_out = set(excluded).union(
+        filename for filename, dropped in trimmed.items() if not dropped
     )
+    current_rules = {rule_file.name for rule_file in rule_files}.difference(left_out)
+
+    aggregated_paths = []
+    if aggregated_formats:
+        from aggregate import group_rules
+
+        aggregated_paths = write_aggregated_outputs(
+            group_rules(converted_rules), aggregated_formats, output_base, results
+        )
 
-    # Write language mappings to SKILL.md
-    if language_to_rules:
-        # Determine rules directory (where template should be)
-        rules_dir = path if path.is_dir() else path.parent
-        template_path = rules_dir / "codeguard-SKILLS.md.template"
-        output_skill_dir = output_base / "skills" / "software-security"
-        output_skill_path = output_skill_dir / "SKILL.md"
+    if pack_path is not None:
+        from rule_pack import write_pack
 
-        # Create output directory if it doesn't exist
-        output_skill_dir.mkdir(parents=True, exist_ok=True)
+        status = "" if write_pack(converted_rules, pack_path) else " (unchanged)"
+        print(f"Pack: {len(converted_rules)} rules → {pack_path}{status}")
 
-        # Copy template to output location and update with mappings
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template not found at {template_path}")
+    if manifest is not None:
+        if full_run:
+            results["removed"] = manifest.prune(current_rules, output_base)
+        manifest.save()
 
-        output_skill_path.write_text(
-            template_path.read_text(encoding="utf-8"), encoding="utf-8"
+    if full_run:
+        # Outputs of left-out rules (also without a manifest), of the other
+        # layout, and of aggregated groups that are gone
+        left_out_ids = {Path(rule_key).stem for rule_key in left_out}
+        results["removed"] = sorted(
+            set(results["removed"])
+            .union(remove_rule_outputs(converter.formats, output_base, left_out_ids))
+            .union(
+                remove_layout_outputs(
+                    layout_formats,
+                    output_base,
+                    bool(aggregated_formats),
+                    {Path(rule_key).stem for rule_key in current_rules.union(left_out)},
+                    set(aggregated_paths),
+                )
+            )
         )
-        # Update with language mappings
-        update_skill_md(language_to_rules, str(output_skill_path))
+    for removed in results["removed"]:
+        print(f"Removed: {removed}")
+
+    if cache is not None:
+        cache.evict()
+
+    _print_summary(results)
+
+    # Write language mappings to SKILL.md (part of the Claude Code plugin)
+    if full_run:
+        language_index.prune(current_rules)
+    if write_skill:
+        language_to_rules = language_index.language_to_rules()
+        template_path = _find_skill_template(input_paths)
+        # An empty table is written too, so SKILL.md never lists rules whose
+        # outputs were removed
+        if language_to_rules or template_path.is_file():
+            write_skill_md(language_to_rules, template_path, output_base, results)
+    language_index.save()
+
+    if token_report or token_budget is not None:
+        from budget import format_budget_report
+
+        print(f"\nEstimated context size per language (all rules in {output_base}):")
+        print(format_budget_report(language_index, token_budget))
+
+    print(
+        f"Files: {len(results['written'])} written, "
+        f"{len(results['unchanged'])} unchanged, {len(results['removed'])} removed"
+    )
+    if cache is not None:
+        print(cache.summary())
 
     return results
 
 
+def _split_layout(
+    converter: RuleConverter, layout: str
+) -> tuple[RuleConverter, list[BaseFormat], list[BaseFormat]]:
+    """
+    Separate the formats written per rule from those of the aggregated layout.
+
+    Args:
+        converter: Converter of every selected format
+        layout: Output layout (see aggregate.LAYOUTS)
+
+    Returns:
+        Tuple of (converter generating the per-rule files, formats whose
+        outputs of the other layout are cleaned up, formats merging the
+        rules of a language into one file)
+
+    Raises:
+        ValueError: If the layout is unknown
+    """
+    from aggregate import LAYOUTS
+
+    layout_formats = [f for f in converter.formats if f.supports_aggregation()]
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout} (available: {', '.join(LAYOUTS)})")
+    if layout != "aggregated":
+        return converter, layout_formats, []
+    per_rule = RuleConverter([f for f in converter.formats if not f.supports_aggregation()])
+    return per_rule, layout_formats, layout_formats
+
+
+def _scan_target_repo(target_repo: str) -> frozenset[str]:
+    """Scan the target repository and return its languages, including aliases."""
+    from repo_scan import scan_repository
+
+    scan = scan_repository(target_repo)
+    print(
+        f"Target repository: {scan.root} ({scan.files} files; "
+        f"languages: {', '.join(sorted(scan.languages)) or 'none'})"
+    )
+    return scan.present_languages()
+
+
+def _apply_budget(
+    corpus: RuleCorpus,
+    converter: RuleConverter,
+    token_budget: int,
+    present_languages: frozenset[str] | None,
+) -> tuple[RuleCorpus, list[str], dict[str, list[str]]]:
+    """
+    Trim the corpus to the token budget, after excluding absent languages.
+
+    Rules for languages without files in the target repository are excluded
+    first, so they do not take up budget.
+
+    Args:
+        corpus: Every rule of the run
+        converter: RuleConverter used to measure the outputs
+        token_budget: Estimated tokens allowed per language
+        present_languages: Languages of the target repository, None if
+            there is none
+
+    Returns:
+        Tuple of (corpus to convert, excluded rule filenames, dropped
+        languages per trimmed rule filename as from apply_token_budget)
+    """
+    from budget import apply_token_budget
+    from corpus import RuleCorpus
+
+    kept_entries = list(corpus)
+    excluded = []
+    if present_languages is not None:
+        kept_entries = []
+        for entry in corpus:
+            if entry.rule is not None and _is_excluded(entry.rule.languages, present_languages):
+                excluded.append(entry.filename)
+            else:
+                kept_entries.append(entry)
+    kept_entries, trimmed = apply_token_budget(kept_entries, converter, token_budget)
+    return RuleCorpus(kept_entries), excluded, trimmed
+
+
+def _load_entries(
+    input_paths: list[Path],
+    recursive: bool,
+    jobs: int,
+    corpus: RuleCorpus | None,
+    cache: OutputCache | None,
+    converter: RuleConverter,
+    render: bool = True,
+) -> tuple[
+    list[Path],
+    Iterable[tuple[RuleEntry, ConversionResult | None]],
+    dict[Path, CachedRule],
+]:
+    """
+    Determine the rules to convert and look up their cached outputs.
+
+    Without a corpus, rules are parsed lazily while converting, so only the
+    rule being written is held in memory; rules with cached outputs are
+    looked up by content hash and not parsed at all. With several jobs,
+    the worker processes also render the rules they parse (or the rules of
+    the corpus), leaving only the writes to the calling process.
+
+    Args:
+        input_paths: Input files and folders
+        recursive: Also collect rules in subfolders
+        jobs: Number of worker processes used to read, parse and render rules
+        corpus: Already loaded rules, or None to load them from input_paths
+        cache: Output cache, or None
+        converter: RuleConverter whose formats the cached outputs must have
+            and that renders the rules
+        render: Render in the worker processes; without it they only parse
+            (e.g. when most rules are skipped as unchanged)
+
+    Returns:
+        Tuple of (rule files, (entry, rendered result or None) pairs in
+        input order, cached outputs per rule file)
+    """
+    from corpus import RuleEntry, iter_rules
+
+    def load(paths: list[Path]) -> Iterator[tuple[RuleEntry, ConversionResult | None]]:
+        if render and jobs > 1 and len(paths) > 1:
+            return _map_in_pool(partial(_load_and_render, converter=converter), paths, jobs)
+        return ((entry, None) for entry in iter_rules(paths, jobs=jobs))
+
+    # Cache hits, looked up by content hash before any parsing
+    cached_rules: dict[Path, CachedRule] = {}
+
+    if corpus is None and cache is not None:
+        rule_files = collect_rule_files(input_paths, recursive)
+        content_hashes = {}
+        for rule_file in rule_files:
+            try:
+                content_hashes[rule_file] = hash_file(rule_file)
+            except OSError:
+                continue
+            cached = cache.lookup(
+                content_hashes[rule_file], rule_file.name, converter.formats
+            )
+            if cached is not None:
+                cached_rules[rule_file] = cached
+
+        # Only parse rules that are not cached, keeping input order
+        loaded = load([f for f in rule_files if f not in cached_rules])
+        entries = (
+            (RuleEntry(path=f, content_hash=content_hashes[f]), None)
+            if f in cached_rules
+            else next(loaded)
+            for f in rule_files
+        )
+    elif corpus is None:
+        rule_files = collect_rule_files(input_paths, recursive)
+        entries = load(rule_files)
+    else:
+        rule_files = [entry.path for entry in corpus]
+        if cache is not None:
+            for entry in corpus:
+                if entry.rule is not None:
+                    cached = cache.lookup(
+                        entry.content_hash, entry.filename, converter.formats
+                    )
+                    if cached is not None:
+                        cached_rules[entry.path] = cached
+        if render and jobs > 1 and len(corpus) > 1:
+            # Cached and invalid rules are not rendered
+            rules = [
+                None if entry.path in cached_rules else entry.rule for entry in corpus
+            ]
+            rendered = _map_in_pool(partial(_render_rule, converter=converter), rules, jobs)
+            entries = zip(corpus, rendered)
+        else:
+            entries = ((entry, None) for entry in corpus)
+    return rule_files, entries, cached_rules
+
+
+def _render_rule(
+    rule: ProcessedRule | None, converter: RuleConverter
+) -> ConversionResult | None:
+    """
+    Render a rule in a worker process.
+
+    Returns:
+        The result, or None if there is no rule or rendering failed; the
+        caller renders such rules again, reporting errors like a serial run
+    """
+    if rule is None:
+        return None
+    try:
+        return converter.render(rule)
+    except Exception:
+        return None
+
+
+def _load_and_render(
+    path: Path, converter: RuleConverter
+) -> tuple[RuleEntry, ConversionResult | None]:
+    """Parse and render a rule in a worker process (see _render_rule)."""
+    from corpus import load_rule
+
+    entry = load_rule(path)
+    return entry, _render_rule(entry.rule, converter)
+
+
+def _map_in_pool(function, items: list, jobs: int) -> Iterator:
+    """
+    Apply a function to items in a process pool, yielding results in order.
+
+    Args:
+        function: Picklable function of one item
+        items: Items to process
+        jobs: Number of worker processes
+
+    Yields:
+        function(item) per item, in the order of items
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(function, items, chunksize=chunksize)
+
+
+def _write_entry(
+    entry: RuleEntry,
+    cached: CachedRule | None,
+    converter: RuleConverter,
+    output_base: Path,
+    results: dict[str, list[str]],
+    cache: OutputCache | None,
+    rendered: ConversionResult | None = None,
+) -> tuple[RuleEntry, list[str], tuple[str, ...], RuleSize]:
+    """
+    Write the per-rule outputs of one rule, from the cache if possible.
+
+    Args:
+        entry: Rule to write
+        cached: Cached outputs of the rule, or None
+        converter: RuleConverter generating the per-rule formats
+        output_base: Output directory
+        results: Results dictionary whose 'written'/'unchanged' lists are updated
+        cache: Output cache the new outputs are stored in, or None
+        rendered: The rule already rendered by a worker process, or None
+
+    Returns:
+        Tuple of (entry, parsed again if its cached outputs were evicted,
+        output paths relative to output_base, languages, size)
+
+    Raises:
+        ValueError: If the rule is invalid
+    """
+    from budget import estimate_size, measure_result
+    from corpus import load_rule
+
+    if cached is not None:
+        try:
+            output_paths = write_cached_outputs(
+                cached, entry.path.stem, converter.formats, output_base, results
+            )
+            return entry, output_paths, cached.languages, cached.size
+        except OSError:
+            # Evicted by a concurrent run; convert the rule instead
+            entry = load_rule(entry.path)
+
+    if entry.rule is None:
+        raise ValueError("; ".join(entry.errors))
+
+    # Generate all formats from the parsed rule
+    result = rendered if rendered is not None else converter.render(entry.rule)
+
+    # Write each format
+    output_paths = write_rule_outputs(result, output_base, results)
+    if result.outputs:
+        size = measure_result(result)
+    else:
+        # Only aggregated outputs: measure the rule's section
+        rule = entry.rule
+        size = estimate_size(rule.content, *filter(None, [rule.body]))
+
+    if cache is not None:
+        cache.store(
+            entry.content_hash,
+            entry.filename,
+            result.languages,
+            {
+                format_handler: output_base / output_path
+                for format_handler, output_path in zip(converter.formats, output_paths)
+            },
+            size,
+        )
+    return entry, output_paths, result.languages, size
+
+
+def _is_excluded_entry(
+    entry: RuleEntry, cached_rules: dict[Path, CachedRule], present_languages: frozenset[str]
+) -> bool:
+    """Return True if a rule, parsed or cached, targets only absent languages."""
+    cached = cached_rules.get(entry.path)
+    if cached is not None:
+        languages = cached.languages
+    elif entry.rule is not None:
+        languages = entry.rule.languages
+    else:
+        languages = ()
+    return _is_excluded(languages, present_languages)
+
+
+def _find_skill_template(input_paths: list[Path]) -> Path:
+    """Return the SKILL.md template of the first input folder that has one."""
+    rules_dirs = [p if p.is_dir() else p.parent for p in input_paths]
+    return next(
+        (
+            rules_dir / SKILL_TEMPLATE_NAME
+            for rules_dir in rules_dirs
+            if (rules_dir / SKILL_TEMPLATE_NAME).is_file()
+        ),
+        rules_dirs[0] / SKILL_TEMPLATE_NAME,
+    )
+
+
+def _print_summary(results: dict[str, list[str]]) -> None:
+    """Print the rule counts of a conversion run."""
+    summary = f"\nResults: {len(results['success'])} success, {len(results['errors'])} errors"
+    if results["skipped"]:
+        summary += f", {len(results['skipped'])} skipped (unchanged)"
+    if results["excluded"]:
+        summary += f", {len(results['excluded'])} excluded (not in target repository)"
+    if results["removed"]:
+        summary += f", {len(results['removed'])} removed"
+    print(summary)
+
+
+def _is_excluded(languages: tuple[str, ...], present_languages: frozenset[str]) -> bool:
+    """Return True for rules whose languages all lack files in the target repository."""
+    return bool(languages) and present_languages.isdisjoint(languages)
+
+
+def _as_list(input_path: str | list[str]) -> list[str]:
+    """Return the input paths of convert_rules as a list."""
+    return [input_path] if isinstance(input_path, (str, Path)) else list(input_path)
+
+
+def validate_and_convert(
+    input_path: str | list[str], output_dir: str = ".", **options
+) -> dict[str, list[str]]:
+    """
+    Validate and convert rules in a single pass over the corpus.
+
+    Every rule file is read and parsed once. The validation report is
+    printed as by validate_unified_rules.py; rules are only converted if
+    all of them are valid.
+
+    Args:
+        input_path: Path to a single .md file or folder containing .md
+            files, or a list of them
+        output_dir: Output directory (default: current directory)
+        **options: Further keyword arguments for convert_rules
+
+    Returns:
+        convert_rules results, or results with only 'errors' filled if
+        validation failed
+    """
+    from corpus import RuleCorpus
+    from validate_unified_rules import print_validation_report
+
+    input_paths = [Path(p) for p in _as_list(input_path)]
+    corpus = RuleCorpus.load(
+        collect_rule_files(input_paths, options.get("recursive", False)),
+        jobs=options.get("jobs", 1),
+    )
+    print(f"🔍 Validating {len(corpus)} rules in {', '.join(map(str, input_paths))}\n")
+
+    if not print_validation_report(corpus):
+        results = new_results()
+        results["errors"] = [
+            f"{entry.filename}: {'; '.join(entry.errors)}"
+            for entry in corpus
+            if entry.errors
+        ]
+        return results
+
+    print()
+    return convert_rules(input_path, output_dir, corpus=corpus, **options)
+
+
+def watch_rules(
+    input_path: str | list[str],
+    output_dir: str = ".",
+    interval: float = 0.05,
+    debounce: float = 0.02,
+    formats: list[str] | None = None,
+    recursive: bool = False,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Convert rules, then keep converting rule files as they change.
+
+    After an initial conversion of every rule, only added or modified rule
+    files are re-read and regenerated, outputs of deleted rules are removed,
+    and SKILL.md is refreshed from an in-memory language index instead of
+    re-parsing the corpus. Rules are collected like convert_rules does, so
+    with several inputs the first one providing a rule ID wins, and a rule
+    hidden by an earlier input is converted once that input drops it. Runs
+    until interrupted or until stop is set.
+
+    Args:
+        input_path: Path to a single .md file or folder containing .md files,
+            or a list of them (see collect_rule_files)
+        output_dir: Output directory (default: current directory)
+        interval: Seconds between polls for changes (native notifications
+            are used instead if watchdog is installed, see watcher.py)
+        debounce: Seconds to wait for a burst of changes to settle
+        formats: Names of the formats to generate (default: all built-in formats)
+        recursive: Also watch and convert rules in subfolders of the input
+            folders, honoring .codeguardignore files
+        stop: Event that ends watching when set (checked every 0.1 seconds)
+    """
+    from budget import measure_result
+    from corpus import RuleCorpus
+    from watcher import RuleWatcher
+
+    converter = create_converter(get_version(), formats)
+    write_skill = "claudecode" in [f.get_format_name() for f in converter.formats]
+    input_paths = [Path(p) for p in _as_list(input_path)]
+    output_base = Path(output_dir)
+
+    # Languages and output paths of every successfully converted rule
+    language_index = load_language_index(output_base)
+    rule_outputs: dict[str, list[str]] = {}
+    # Rule file converted per rule filename
+    active: dict[str, Path] = {}
+
+    def collect() -> dict[str, Path]:
+        try:
+            rule_files = collect_rule_files(input_paths, recursive, warn=False)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return {rule_file.name: rule_file for rule_file in rule_files}
+
+    def rebuild(changed: set[Path]) -> dict[str, list[str]]:
+        results = new_results()
+        current = collect()
+        converted = sorted(
+            rule_file
+            for filename, rule_file in current.items()
+            if rule_file in changed or active.get(filename) != rule_file
+        )
+
+        for filename in set(active).difference(current):
+            language_index.remove(filename)
+            for output in rule_outputs.pop(filename, []):
+                (output_base / output).unlink(missing_ok=True)
+                results["removed"].append(output)
+        active.clear()
+        active.update(current)
+
+        for entry in RuleCorpus.load(converted):
+            if entry.rule is None:
+                language_index.remove(entry.filename)
+                errors = "; ".join(entry.errors)
+                error_msg = f"{entry.filename}: Validation error - {errors}"
+                print(f"Error: {error_msg}")
+                results["errors"].append(error_msg)
+                continue
+            result = converter.render(entry.rule)
+            rule_outputs[result.filename] = write_rule_outputs(result, output_base, results)
+            language_index.update(
+                result.filename, result.languages, measure_result(result)
+            )
+            results["success"].append(result.filename)
+
+        language_to_rules = language_index.language_to_rules()
+        if language_to_rules and write_skill:
+            template_path = _find_skill_template(input_paths)
+            write_skill_md(language_to_rules, template_path, output_base, results)
+        language_index.save()
+
+        return results
+
+    # Folders are watched whole, which covers their SKILL.md templates
+    watcher = RuleWatcher(
+        input_paths
+        + [p.parent / SKILL_TEMPLATE_NAME for p in input_paths if not p.is_dir()],
+        interval=interval,
+        debounce=debounce,
+        recursive=recursive,
+    )
+    if all(p.is_dir() for p in input_paths):
+        language_index.prune(set(collect()))
+    results = rebuild(set())
+    print(
+        f"Converted {len(results['success'])} rules, {len(results['errors'])} errors. "
+        f"Watching {', '.join(map(str, input_paths))} for changes "
+        f"({watcher.backend}, Ctrl+C to stop)"
+    )
+
+    try:
+        while stop is None or not stop.is_set():
+            changed, removed = watcher.wait_for_changes(None if stop is None else 0.1)
+            if not (changed or removed):
+                continue
+            started = time.perf_counter()
+            results = rebuild(changed)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            for filename in results["success"]:
+                print(f"Success: {filename}")
+            for removed_output in results["removed"]:
+                print(f"Removed: {removed_output}")
+            print(
+                f"Rebuilt in {elapsed_ms:.1f} ms: {len(results['written'])} written, "
+                f"{len(results['unchanged'])} unchanged, {len(results['removed'])} removed"
+            )
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
+
+
 if __name__ == "__main__":
+    import argparse
     import sys
 
-    if len(sys.argv) < 2:
-        print("Usage: python unified_to_all.py <input_file_or_folder> [output_dir]")
-        print("Examples:")
-        print("  python unified_to_all.py my-rule.md")
-        print("  python unified_to_all.py unified_rules/")
-        print("  python unified_to_all.py my-rule.md /output/path")
-        sys.exit(1)
+    from aggregate import LAYOUTS
+    from cache import DEFAULT_MAX_SIZE, OutputCache
 
-    input_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else "."
+    parser = argparse.ArgumentParser(
+        description="Convert unified rules to all IDE formats.",
+        epilog="Examples:\n"
+        "  python unified_to_all.py my-rule.md\n"
+        "  python unified_to_all.py unified_rules/\n"
+        "  python unified_to_all.py my-rule.md /output/path\n"
+        "  python unified_to_all.py rules/ . --incremental\n"
+        "  python unified_to_all.py rules/ . --jobs 4\n"
+        "  python unified_to_all.py rules/ . --validate\n"
+        "  python unified_to_all.py rules/ . --cache\n"
+        "  python unified_to_all.py rules/ . --formats cursor,copilot\n"
+        "  python unified_to_all.py rules/ . --include additional_rules/ --recursive\n"
+        "  python unified_to_all.py rules/ . --token-budget 20000\n"
+        "  python unified_to_all.py rules/ ../my-service --target-repo ../my-service\n"
+        "  python unified_to_all.py rules/ . --layout aggregated\n"
+        "  python unified_to_all.py rules/ . --pack rules.pack\n"
+        "  python unified_to_all.py rules/ . --watch",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "input_path", nargs="?", help="rule file or folder containing .md files"
+    )
+    parser.add_argument(
+        "output_dir", nargs="?", default=".", help="output directory (default: .)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"only convert rules changed since the last run (tracked in {MANIFEST_FILENAME})",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes; 0 uses all CPUs (default: 1)",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="validate all rules first and only convert if they are valid",
+    )
+    parser.add_argument(
+        "--formats",
+        help="comma-separated formats to generate (default: all built-in formats)",
+    )
+    parser.add_argument(
+        "--list-formats",
+        action="store_true",
+        help="list the available formats, including plugins, and exit",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="reuse outputs from the shared output cache (see cache.py)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="output cache directory; implies --cache (default: ~/.cache/codeguard)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_SIZE // (1024 * 1024),
+        help="output cache size limit in MB (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="further rule file or folder converted in the same run (repeatable); "
+        "rules whose ID was already provided by an earlier path are skipped",
+    )
+    parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="also convert rules in subfolders, honoring .codeguardignore files",
+    )
+    parser.add_argument(
+        "--token-report",
+        action="store_true",
+        help="print the estimated bytes and tokens of the rules per language",
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        metavar="TOKENS",
+        help="trim rules to fit an estimated token budget per language "
+        "(higher tiers and smaller rules first; disables --cache)",
+    )
+    parser.add_argument(
+        "--target-repo",
+        metavar="PATH",
+        help="only generate rules for languages with files in this repository "
+        "(honoring .gitignore) and rules that always apply",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default="per-rule",
+        help="'aggregated' merges the rules of each language into one file per "
+        "IDE format; Claude Code keeps one file per rule (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--pack",
+        metavar="PATH",
+        help="also compile the converted rules into a memory-mappable pack file "
+        "(see rule_pack.py)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and regenerate rules whenever they change",
+    )
+    args = parser.parse_args()
+
+    if args.list_formats:
+        print("\n".join(available_formats()))
+        sys.exit(0)
+    if args.input_path is None:
+        parser.error("the following arguments are required: input_path")
 
-    results = convert_rules(input_path, output_dir)
+    formats = None
+    if args.formats:
+        formats = [name.strip() for name in args.formats.split(",") if name.strip()]
+        # Plugins are only looked up (a slow import) for names that are not built in
+        unknown = [
+            name
+            for name in formats
+            if name not in BUILTIN_FORMATS and name not in available_formats()
+        ]
+        if unknown:
+            parser.error(
+                f"unknown format(s): {', '.join(unknown)} "
+                f"(available: {', '.join(available_formats())})"
+            )
+
+    if args.watch:
+        if args.layout != "per-rule":
+            parser.error("--watch only supports the per-rule layout")
+        if args.pack:
+            parser.error("--watch does not write a pack file")
+        watch_rules(
+            [args.input_path, *args.include],
+            args.output_dir,
+            formats=formats,
+            recursive=args.recursive,
+        )
+        sys.exit(0)
+
+    cache = None
+    if args.cache or args.cache_dir:
+        cache = OutputCache(args.cache_dir, max_size=args.cache_size * 1024 * 1024)
+
+    run = validate_and_convert if args.validate else convert_rules
+    results = run(
+        [args.input_path, *args.include],
+        args.output_dir,
+        incremental=args.incremental,
+        jobs=args.jobs if args.jobs > 0 else os.cpu_count() or 1,
+        cache=cache,
+        formats=formats,
+        recursive=args.recursive,
+        token_budget=args.token_budget,
+        token_report=args.token_report,
+        target_repo=args.target_repo,
+        layout=args.layout,
+        pack_path=args.pack,
+    )
 
     if results["errors"]:
         sys.exit(1)
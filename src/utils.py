@@ -8,10 +8,348 @@ Utilities for rule processing.
 Common utilities used across the rule conversion tools.
 """
 
+import fnmatch
 import re
-import tomllib
+from functools import cache, lru_cache
 from pathlib import Path
-import yaml
+
+# Distribution name used to look up the version of an installed package
+DISTRIBUTION_NAME = "project-codeguard-ja"
+
+# "version = "..."" in the [project] table, before any other table header
+_PYPROJECT_VERSION = re.compile(
+    r'^\[project\][ \t]*\n(?:(?!\[).*\n)*?version[ \t]*=[ \t]*"([^"\\\n]+)"[ \t]*(?:#.*)?$',
+    re.MULTILINE,
+)
+
+# "key: value", "key:" or "- item" lines of the simple frontmatter subset
+_KEY_LINE = re.compile(r"([A-Za-z_][A-Za-z0-9_-]*):(?: +(.*))?$")
+_ITEM_LINE = re.compile(r"( *)-(?: +(.*))?$")
+
+# Characters that YAML treats specially when they start a plain scalar
+_UNSUPPORTED_FIRST_CHARS = frozenset("-?:,[]{}#&*!|>'\"%@` \t")
+
+# Plain scalars PyYAML resolves to ints, floats, timestamps, nulls, merge keys or values
+_YAML_IMPLICIT_NON_STR = re.compile(
+    r"""^(?:[-+]?0b[0-1_]+
+    |[-+]?0[0-7_]+
+    |[-+]?(?:0|[1-9][0-9_]*)
+    |[-+]?0x[0-9a-fA-F_]+
+    |[-+]?[1-9][0-9_]*(?::[0-5]?[0-9])+
+    |[-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+][0-9]+)?
+    |\.[0-9][0-9_]*(?:[eE][-+][0-9]+)?
+    |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*
+    |[-+]?\.(?:inf|Inf|INF)
+    |\.(?:nan|NaN|NAN)
+    |[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]
+    |[0-9][0-9][0-9][0-9]-[0-9][0-9]?-[0-9][0-9]?
+     (?:[Tt]|[\ \t]+)[0-9][0-9]?
+     :[0-9][0-9]:[0-9][0-9](?:\.[0-9]*)?
+     (?:[\ \t]*(?:Z|[-+][0-9][0-9]?(?::[0-9][0-9])?))?
+    |~|<<|=)$""",
+    re.X,
+)
+
+# Line breaks other than \n, tabs, BOM and anything YAML rejects as non-printable
+# (the complement of YAML's printable set, which compiles much faster)
+_UNSUPPORTED_CHARS = re.compile(
+    "[\x00-\x09\x0B-\x1F\x7F-\x9F\u2028\u2029\uD800-\uDFFF\uFEFF\uFFFE\uFFFF]"
+)
+
+_YAML_LINE_BREAKS = re.compile("[\n\x85\u2028\u2029]")
+
+_YAML_BOOLS = {
+    **dict.fromkeys(["yes", "Yes", "YES", "true", "True", "TRUE"], True),
+    **dict.fromkeys(["on", "On", "ON"], True),
+    **dict.fromkeys(["no", "No", "NO", "false", "False", "FALSE"], False),
+    **dict.fromkeys(["off", "Off", "OFF"], False),
+}
+_YAML_NULLS = frozenset(["null", "Null", "NULL"])
+
+
+class _UnsupportedYaml(Exception):
+    """Raised by the fast frontmatter parser for YAML outside its subset."""
+
+
+def _import_yaml():
+    """
+    Import PyYAML on first use.
+
+    Importing PyYAML takes longer than starting the rest of the tool, and
+    it is only needed for frontmatter and field values outside the subset
+    handled here.
+    """
+    import yaml
+
+    return yaml
+
+
+def _yaml_safe_loader(yaml):
+    """Return the libyaml-based safe loader if PyYAML was built with it."""
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _parse_simple_scalar(text: str) -> str | bool | None:
+    """
+    Resolve a single-line YAML scalar.
+
+    Accepted are booleans, nulls, plain strings that cannot be mistaken for
+    numbers, timestamps or other tagged values, and quoted strings without
+    escape sequences.
+
+    Raises:
+        _UnsupportedYaml: If the scalar needs the full YAML parser
+    """
+    if text in _YAML_BOOLS:
+        return _YAML_BOOLS[text]
+    if text in _YAML_NULLS:
+        return None
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        inner = text[1:-1]
+        if text[0] == "'":
+            inner = inner.replace("''", "\0")
+        if "'" in inner or '"' in inner or "\\" in inner:
+            raise _UnsupportedYaml(text)
+        return inner.replace("\0", "'")
+    if (
+        text[0] in _UNSUPPORTED_FIRST_CHARS
+        or _YAML_IMPLICIT_NON_STR.match(text)
+        or text.endswith(":")
+        or ": " in text
+        or " #" in text
+    ):
+        raise _UnsupportedYaml(text)
+    return text
+
+
+def _parse_simple_frontmatter(text: str) -> dict | None:
+    """
+    Parse the frontmatter subset used by rule files without PyYAML.
+
+    Supported are top-level "key: value" pairs with plain scalar values,
+    "key: []", and "key:" followed by a block list of plain scalars, e.g.:
+
+        description: Rule description
+        languages:
+        - python
+        - javascript
+        alwaysApply: false
+
+    Args:
+        text: Frontmatter text between the --- markers
+
+    Returns:
+        Parsed mapping, or None if the frontmatter is empty
+
+    Raises:
+        _UnsupportedYaml: If the text uses any other YAML construct
+    """
+    if _UNSUPPORTED_CHARS.search(text):
+        raise _UnsupportedYaml("unsupported characters")
+
+    result = {}
+    current_list = None
+    item_indent = None
+
+    for line in text.split("\n"):
+        line = line.rstrip(" ")
+        if not line or line.lstrip(" ").startswith("#"):
+            continue
+
+        item = _ITEM_LINE.match(line)
+        if item:
+            if current_list is None or item.group(2) is None:
+                raise _UnsupportedYaml(line)
+            if item_indent is None:
+                item_indent = item.group(1)
+            elif item.group(1) != item_indent:
+                raise _UnsupportedYaml(line)
+            current_list.append(_parse_simple_scalar(item.group(2)))
+            result[key] = current_list
+            continue
+
+        key_line = _KEY_LINE.match(line)
+        if not key_line:
+            raise _UnsupportedYaml(line)
+
+        key, value = key_line.groups()
+        if key in _YAML_BOOLS or key in _YAML_NULLS:
+            raise _UnsupportedYaml(line)
+
+        current_list = None
+        item_indent = None
+        if value is None:
+            # Null unless block list items follow
+            result[key] = None
+            current_list = []
+        elif value == "[]":
+            result[key] = []
+        else:
+            result[key] = _parse_simple_scalar(value)
+
+    return result or None
+
+
+def _analyze_yaml_scalar(value: str) -> tuple[bool, bool]:
+    """
+    Decide which styles PyYAML's emitter allows for a block mapping value.
+
+    Mirrors yaml.emitter.Emitter.analyze_scalar with allow_unicode=True.
+
+    Returns:
+        Tuple of (allow_block_plain, allow_single_quoted). When neither is
+        allowed the value must be double quoted.
+    """
+    if value.startswith("---") or value.startswith("..."):
+        block_indicators = True
+    else:
+        block_indicators = False
+    special_characters = False
+    line_breaks = False
+    break_space = False
+    space_break = False
+    previous_space = False
+    previous_break = False
+    whitespace = "\0 \t\r\n\x85\u2028\u2029"
+    length = len(value)
+
+    for index, ch in enumerate(value):
+        followed_by_whitespace = index + 1 >= length or value[index + 1] in whitespace
+        if index == 0:
+            if ch in "#,[]{}&*!|>'\"%@`":
+                block_indicators = True
+            if ch in "?:-" and followed_by_whitespace:
+                block_indicators = True
+        else:
+            if ch == ":" and followed_by_whitespace:
+                block_indicators = True
+            if ch == "#" and value[index - 1] in whitespace:
+                block_indicators = True
+
+        if ch in "\n\x85\u2028\u2029":
+            line_breaks = True
+        if not (ch == "\n" or "\x20" <= ch <= "\x7E"):
+            if not (
+                ch == "\x85"
+                or "\xA0" <= ch <= "\uD7FF"
+                or "\uE000" <= ch <= "\uFFFD"
+                or "\U00010000" <= ch < "\U0010ffff"
+            ) or ch == "\uFEFF":
+                special_characters = True
+
+        if ch == " ":
+            if previous_break:
+                break_space = True
+            previous_space, previous_break = True, False
+        elif ch in "\n\x85\u2028\u2029":
+            if previous_space:
+                space_break = True
+            previous_space, previous_break = False, True
+        else:
+            previous_space = previous_break = False
+
+    allow_block_plain = not (
+        value[0] in " \n\x85\u2028\u2029"
+        or value[-1] in " \n\x85\u2028\u2029"
+        or break_space
+        or space_break
+        or special_characters
+        or line_breaks
+        or block_indicators
+    )
+    allow_single_quoted = not (break_space or space_break or special_characters)
+    return allow_block_plain, allow_single_quoted
+
+
+def _write_yaml_wrapped(text: str, column: int, quoted: bool) -> str:
+    """
+    Emit a single-line scalar, folding at spaces past PyYAML's 80 column width.
+
+    Mirrors Emitter.write_plain and Emitter.write_single_quoted for text
+    without line breaks, with continuation lines indented by two spaces.
+
+    Args:
+        text: Scalar text (quotes already doubled are not expected)
+        column: Column after the opening indicator
+        quoted: Whether the text is emitted single quoted
+
+    Returns:
+        The emitted scalar text (without the opening and closing quotes)
+    """
+    parts = []
+    spaces = False
+    start = 0
+    length = len(text)
+    for end in range(length + 1):
+        ch = text[end] if end < length else None
+        if spaces:
+            if ch != " ":
+                if (
+                    start + 1 == end
+                    and column > 80
+                    and (not quoted or (start != 0 and end != length))
+                ):
+                    parts.append("\n  ")
+                    column = 2
+                else:
+                    parts.append(text[start:end])
+                    column += end - start
+                start = end
+        elif ch is None or ch == " " or (quoted and ch == "'"):
+            if start < end:
+                parts.append(text[start:end])
+                column += end - start
+                start = end
+        if quoted and ch == "'":
+            parts.append("''")
+            column += 2
+            start = end + 1
+        if ch is not None:
+            spaces = ch == " "
+    return "".join(parts)
+
+
+@lru_cache(maxsize=4096)
+def format_yaml_field(field_name: str, value: str) -> str:
+    """
+    Format a "field: value" line exactly as yaml.dump would.
+
+    Produces the same output as
+    yaml.dump({field_name: value}, default_flow_style=False, allow_unicode=True).strip()
+    for a plain field name. Plain and single-quoted values are emitted
+    directly; values that need double quoting (line breaks, control
+    characters) fall back to yaml.dump. Results are memoized, so formats
+    sharing a rule's description emit it only once.
+
+    Args:
+        field_name: Name of the YAML field (e.g. 'description', 'title')
+        value: String value
+
+    Returns:
+        The formatted YAML line(s)
+    """
+    if value:
+        allow_plain, allow_single_quoted = _analyze_yaml_scalar(value)
+        resolves_to_str = not (
+            value in _YAML_BOOLS
+            or value in _YAML_NULLS
+            or _YAML_IMPLICIT_NON_STR.match(value)
+        )
+        if allow_plain and resolves_to_str:
+            column = len(field_name) + 2
+            line = f"{field_name}: {_write_yaml_wrapped(value, column, False)}"
+            # yaml.dump(...).strip() also strips Unicode whitespace
+            return line.strip()
+        if allow_single_quoted and not _YAML_LINE_BREAKS.search(value):
+            column = len(field_name) + 3
+            return f"{field_name}: '{_write_yaml_wrapped(value, column, True)}'"
+
+    yaml_dump = _import_yaml().dump(
+        {field_name: value},
+        default_flow_style=False,
+        allow_unicode=True,
+    )
+    return yaml_dump.strip()
 
 
 def parse_frontmatter_and_content(content: str) -> tuple[dict | None, str]:
@@ -50,18 +388,145 @@ def parse_frontmatter_and_content(content: str) -> tuple[dict | None, str]:
     markdown_content = content[match.end():]  # Skip closing "---\n"
 
     try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-    except yaml.YAMLError:
-        return None, content
+        frontmatter = _parse_simple_frontmatter(frontmatter_text)
+    except _UnsupportedYaml:
+        yaml = _import_yaml()
+        try:
+            frontmatter = yaml.load(frontmatter_text, Loader=_yaml_safe_loader(yaml))
+        except yaml.YAMLError:
+            return None, content
 
     return frontmatter, markdown_content.strip()
 
 
-def get_version_from_pyproject() -> str:
+def parse_frontmatter(frontmatter_text: str):
     """
-    Read version from pyproject.toml using Python's built-in TOML parser.
+    Parse the YAML text between the frontmatter delimiters.
+
+    The common subset of rule frontmatter is parsed directly; anything else
+    is handed to PyYAML.
 
-    Requires Python 3.11+ for tomllib support.
+    Args:
+        frontmatter_text: Frontmatter without the surrounding --- lines
+
+    Returns:
+        Parsed YAML value (a dict for well-formed rules)
+
+    Raises:
+        yaml.YAMLError: If the text is not valid YAML
+    """
+    try:
+        return _parse_simple_frontmatter(frontmatter_text)
+    except _UnsupportedYaml:
+        yaml = _import_yaml()
+        return yaml.load(frontmatter_text, Loader=_yaml_safe_loader(yaml))
+
+
+def read_ignore_file(directory: Path, filename: str) -> list[tuple[Path, str, bool]]:
+    """
+    Read the patterns of an ignore file such as .gitignore or .codeguardignore.
+
+    One glob per line; blank lines and lines starting with '#' are skipped.
+    A pattern applies to the ignore file's folder and its subfolders: a
+    pattern without '/' matches names at any depth, a leading '/' anchors
+    it to the folder, a leading '**/' matches at any depth and a trailing
+    '/' only matches folders. Negations ('!pattern') are not supported and
+    are skipped.
+
+    Args:
+        directory: Folder containing the ignore file
+        filename: Name of the ignore file
+
+    Returns:
+        List of (base folder, pattern, folders only) for is_ignored, empty
+        if the file does not exist
+    """
+    try:
+        lines = (directory / filename).read_text(encoding="utf-8").splitlines()
+    except (FileNotFoundError, NotADirectoryError, UnicodeDecodeError):
+        return []
+
+    patterns = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(("#", "!")):
+            continue
+        dir_only = line.endswith("/")
+        pattern = line.rstrip("/")
+        if pattern.startswith("**/"):
+            pattern = pattern[3:]
+        if pattern:
+            patterns.append((directory, pattern, dir_only))
+    return patterns
+
+
+def is_ignored(path: Path, is_dir: bool, patterns: list[tuple[Path, str, bool]]) -> bool:
+    """
+    Check a path against ignore patterns of its folder and its parents.
+
+    Args:
+        path: File or folder below the base folders of the patterns
+        is_dir: Whether path is a folder
+        patterns: Patterns from read_ignore_file
+
+    Returns:
+        True if any pattern matches
+    """
+    for base, pattern, dir_only in patterns:
+        if dir_only and not is_dir:
+            continue
+        if pattern.startswith("/"):
+            # Anchored to the folder of the ignore file
+            if fnmatch.fnmatchcase(path.relative_to(base).as_posix(), pattern[1:]):
+                return True
+        elif "/" not in pattern:
+            if fnmatch.fnmatchcase(path.name, pattern):
+                return True
+        elif fnmatch.fnmatchcase(path.relative_to(base).as_posix(), pattern):
+            return True
+    return False
+
+
+@cache
+def get_version() -> str:
+    """
+    Resolve the version to write into generated files, once per process.
+
+    The version is looked up in this order:
+    1. pyproject.toml of the source tree this module belongs to
+    2. Metadata of the installed project-codeguard-ja distribution
+    3. pyproject.toml in the current working directory
+
+    Returns:
+        Version string
+
+    Raises:
+        FileNotFoundError: If no version source is found
+        ValueError: If a pyproject.toml has no valid version
+    """
+    source_pyproject = Path(__file__).resolve().parent.parent / "pyproject.toml"
+    if source_pyproject.is_file():
+        return get_version_from_pyproject(source_pyproject)
+
+    # importlib.metadata is slow to import; only needed for installed copies
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(DISTRIBUTION_NAME)
+    except PackageNotFoundError:
+        return get_version_from_pyproject()
+
+
+def get_version_from_pyproject(pyproject_path: str | Path = "pyproject.toml") -> str:
+    """
+    Read version from pyproject.toml.
+
+    A plain version = "..." line in the [project] table is read directly;
+    anything else is parsed with Python's built-in TOML parser, which
+    requires Python 3.11+.
+
+    Args:
+        pyproject_path: Path to pyproject.toml (default: current directory)
 
     Returns:
         Version string from pyproject.toml
@@ -70,11 +535,21 @@ def get_version_from_pyproject() -> str:
         FileNotFoundError: If pyproject.toml is not found
         ValueError: If version field is missing or invalid
     """
-    pyproject_path = Path("pyproject.toml")
+    pyproject_path = Path(pyproject_path)
 
     if not pyproject_path.exists():
         raise FileNotFoundError("pyproject.toml not found")
 
+    # Fast path without importing tomllib
+    try:
+        match = _PYPROJECT_VERSION.search(pyproject_path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError):
+        match = None
+    if match and match.group(1).strip():
+        return match.group(1).strip()
+
+    import tomllib
+
     try:
         with open(pyproject_path, "rb") as f:
             data = tomllib.load(f)
@@ -6,115 +6,371 @@
 Validate Unified Rules Format
 
 Validates that unified rules have correct YAML frontmatter and structure.
+
+Usage:
+    python validate_unified_rules.py rules/
+    python validate_unified_rules.py rules/ vendor/pack-a/ --jobs 0 --format sarif > results.sarif
+    python validate_unified_rules.py rules/ --fail-fast --format json
 """
 
+import json
 import sys
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from language_mappings import LANGUAGE_TO_EXTENSIONS
-from utils import parse_frontmatter_and_content
+from corpus import RuleCorpus, load_rule
 
+# Output formats of main()
+OUTPUT_FORMATS = ("text", "json", "sarif")
 
-def validate_rule(file_path: Path) -> dict[str, list[str]]:
-    """Validate a single unified rule file."""
-    errors = []
-    warnings = []
+# Version of the JSON report layout
+REPORT_SCHEMA = 1
 
-    try:
-        # Read and parse file
-        content = file_path.read_text(encoding="utf-8")
-        frontmatter, markdown_content = parse_frontmatter_and_content(content)
+# Tool name and rule IDs reported in SARIF logs
+SARIF_TOOL_NAME = "codeguard-validate"
+SARIF_ERROR_ID = "codeguard/invalid-rule"
+SARIF_WARNING_ID = "codeguard/rule-warning"
 
-        if frontmatter is None:
-            errors.append("Missing or invalid YAML frontmatter")
-            return {"errors": errors, "warnings": warnings}
 
-        # Check required fields
-        if "description" not in frontmatter:
-            errors.append("Missing required field: description")
-        elif not str(frontmatter["description"]).strip():
-            errors.append("description cannot be empty")
+@dataclass
+class ValidationResult:
+    """
+    Represents the validation outcome of a single rule file.
 
-        # Validate languages and alwaysApply logic
-        has_languages = "languages" in frontmatter and frontmatter["languages"]
-        always_apply = frontmatter.get("alwaysApply", False)
+    Attributes:
+        path: Path of the rule file
+        errors: Validation errors
+        warnings: Validation warnings
+        duration_ms: Time spent reading, parsing and validating the file
+    """
 
-        if always_apply and has_languages:
-            errors.append("Rules with alwaysApply=true should not have languages")
-        elif not always_apply and not has_languages:
-            errors.append("Rules must have either languages or alwaysApply=true")
+    path: Path
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    duration_ms: float = 0.0
 
-        # Validate language names if present
-        if has_languages and isinstance(frontmatter["languages"], list):
-            unknown = [
-                lang
-                for lang in frontmatter["languages"]
-                if lang.lower() not in LANGUAGE_TO_EXTENSIONS
-            ]
-            if unknown:
-                warnings.append(f"Unknown languages: {', '.join(unknown)}")
+    @property
+    def filename(self) -> str:
+        """Rule filename (e.g., 'my-rule.md')."""
+        return self.path.name
 
-        # Check content exists
-        if not markdown_content.strip():
-            errors.append("Rule content cannot be empty")
 
-    except Exception as e:
-        errors.append(f"Error reading file: {str(e)}")
+def validate_file(file_path: Path) -> ValidationResult:
+    """
+    Validate a single unified rule file and time it.
 
-    return {"errors": errors, "warnings": warnings}
+    Only the diagnostics are returned, so results are cheap to send back
+    from worker processes.
 
+    Args:
+        file_path: Path to the rule file
 
-def main():
-    """Validate all rules in the rules directory."""
-    rules_dir = Path(sys.argv[1] if len(sys.argv) > 1 else "rules")
+    Returns:
+        ValidationResult of the file
+    """
+    started = time.perf_counter()
+    entry = load_rule(file_path)
+    return ValidationResult(
+        path=Path(file_path),
+        errors=entry.errors,
+        warnings=entry.warnings,
+        duration_ms=(time.perf_counter() - started) * 1000,
+    )
 
-    if not rules_dir.exists():
-        print(f"❌ Directory {rules_dir} does not exist")
-        sys.exit(1)
 
-    # Find all .md files (excluding README)
-    md_files = [f for f in rules_dir.glob("*.md") if f.name.lower() != "readme.md"]
+def validate_rule(file_path: Path) -> dict[str, list[str]]:
+    """Validate a single unified rule file."""
+    result = validate_file(file_path)
+    return {"errors": result.errors, "warnings": result.warnings}
 
-    if not md_files:
-        print(f"❌ No rule files found in {rules_dir}")
-        sys.exit(1)
 
-    print(f"🔍 Validating {len(md_files)} rules in {rules_dir}\n")
+def validate_files(
+    paths: list[Path], jobs: int = 1, fail_fast: bool = False
+) -> list[ValidationResult]:
+    """
+    Validate rule files, optionally in a process pool.
+
+    Results keep the order of paths regardless of the number of jobs.
+
+    Args:
+        paths: Rule files to validate
+        jobs: Number of worker processes (1 validates in the calling process)
+        fail_fast: Stop at the first file with errors; files after it are
+            not validated (pending work in the pool is cancelled)
 
+    Returns:
+        One ValidationResult per validated file, ending with the first
+        failure if fail_fast stopped early
+    """
+    results = []
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            results.append(validate_file(path))
+            if fail_fast and results[-1].errors:
+                break
+        return results
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Small chunks let fail_fast cancel most of the remaining work
+    chunksize = 1 if fail_fast else max(1, len(paths) // (jobs * 4))
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        for result in executor.map(validate_file, paths, chunksize=chunksize):
+            results.append(result)
+            if fail_fast and result.errors:
+                break
+    finally:
+        executor.shutdown(cancel_futures=True)
+    return results
+
+
+def print_validation_report(
+    corpus: RuleCorpus | Iterable[ValidationResult], not_validated: int = 0
+) -> bool:
+    """
+    Print validation results for every rule of a loaded corpus.
+
+    Args:
+        corpus: Loaded rules (or ValidationResults) to report on
+        not_validated: Number of rules skipped after a fail-fast stop,
+            noted in the summary
+
+    Returns:
+        True if no rule has errors
+    """
     passed = 0
     failed = 0
     total_warnings = 0
 
-    for md_file in sorted(md_files):
-        result = validate_rule(md_file)
-        errors = result["errors"]
-        warnings = result["warnings"]
-
-        if errors:
+    for entry in corpus:
+        if entry.errors:
             failed += 1
-            print(f"❌ {md_file.name}")
-            for error in errors:
+            print(f"❌ {entry.filename}")
+            for error in entry.errors:
                 print(f"   - {error}")
         else:
             passed += 1
-            if warnings:
-                print(f"✅ {md_file.name}")
-                for warning in warnings:
-                    print(f"   ⚠️  {warning}")
-                    total_warnings += 1
-            else:
-                print(f"✅ {md_file.name}")
+            print(f"✅ {entry.filename}")
+            for warning in entry.warnings:
+                print(f"   ⚠️  {warning}")
+                total_warnings += 1
 
     # Summary
     print(f"\n📊 Results: {passed} passed, {failed} failed")
     if total_warnings:
         print(f"   Warnings: {total_warnings}")
+    if not_validated:
+        print(f"   Stopped early: {not_validated} rules not validated")
 
     if failed > 0:
         print("\n❌ Validation failed")
-        sys.exit(1)
+        return False
+
+    print("\n✅ All rules valid!")
+    return True
+
+
+def build_json_report(
+    results: list[ValidationResult], total: int, duration_ms: float
+) -> dict:
+    """
+    Build a machine-readable report of validation results.
+
+    Args:
+        results: Validated files in input order
+        total: Number of files that were to be validated
+        duration_ms: Wall time of the whole validation
+
+    Returns:
+        Report dictionary with a 'files' list and a 'summary'
+    """
+    failed = sum(1 for result in results if result.errors)
+    return {
+        "schema": REPORT_SCHEMA,
+        "files": [
+            {
+                "file": result.path.as_posix(),
+                "status": "failed" if result.errors else "passed",
+                "errors": result.errors,
+                "warnings": result.warnings,
+                "duration_ms": round(result.duration_ms, 3),
+            }
+            for result in results
+        ],
+        "summary": {
+            "total": total,
+            "validated": len(results),
+            "passed": len(results) - failed,
+            "failed": failed,
+            "warnings": sum(len(result.warnings) for result in results),
+            "duration_ms": round(duration_ms, 3),
+        },
+    }
+
+
+def build_sarif_report(results: list[ValidationResult], duration_ms: float) -> dict:
+    """
+    Build a SARIF 2.1.0 log of validation results, e.g. for CI annotations.
+
+    Errors and warnings become results located in their rule file; the
+    per-file timings are recorded as artifact properties.
+
+    Args:
+        results: Validated files in input order
+        duration_ms: Wall time of the whole validation
+
+    Returns:
+        SARIF log dictionary
+    """
+    sarif_results = []
+    for index, result in enumerate(results):
+        location = {
+            "physicalLocation": {
+                "artifactLocation": {"uri": result.path.as_posix(), "index": index}
+            }
+        }
+        for level, rule_id, messages in (
+            ("error", SARIF_ERROR_ID, result.errors),
+            ("warning", SARIF_WARNING_ID, result.warnings),
+        ):
+            for message in messages:
+                sarif_results.append(
+                    {
+                        "ruleId": rule_id,
+                        "level": level,
+                        "message": {"text": message},
+                        "locations": [location],
+                    }
+                )
+
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {
+                    "driver": {
+                        "name": SARIF_TOOL_NAME,
+                        "rules": [
+                            {
+                                "id": SARIF_ERROR_ID,
+                                "shortDescription": {
+                                    "text": "Rule file has invalid frontmatter or structure"
+                                },
+                                "defaultConfiguration": {"level": "error"},
+                            },
+                            {
+                                "id": SARIF_WARNING_ID,
+                                "shortDescription": {
+                                    "text": "Rule file has a questionable value"
+                                },
+                                "defaultConfiguration": {"level": "warning"},
+                            },
+                        ],
+                    }
+                },
+                "artifacts": [
+                    {
+                        "location": {"uri": result.path.as_posix()},
+                        "properties": {"durationMs": round(result.duration_ms, 3)},
+                    }
+                    for result in results
+                ],
+                "results": sarif_results,
+                "invocations": [
+                    {
+                        "executionSuccessful": True,
+                        "properties": {"durationMs": round(duration_ms, 3)},
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def main():
+    """Validate all rules in the given rule directories (default: rules)."""
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(
+        description="Validate unified rule files.",
+        epilog="Examples:\n"
+        "  python validate_unified_rules.py rules/\n"
+        "  python validate_unified_rules.py rules/ vendor/pack/ --jobs 0\n"
+        "  python validate_unified_rules.py rules/ --format sarif > validation.sarif\n"
+        "  python validate_unified_rules.py rules/ --fail-fast --format json",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["rules"],
+        help="rule folders or files to validate (default: rules)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes; 0 uses all CPUs (default: 1)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="report format (default: text)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="stop at the first rule with errors",
+    )
+    args = parser.parse_args()
+
+    # Keep stdout parseable in the structured formats
+    messages = sys.stdout if args.format == "text" else sys.stderr
+
+    md_files = []
+    for path in map(Path, args.paths):
+        if not path.exists():
+            print(f"❌ Directory {path} does not exist", file=messages)
+            sys.exit(1)
+        if path.is_file():
+            md_files.append(path)
+            continue
+
+        # Find all .md files (excluding README)
+        files = [f for f in path.glob("*.md") if f.name.lower() != "readme.md"]
+        if not files:
+            print(f"❌ No rule files found in {path}", file=messages)
+            sys.exit(1)
+        md_files.extend(sorted(files))
+
+    if args.format == "text":
+        print(f"🔍 Validating {len(md_files)} rules in {', '.join(args.paths)}\n")
+
+    started = time.perf_counter()
+    results = validate_files(
+        md_files,
+        jobs=args.jobs if args.jobs > 0 else os.cpu_count() or 1,
+        fail_fast=args.fail_fast,
+    )
+    duration_ms = (time.perf_counter() - started) * 1000
+    failed = any(result.errors for result in results)
+
+    if args.format == "json":
+        print(json.dumps(build_json_report(results, len(md_files), duration_ms), indent=2))
+    elif args.format == "sarif":
+        print(json.dumps(build_sarif_report(results, duration_ms), indent=2))
     else:
-        print("\n✅ All rules valid!")
+        print_validation_report(results, len(md_files) - len(results))
+
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Rule File Watcher
+
+Detects added, modified and removed rule files by comparing snapshots of
+their modification time and size. If the optional watchdog package is
+installed, native file system notifications (inotify, FSEvents,
+ReadDirectoryChangesW) wake the watcher, so it does not poll while idle;
+otherwise the snapshot is polled every few tens of milliseconds, which is
+cheap for a few hundred directory entries and needs no platform-specific
+dependencies.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+# (mtime_ns, size) per watched file
+Snapshot = dict[Path, tuple[int, int]]
+
+# Watcher backends; 'auto' uses 'native' if watchdog is installed
+BACKENDS = ("auto", "native", "polling")
+
+# Seconds between safety rescans with native notifications, in case an
+# event is lost (e.g. on network file systems)
+NATIVE_RESCAN_INTERVAL = 1.0
+
+
+def _import_watchdog():
+    """
+    Import the optional watchdog package.
+
+    Returns:
+        Tuple of (Observer class, FileSystemEventHandler class)
+
+    Raises:
+        ImportError: If watchdog is not installed
+    """
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    return Observer, FileSystemEventHandler
+
+
+class RuleWatcher:
+    """
+    Watches directories (optionally with their subfolders) and individual files.
+
+    Bursts of changes, such as an editor writing a temporary file and
+    renaming it into place, are collapsed: a change is only reported once
+    no further change was seen for the debounce interval.
+
+    Example:
+        with RuleWatcher([Path("rules"), Path("more_rules")], recursive=True) as watcher:
+            while True:
+                changed, removed = watcher.wait_for_changes()
+                rebuild(changed, removed)
+    """
+
+    def __init__(
+        self,
+        paths: list[Path],
+        interval: float = 0.05,
+        debounce: float = 0.02,
+        backend: str = "auto",
+        recursive: bool = False,
+    ):
+        """
+        Initialize the watcher and take the initial snapshot.
+
+        Args:
+            paths: Directories and files to watch
+            interval: Seconds between polls
+            debounce: Seconds without further changes before reporting; an
+                editor's write-and-rename settles well within the default
+            backend: 'native' for watchdog notifications, 'polling', or
+                'auto' for native if watchdog is installed, else polling
+            recursive: Also watch the subfolders of the directories (hidden
+                folders such as .git are skipped)
+
+        Raises:
+            ValueError: If the backend is unknown
+            ImportError: If backend is 'native' and watchdog is not installed
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown watcher backend: {backend}")
+        self.paths = [Path(p) for p in paths]
+        self.interval = interval
+        self.debounce = debounce
+        self.recursive = recursive
+        self.current = self.snapshot()
+        self._event = threading.Event()
+        self._observer = None
+        if backend != "polling":
+            try:
+                self._start_observer()
+            except ImportError:
+                if backend == "native":
+                    raise
+        self.backend = "native" if self._observer is not None else "polling"
+
+    def _start_observer(self) -> None:
+        """Schedule watchdog notifications for the folders of the watched paths."""
+        Observer, FileSystemEventHandler = _import_watchdog()
+        event = self._event
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, _):
+                event.set()
+
+        # Folder -> whether its subfolders are watched too
+        folders = {}
+        for path in self.paths:
+            if path.is_dir():
+                folders[path] = folders.get(path, False) or self.recursive
+            else:
+                folders.setdefault(path.parent, False)
+        observer = Observer()
+        handler = _Handler()
+        try:
+            for folder, recursive in sorted(folders.items()):
+                observer.schedule(handler, str(folder), recursive=recursive)
+            observer.start()
+        except OSError:
+            # Missing folder or watch limit reached: keep polling
+            return
+        self._observer = observer
+
+    def close(self) -> None:
+        """Stop native notifications; the watcher can still be polled."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+            self.backend = "polling"
+
+    def __enter__(self) -> "RuleWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _sleep(self, timeout: float) -> None:
+        """Wait for a notification (native) or the timeout (polling)."""
+        if self._observer is None:
+            time.sleep(timeout)
+            return
+        self._event.wait(timeout)
+        self._event.clear()
+
+    def snapshot(self) -> Snapshot:
+        """
+        Stat every watched file.
+
+        Returns:
+            Mapping of file path to (mtime_ns, size)
+        """
+        files = {}
+        for path in self.paths:
+            if path.is_dir():
+                self._scan_folder(path, files)
+            else:
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _scan_folder(self, folder: Path, files: Snapshot) -> None:
+        """Stat the files of a folder, and of its subfolders if recursive."""
+        folders = [folder]
+        while folders:
+            try:
+                with os.scandir(folders.pop()) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            files[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+                        elif (
+                            self.recursive
+                            and not entry.name.startswith(".")
+                            and entry.is_dir(follow_symlinks=False)
+                        ):
+                            folders.append(Path(entry.path))
+            except FileNotFoundError:
+                continue
+
+    @staticmethod
+    def diff(old: Snapshot, new: Snapshot) -> tuple[set[Path], set[Path]]:
+        """
+        Compare two snapshots.
+
+        Returns:
+            Tuple of (added or modified files, removed files)
+        """
+        changed = {path for path, stat in new.items() if old.get(path) != stat}
+        removed = set(old) - set(new)
+        return changed, removed
+
+    def poll(self) -> tuple[set[Path], set[Path]]:
+        """
+        Report changes since the last poll without waiting or debouncing.
+
+        Returns:
+            Tuple of (added or modified files, removed files)
+        """
+        latest = self.snapshot()
+        changed, removed = self.diff(self.current, latest)
+        self.current = latest
+        return changed, removed
+
+    def wait_for_changes(self, timeout: float | None = None) -> tuple[set[Path], set[Path]]:
+        """
+        Block until watched files change and the changes have settled.
+
+        Args:
+            timeout: Seconds to wait for a change, or None to wait forever
+
+        Returns:
+            Tuple of (added or modified files, removed files); both empty
+            if the timeout passed without changes
+        """
+        idle_wait = self.interval if self._observer is None else NATIVE_RESCAN_INTERVAL
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if deadline is None:
+                self._sleep(idle_wait)
+            elif time.monotonic() < deadline:
+                self._sleep(min(idle_wait, deadline - time.monotonic()))
+            else:
+                return set(), set()
+            latest = self.snapshot()
+            if latest == self.current:
+                continue
+
+            # Wait until nothing changed for the debounce interval
+            settled_at = time.monotonic()
+            while True:
+                quiet = time.monotonic() - settled_at
+                if quiet >= self.debounce:
+                    break
+                self._sleep(min(self.interval, self.debounce - quiet))
+                newer = self.snapshot()
+                if newer != latest:
+                    latest = newer
+                    settled_at = time.monotonic()
+
+            changed, removed = self.diff(self.current, latest)
+            self.current = latest
+            if changed or removed:
+                return changed, removed
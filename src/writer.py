@@ -0,0 +1,259 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Output Writer
+
+Writes generated files only when their content changed, committing each
+write atomically so readers never observe a partially written file.
+"""
+
+import os
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+
+# Bytes compared at a time when checking streamed outputs
+_COMPARE_CHUNK_SIZE = 1024 * 1024
+
+# Buffers passed to one writev call (IOV_MAX on Linux and macOS)
+_IOV_MAX = 1024
+
+_default_mode = None
+
+
+def _get_default_mode() -> int:
+    """Return the permission bits a newly created file would get (0o666 & ~umask)."""
+    global _default_mode
+    if _default_mode is None:
+        umask = os.umask(0)
+        os.umask(umask)
+        _default_mode = 0o666 & ~umask
+    return _default_mode
+
+
+def is_unchanged(path: Path, data: bytes) -> bool:
+    """
+    Check whether a file already holds exactly the given bytes.
+
+    The size is compared first so that most changed files are detected
+    without reading them.
+
+    Args:
+        path: File to compare against
+        data: Expected content
+
+    Returns:
+        True if the file exists and its content equals data
+    """
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write a file via a temporary sibling and rename it into place.
+
+    The temporary file lives in the same directory so the final os.replace
+    is atomic. Permissions of an existing file are preserved.
+
+    Args:
+        path: Destination file
+        data: Content to write
+    """
+    atomic_write_parts(path, [data])
+
+
+def atomic_write_parts(path: Path, parts: Sequence[bytes | memoryview]) -> None:
+    """
+    Atomically write a file from several buffers, as atomic_write_bytes.
+
+    The parts are written with scatter I/O (os.writev) instead of being
+    joined first, so a shared or memory-mapped body is not copied.
+
+    Args:
+        path: Destination file
+        parts: Consecutive pieces of the content
+    """
+    path = Path(path)
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = _get_default_mode()
+
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        try:
+            _write_all(fd, parts)
+        finally:
+            os.close(fd)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _write_all(fd: int, parts: Sequence[bytes | memoryview]) -> None:
+    """
+    Write all buffers to a file descriptor, with one writev call per
+    _IOV_MAX buffers where available.
+
+    Args:
+        fd: Open file descriptor
+        parts: Buffers to write in order
+    """
+    views = [memoryview(part) for part in parts if len(part)]
+    try:
+        if not hasattr(os, "writev"):
+            for view in views:
+                while view:
+                    view = view[os.write(fd, view) :]
+            return
+
+        start = 0
+        while start < len(views):
+            written = os.writev(fd, views[start : start + _IOV_MAX])
+            # Skip fully written buffers and resume after a short write
+            while start < len(views) and written >= len(views[start]):
+                written -= len(views[start])
+                start += 1
+            if written:
+                views[start] = views[start][written:]
+    finally:
+        for view in views:
+            view.release()
+
+
+def parts_unchanged(path: Path, parts: Sequence[bytes | memoryview]) -> bool:
+    """
+    Check whether a file already holds the concatenation of the given buffers.
+
+    Like is_unchanged, but compares chunk by chunk so that neither the
+    expected content nor the file is loaded into memory as a whole.
+
+    Args:
+        path: File to compare against
+        parts: Consecutive pieces of the expected content
+
+    Returns:
+        True if the file exists and its content equals the joined parts
+    """
+    # bytes.startswith compares with memcmp; == between bytes and a
+    # memoryview compares element by element and is far slower
+    try:
+        size = os.stat(path).st_size
+        if size != sum(len(part) for part in parts):
+            return False
+        with open(path, "rb") as f:
+            if size <= _COMPARE_CHUNK_SIZE:
+                data = f.read()
+                offset = 0
+                for part in parts:
+                    if not data.startswith(part, offset):
+                        return False
+                    offset += len(part)
+                return len(data) == size
+
+            for part in parts:
+                for start in range(0, len(part), _COMPARE_CHUNK_SIZE):
+                    chunk = part[start : start + _COMPARE_CHUNK_SIZE]
+                    data = f.read(len(chunk))
+                    if len(data) != len(chunk) or not data.startswith(chunk):
+                        return False
+        return True
+    except OSError:
+        return False
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write text as UTF-8 unless the file already contains it.
+
+    Unchanged files are left untouched, so their mtime stays the same and
+    IDE file watchers are not triggered.
+
+    Args:
+        path: Destination file (parent directories are created)
+        content: Text content
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    return write_bytes_if_changed(path, content.encode("utf-8"))
+
+
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Write bytes unless the file already contains them.
+
+    Args:
+        path: Destination file (parent directories are created)
+        data: Content to write
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    path = Path(path)
+    if is_unchanged(path, data):
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(path, data)
+    return True
+
+
+def write_parts_if_changed(path: Path, parts: Sequence[bytes | memoryview]) -> bool:
+    """
+    Write the concatenation of several buffers unless the file already contains it.
+
+    Used for outputs whose body is copied from a memory-mapped rule file.
+
+    Args:
+        path: Destination file (parent directories are created)
+        parts: Consecutive pieces of the content
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    path = Path(path)
+    if parts_unchanged(path, parts):
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_parts(path, parts)
+    return True
+
+
+def write_shared_body(
+    files: Sequence[tuple[Path, bytes, bytes]], body: bytes | memoryview
+) -> list[bool]:
+    """
+    Write several files that each consist of a header, a shared body and a suffix.
+
+    The body is encoded once by the caller and reused for every file, so
+    producing N outputs of the same rule costs N small headers instead of
+    N full copies of the content. Each file is only written if it changed.
+
+    Args:
+        files: Tuples of (destination, header bytes, suffix bytes)
+        body: Body bytes shared by all files
+
+    Returns:
+        For each file, True if it was written, False if it was up to date
+    """
+    return [
+        write_parts_if_changed(path, [header, body, suffix])
+        for path, header, suffix in files
+    ]
@@ -0,0 +1,33 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Shared fixtures of the test suite."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def write_rule():
+    """
+    Return a function writing a minimal rule file.
+
+    The function takes the rules folder (created if missing), the rule ID,
+    its languages and optionally its body; a rule without languages always
+    applies.
+    """
+
+    def write(folder: Path, name: str, languages: list[str], text: str = "Body.") -> Path:
+        folder.mkdir(parents=True, exist_ok=True)
+        listed = "".join(f"- {language}\n" for language in languages)
+        if languages:
+            frontmatter = f"languages:\n{listed}alwaysApply: false"
+        else:
+            frontmatter = "alwaysApply: true"
+        path = folder / f"{name}.md"
+        path.write_text(f"---\ndescription: {name}\n{frontmatter}\n---\n\n{text}\n")
+        return path
+
+    return write
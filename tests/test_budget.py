@@ -0,0 +1,135 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of token budget trimming in convert_rules."""
+
+from pathlib import Path
+
+from budget import RuleSize, estimate_size, plan_budget
+from unified_to_all import SKILL_OUTPUT_PATH, SKILL_TEMPLATE_NAME, convert_rules
+
+TEMPLATE = "# Skill\n\n<!-- LANGUAGE_MAPPINGS_START -->\n<!-- LANGUAGE_MAPPINGS_END -->\n"
+
+
+def _words(count: int) -> str:
+    return " ".join(["word"] * count)
+
+
+def _cursor_globs(output: Path, name: str) -> str:
+    content = (output / "ide_rules" / ".cursor" / "rules" / f"{name}.mdc").read_text()
+    return next(line for line in content.splitlines() if line.startswith("globs:"))
+
+
+def test_estimate_size():
+    assert estimate_size("abcdefgh") == RuleSize(8, 2)
+    assert estimate_size("abc", b"de") == RuleSize(5, 2)
+    # Non-ASCII characters count as one token each
+    assert estimate_size("日本") == RuleSize(6, 2)
+
+
+def test_plan_budget_priority():
+    rules = [
+        ("codeguard-0-large.md", ("python",), RuleSize(0, 60)),
+        ("codeguard-0-small.md", ("python", "go"), RuleSize(0, 30)),
+        ("codeguard-1-important.md", ("python",), RuleSize(0, 50)),
+        ("codeguard-0-always.md", (), RuleSize(0, 10)),
+    ]
+
+    plan = plan_budget(rules, 100)
+
+    # Tier 1 first, then smaller rules; rules that always apply use up
+    # budget in every language and are always kept
+    assert plan == {
+        "codeguard-1-important.md": ("python",),
+        "codeguard-0-small.md": ("python", "go"),
+        "codeguard-0-large.md": (),
+        "codeguard-0-always.md": (),
+    }
+
+
+def test_plan_budget_keeps_languages_with_room():
+    rules = [
+        ("codeguard-1-python.md", ("python",), RuleSize(0, 80)),
+        ("codeguard-0-shared.md", ("python", "go"), RuleSize(0, 40)),
+    ]
+
+    assert plan_budget(rules, 100)["codeguard-0-shared.md"] == ("go",)
+
+
+def test_over_budget_rule_loses_language(tmp_path, write_rule):
+    rules = tmp_path / "rules"
+    rules.mkdir()
+    write_rule(rules, "codeguard-0-a", ["python", "go"], _words(150))
+    write_rule(rules, "codeguard-1-b", ["python"], _words(100))
+
+    # B has the higher tier, so python has no room left for A
+    convert_rules(str(rules), str(tmp_path / "out"), formats=["cursor"], token_budget=300)
+
+    assert "*.py" not in _cursor_globs(tmp_path / "out", "codeguard-0-a")
+    assert "*.go" in _cursor_globs(tmp_path / "out", "codeguard-0-a")
+    assert "*.py" in _cursor_globs(tmp_path / "out", "codeguard-1-b")
+
+
+def test_incremental_run_reconverts_trimmed_rules(tmp_path, write_rule):
+    rules = tmp_path / "rules"
+    rules.mkdir()
+    output = tmp_path / "out"
+    write_rule(rules, "codeguard-0-a", ["python", "go"], _words(150))
+    write_rule(rules, "codeguard-1-b", ["python"], _words(20))
+    convert_rules(
+        str(rules), str(output), incremental=True, formats=["cursor"], token_budget=300
+    )
+    assert "*.py" in _cursor_globs(output, "codeguard-0-a")
+
+    # Growing B pushes python over budget; A is unchanged but must be trimmed
+    write_rule(rules, "codeguard-1-b", ["python"], _words(100))
+    convert_rules(
+        str(rules), str(output), incremental=True, formats=["cursor"], token_budget=300
+    )
+    assert "*.py" not in _cursor_globs(output, "codeguard-0-a")
+
+    # Shrinking B again restores python for A
+    write_rule(rules, "codeguard-1-b", ["python"], _words(20))
+    convert_rules(
+        str(rules), str(output), incremental=True, formats=["cursor"], token_budget=300
+    )
+    assert "*.py" in _cursor_globs(output, "codeguard-0-a")
+
+
+def test_budgeted_run_removes_outputs_of_dropped_rules(tmp_path, write_rule, capsys):
+    rules = tmp_path / "rules"
+    output = tmp_path / "out"
+    write_rule(rules, "codeguard-1-a", ["python"], _words(100))
+    write_rule(rules, "codeguard-0-b", ["python"], _words(150))
+    (rules / SKILL_TEMPLATE_NAME).write_text(TEMPLATE)
+    cursor_rules = output / "ide_rules" / ".cursor" / "rules"
+    skill_rules = output / "skills" / "software-security" / "rules"
+
+    convert_rules(str(rules), str(output), formats=["cursor", "claudecode"])
+    assert (cursor_rules / "codeguard-0-b.mdc").exists()
+    capsys.readouterr()
+
+    # B does not fit next to the higher-tier A
+    results = convert_rules(
+        str(rules), str(output), formats=["cursor", "claudecode"], token_budget=200
+    )
+
+    assert "Converting 2 files from: rules" in capsys.readouterr().out
+    assert results["success"] == ["codeguard-1-a.md"]
+    assert results["removed"] == [
+        "ide_rules/.cursor/rules/codeguard-0-b.mdc",
+        "skills/software-security/rules/codeguard-0-b.md",
+    ]
+    assert (cursor_rules / "codeguard-1-a.mdc").exists()
+    assert not (skill_rules / "codeguard-0-b.md").exists()
+    skill = (output / SKILL_OUTPUT_PATH).read_text()
+    assert "| python | codeguard-1-a.md |" in skill
+
+    # A budget too small for any rule empties the SKILL.md table
+    results = convert_rules(
+        str(rules), str(output), formats=["cursor", "claudecode"], token_budget=10
+    )
+    assert results["success"] == []
+    assert "codeguard-1-a" not in (output / SKILL_OUTPUT_PATH).read_text()
+    assert not any(cursor_rules.iterdir())
@@ -0,0 +1,82 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of the shared output cache."""
+
+import os
+
+from cache import OutputCache
+from formats import create_formats
+from unified_to_all import convert_rules
+
+
+def test_lookup_store_and_miss(tmp_path):
+    cache = OutputCache(tmp_path / "cache")
+    formats = create_formats(["cursor", "copilot"], "1.0.0")
+    outputs = {}
+    for format_handler in formats:
+        output = tmp_path / f"out-{format_handler.get_format_name()}"
+        output.write_text(format_handler.get_format_name())
+        outputs[format_handler] = output
+
+    assert cache.lookup("hash", "a.md", formats) is None
+    cache.store("hash", "a.md", ["python"], outputs, (10, 3))
+
+    cached = cache.lookup("hash", "a.md", formats)
+    assert cached.languages == ["python"]
+    assert cached.size == (10, 3)
+    assert cached.objects["copilot"].read_text() == "copilot"
+
+    # Other content, filename or version is a miss
+    assert cache.lookup("other", "a.md", formats) is None
+    assert cache.lookup("hash", "b.md", formats) is None
+    assert cache.lookup("hash", "a.md", create_formats(["cursor"], "2.0.0")) is None
+    # A format that was never stored makes the whole rule a miss
+    more_formats = create_formats(["cursor", "windsurf"], "1.0.0")
+    assert cache.lookup("hash", "a.md", more_formats) is None
+
+    assert cache.stats == {"hits": 1, "misses": 5, "stored": 1, "evicted": 0}
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = OutputCache(tmp_path / "cache", max_size=150)
+    formats = create_formats(["cursor"], "1.0.0")
+    output = tmp_path / "out.mdc"
+    output.write_bytes(b"x" * 50)
+    cache.store("old", "a.md", [], {formats[0]: output})
+    cache.store("new", "a.md", [], {formats[0]: output})
+    for cached_file in cache.root.rglob("*"):
+        if cached_file.is_file():
+            os.utime(cached_file, (1, 1))
+    assert cache.lookup("new", "a.md", formats) is not None
+
+    assert cache.evict() > 0
+    assert cache.size()[1] <= 150
+    assert cache.lookup("old", "a.md", formats) is None
+    assert cache.lookup("new", "a.md", formats) is not None
+
+
+def test_convert_rules_uses_cache(tmp_path, write_rule):
+    rules = tmp_path / "rules"
+    rules.mkdir()
+    write_rule(rules, "codeguard-0-a", ["python"])
+    write_rule(rules, "codeguard-0-b", ["go"])
+
+    def run(output):
+        cache = OutputCache(tmp_path / "cache")
+        convert_rules(str(rules), str(tmp_path / output), cache=cache, formats=["cursor"])
+        return cache.stats
+
+    assert run("first") == {"hits": 0, "misses": 2, "stored": 2, "evicted": 0}
+    assert run("second") == {"hits": 2, "misses": 0, "stored": 0, "evicted": 0}
+
+    first = tmp_path / "first" / "ide_rules" / ".cursor" / "rules"
+    second = tmp_path / "second" / "ide_rules" / ".cursor" / "rules"
+    for name in ("codeguard-0-a.mdc", "codeguard-0-b.mdc"):
+        assert (first / name).read_bytes() == (second / name).read_bytes()
+
+    write_rule(rules, "codeguard-0-a", ["python"], "Changed.")
+    assert run("third") == {"hits": 1, "misses": 1, "stored": 1, "evicted": 0}
+    third = tmp_path / "third" / "ide_rules" / ".cursor" / "rules"
+    assert "Changed." in (third / "codeguard-0-a.mdc").read_text()
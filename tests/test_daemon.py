@@ -0,0 +1,105 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of the conversion daemon's request handling."""
+
+import pytest
+
+from daemon import ConversionDaemon
+from unified_to_all import SKILL_OUTPUT_PATH, SKILL_TEMPLATE_NAME
+
+TEMPLATE = "# Skill\n\n<!-- LANGUAGE_MAPPINGS_START -->\n<!-- LANGUAGE_MAPPINGS_END -->\n"
+
+
+@pytest.fixture
+def daemon(tmp_path, write_rule):
+    rules = tmp_path / "rules"
+    rules.mkdir()
+    (rules / SKILL_TEMPLATE_NAME).write_text(TEMPLATE)
+    write_rule(rules, "codeguard-0-a", ["python"])
+    write_rule(rules, "codeguard-0-b", ["go"])
+    return ConversionDaemon(str(rules), str(tmp_path / "out"), formats=["claudecode"])
+
+
+def _count_renders(daemon, monkeypatch):
+    rendered = []
+    render = daemon.converter.render
+
+    def counting_render(rule):
+        rendered.append(rule.filename)
+        return render(rule)
+
+    monkeypatch.setattr(daemon.converter, "render", counting_render)
+    return rendered
+
+
+def test_skill_renders_only_changed_rules(daemon, tmp_path, monkeypatch, write_rule):
+    rendered = _count_renders(daemon, monkeypatch)
+
+    assert daemon.handle({"command": "skill"})["ok"]
+    assert sorted(rendered) == ["codeguard-0-a.md", "codeguard-0-b.md"]
+    skill = (tmp_path / "out" / SKILL_OUTPUT_PATH).read_text()
+    assert "| go | codeguard-0-b.md |" in skill
+
+    rendered.clear()
+    assert daemon.handle({"command": "skill"})["ok"]
+    assert rendered == []
+
+    write_rule(tmp_path / "rules", "codeguard-0-b", ["go", "rust"], "A longer body.")
+    assert daemon.handle({"command": "skill"})["ok"]
+    assert rendered == ["codeguard-0-b.md"]
+    skill = (tmp_path / "out" / SKILL_OUTPUT_PATH).read_text()
+    assert "| rust | codeguard-0-b.md |" in skill
+
+    rendered.clear()
+    (tmp_path / "rules" / "codeguard-0-a.md").unlink()
+    assert daemon.handle({"command": "skill"})["ok"]
+    assert rendered == []
+    assert "codeguard-0-a.md" not in (tmp_path / "out" / SKILL_OUTPUT_PATH).read_text()
+    content_hash = daemon.entries["codeguard-0-b.md"].content_hash
+    assert list(daemon.rule_sizes) == [("codeguard-0-b.md", content_hash)]
+
+
+def test_match_and_convert(daemon, tmp_path):
+    response = daemon.handle({"command": "match", "paths": ["src/app.py", "main.go"]})
+    assert response["rules"] == {
+        "src/app.py": ["codeguard-0-a"],
+        "main.go": ["codeguard-0-b"],
+    }
+
+    response = daemon.handle({"command": "convert", "rule": "codeguard-0-a"})
+    assert response["success"] == ["codeguard-0-a.md"]
+
+    response = daemon.handle({"command": "convert", "rule": "missing"})
+    assert not response["ok"]
+    assert "Unknown rule" in response["error"]
+
+
+@pytest.mark.parametrize(
+    "request_object",
+    [
+        {"command": "match", "paths": [1]},
+        {"command": "match", "paths": "src/app.py"},
+        {"command": "match", "path": 1},
+        {"command": "convert", "rule": 5},
+        {"command": "convert", "rule": ["x"]},
+        {"command": ["convert"]},
+    ],
+)
+def test_malformed_requests_are_reported(daemon, request_object):
+    response = daemon.handle(request_object)
+
+    assert response["ok"] is False
+    assert response["error"]
+
+
+def test_unexpected_errors_are_reported(daemon, monkeypatch):
+    def broken(paths):
+        raise KeyError("boom")
+
+    monkeypatch.setattr(daemon, "match", broken)
+    response = daemon.handle({"command": "match", "paths": ["a.py"]})
+
+    assert response["ok"] is False
+    assert "boom" in response["error"]
@@ -0,0 +1,71 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Differential tests of the frontmatter parser against yaml.safe_load."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from utils import _parse_simple_frontmatter, _UnsupportedYaml, parse_frontmatter
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+RULE_FILES = sorted(
+    path
+    for folder in ("rules", "additional_rules")
+    for path in (REPO_ROOT / folder).rglob("*.md")
+    if path.name.lower() != "readme.md"
+)
+
+
+def _frontmatter_text(path: Path) -> str:
+    content = path.read_text(encoding="utf-8")
+    assert content.startswith("---\n"), f"{path} has no frontmatter"
+    return content[4 : content.index("\n---\n")]
+
+
+def test_rule_files_found():
+    assert len(RULE_FILES) > 20
+
+
+@pytest.mark.parametrize(
+    "path", RULE_FILES, ids=[str(p.relative_to(REPO_ROOT)) for p in RULE_FILES]
+)
+def test_shipped_rule_matches_safe_load(path):
+    text = _frontmatter_text(path)
+    expected = yaml.safe_load(text)
+
+    assert parse_frontmatter(text) == expected
+    try:
+        fast = _parse_simple_frontmatter(text)
+    except _UnsupportedYaml:
+        return
+    assert fast == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "description: plain text\nalwaysApply: false",
+        "languages:\n- python\n- c++\nalwaysApply: no",
+        "languages:\n  - go\n  - rust",
+        "description: 'it''s quoted'",
+        'description: "double quoted"',
+        "description: ロギング・監視（構造化テレメトリ）",
+        "languages: []\nalwaysApply: true",
+        "description:\nalwaysApply: off",
+        "# comment\ndescription: after a comment",
+        "version: 1.0",
+        "description: 'a: b'",
+        "description: text # comment",
+        "date: 2025-01-01",
+        "description: >\n  folded text",
+        "languages: [python, go]",
+        "anchor: &a value\nother: *a",
+    ],
+)
+def test_yaml_subset_matches_safe_load(text):
+    assert parse_frontmatter(text) == yaml.safe_load(text)
@@ -0,0 +1,100 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests that brace-compressed globs match the same files as the flat list."""
+
+import fnmatch
+from pathlib import Path
+
+import pytest
+
+from formats import create_formats
+from language_mappings import (
+    LANGUAGE_TO_EXTENSIONS,
+    _expand_braces,
+    _split_globs,
+    compress_globs,
+    globs_to_languages,
+    languages_to_globs,
+)
+from utils import parse_frontmatter
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _rule_languages() -> list[tuple[str, ...]]:
+    """Return the language list of every rule that declares one."""
+    found = set()
+    for folder in ("rules", "additional_rules"):
+        for path in (REPO_ROOT / folder).rglob("*.md"):
+            if path.name.lower() == "readme.md":
+                continue
+            content = path.read_text(encoding="utf-8")
+            frontmatter = parse_frontmatter(content[4 : content.index("\n---\n")])
+            if frontmatter.get("languages"):
+                found.add(tuple(frontmatter["languages"]))
+    return sorted(found)
+
+
+LANGUAGE_LISTS = (
+    [(language,) for language in LANGUAGE_TO_EXTENSIONS]
+    + [tuple(LANGUAGE_TO_EXTENSIONS)]
+    + _rule_languages()
+)
+
+# Every declared extension in several spellings, plus filename patterns
+SAMPLE_PATHS = sorted(
+    {
+        path
+        for extensions in LANGUAGE_TO_EXTENSIONS.values()
+        for extension in extensions
+        if extension.startswith(".")
+        for path in (
+            f"main{extension}",
+            f"src/pkg/main{extension}",
+            f"src/pkg/main{extension.upper()}",
+            f"src/pkg/main{extension}.bak",
+            f"src/pkg/{extension}",
+        )
+    }
+    | {"Dockerfile", "Dockerfile.dev", "deploy/docker-compose.yml", "README", "src/main"}
+)
+
+
+def _matched_paths(globs: str) -> set[str]:
+    """Return the sample paths matched by a glob list, expanding braces."""
+    patterns = [
+        expanded for pattern in _split_globs(globs) for expanded in _expand_braces(pattern)
+    ]
+    return {
+        path
+        for path in SAMPLE_PATHS
+        if any(fnmatch.fnmatchcase(path, pattern) for pattern in patterns)
+    }
+
+
+@pytest.mark.parametrize("languages", LANGUAGE_LISTS, ids=",".join)
+def test_compressed_globs_match_same_files(languages):
+    globs = languages_to_globs(list(languages))
+    compressed = compress_globs(globs)
+
+    expanded = [
+        expanded for pattern in _split_globs(compressed) for expanded in _expand_braces(pattern)
+    ]
+    assert sorted(expanded) == sorted(_split_globs(globs))
+    assert _matched_paths(compressed) == _matched_paths(globs)
+    assert globs_to_languages(compressed) == globs_to_languages(globs)
+
+
+def test_compress_globs_merges_extensions():
+    assert compress_globs("**/*.c,**/*.h,Dockerfile*") == "**/*.{c,h},Dockerfile*"
+    assert compress_globs("**/*.r,**/*.R") == "**/*.{R,r}"
+    assert compress_globs("**/*.py") == "**/*.py"
+    assert compress_globs("") == ""
+
+
+def test_built_in_formats_keep_flat_globs():
+    # No built-in IDE documents brace support in its glob lists
+    for format_handler in create_formats(None, "1.0.0"):
+        assert format_handler.format_globs("**/*.c,**/*.h") == "**/*.c,**/*.h"
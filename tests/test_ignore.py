@@ -0,0 +1,38 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of ignore file parsing and matching."""
+
+from utils import is_ignored, read_ignore_file
+
+
+def test_patterns(tmp_path):
+    (tmp_path / ".codeguardignore").write_text(
+        "# comment\n\n*.tmp\n/drafts\nbuild/\n**/old.md\n!keep.md\n"
+    )
+    patterns = read_ignore_file(tmp_path, ".codeguardignore")
+
+    assert is_ignored(tmp_path / "a" / "x.tmp", False, patterns)
+    assert is_ignored(tmp_path / "drafts", True, patterns)
+    assert not is_ignored(tmp_path / "a" / "drafts", True, patterns)
+    assert is_ignored(tmp_path / "a" / "build", True, patterns)
+    assert not is_ignored(tmp_path / "a" / "build", False, patterns)
+    assert is_ignored(tmp_path / "a" / "b" / "old.md", False, patterns)
+    assert not is_ignored(tmp_path / "keep.md", False, patterns)
+
+
+def test_missing_file(tmp_path):
+    assert read_ignore_file(tmp_path, ".codeguardignore") == []
+
+
+def test_edited_file_is_reread(tmp_path):
+    ignore_file = tmp_path / ".codeguardignore"
+    ignore_file.write_text("*.tmp\n")
+    assert is_ignored(tmp_path / "x.tmp", False, read_ignore_file(tmp_path, ".codeguardignore"))
+
+    # Long-running callers (--watch, the daemon) must see edits
+    ignore_file.write_text("*.bak\n")
+    patterns = read_ignore_file(tmp_path, ".codeguardignore")
+    assert not is_ignored(tmp_path / "x.tmp", False, patterns)
+    assert is_ignored(tmp_path / "x.bak", False, patterns)
@@ -0,0 +1,117 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of the build manifest and incremental conversion."""
+
+import json
+
+import pytest
+
+from manifest import MANIFEST_FILENAME, BuildManifest
+from unified_to_all import convert_rules
+
+FINGERPRINT = {"version": "1.0.0", "generator": 1, "formats": ["cursor"]}
+
+
+def test_manifest_round_trip(tmp_path):
+    (tmp_path / "out.mdc").write_text("x")
+    manifest = BuildManifest(tmp_path / MANIFEST_FILENAME, FINGERPRINT)
+    manifest.record("a.md", "hash-a", ["python"], ["out.mdc"])
+    manifest.save()
+
+    loaded = BuildManifest.load(tmp_path / MANIFEST_FILENAME, FINGERPRINT)
+    assert loaded.is_current("a.md", "hash-a", tmp_path)
+    assert loaded.is_current("a.md", "hash-a", tmp_path, ("python",))
+    assert not loaded.is_current("a.md", "hash-a", tmp_path, ("python", "go"))
+    assert not loaded.is_current("a.md", "hash-b", tmp_path)
+    assert not loaded.is_current("b.md", "hash-a", tmp_path)
+
+    (tmp_path / "out.mdc").unlink()
+    assert not loaded.is_current("a.md", "hash-a", tmp_path)
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["not json", '{"schema": 0, "fingerprint": {}, "rules": {}}', '["a list"]'],
+)
+def test_unusable_manifest_loads_empty(tmp_path, content):
+    (tmp_path / MANIFEST_FILENAME).write_text(content)
+    assert BuildManifest.load(tmp_path / MANIFEST_FILENAME, FINGERPRINT).entries == {}
+
+
+def test_other_fingerprint_loads_empty(tmp_path):
+    manifest = BuildManifest(tmp_path / MANIFEST_FILENAME, FINGERPRINT)
+    manifest.record("a.md", "hash-a", [], [])
+    manifest.save()
+
+    other = dict(FINGERPRINT, formats=["cursor", "copilot"])
+    assert BuildManifest.load(tmp_path / MANIFEST_FILENAME, other).entries == {}
+
+
+def test_prune_keeps_claimed_outputs(tmp_path):
+    for name in ("a.mdc", "shared.mdc"):
+        (tmp_path / name).write_text("x")
+    manifest = BuildManifest(tmp_path / MANIFEST_FILENAME, FINGERPRINT)
+    manifest.record("a.md", "hash-a", [], ["a.mdc", "shared.mdc"])
+    manifest.record("b.md", "hash-b", [], ["shared.mdc"])
+
+    assert manifest.prune({"b.md"}, tmp_path) == ["a.mdc"]
+    assert not (tmp_path / "a.mdc").exists()
+    assert (tmp_path / "shared.mdc").exists()
+
+
+def test_incremental_runs(tmp_path, write_rule):
+    rules = tmp_path / "rules"
+    rules.mkdir()
+    output = tmp_path / "out"
+    cursor_rules = output / "ide_rules" / ".cursor" / "rules"
+    write_rule(rules, "codeguard-0-a", ["python"])
+    write_rule(rules, "codeguard-0-b", ["go"])
+
+    def run(formats=("cursor",)):
+        return convert_rules(str(rules), str(output), incremental=True, formats=list(formats))
+
+    results = run()
+    assert sorted(results["success"]) == ["codeguard-0-a.md", "codeguard-0-b.md"]
+
+    results = run()
+    assert results["success"] == []
+    assert sorted(results["skipped"]) == ["codeguard-0-a.md", "codeguard-0-b.md"]
+
+    # Changed content and a deleted output are converted again
+    write_rule(rules, "codeguard-0-a", ["python"], "New body.")
+    (cursor_rules / "codeguard-0-b.mdc").unlink()
+    results = run()
+    assert sorted(results["success"]) == ["codeguard-0-a.md", "codeguard-0-b.md"]
+    assert "New body." in (cursor_rules / "codeguard-0-a.mdc").read_text()
+
+    # Outputs of deleted rules are removed
+    (rules / "codeguard-0-b.md").unlink()
+    results = run()
+    assert results["removed"] == ["ide_rules/.cursor/rules/codeguard-0-b.mdc"]
+    assert not (cursor_rules / "codeguard-0-b.mdc").exists()
+
+    # Other settings invalidate the manifest
+    results = run(("cursor", "copilot"))
+    assert results["success"] == ["codeguard-0-a.md"]
+    assert results["skipped"] == []
+
+
+def test_single_file_run_keeps_other_rules(tmp_path, write_rule):
+    rules = tmp_path / "rules"
+    rules.mkdir()
+    output = tmp_path / "out"
+    write_rule(rules, "codeguard-0-a", ["python"])
+    write_rule(rules, "codeguard-0-b", ["go"])
+    convert_rules(str(rules), str(output), incremental=True, formats=["cursor"])
+
+    results = convert_rules(
+        str(rules / "codeguard-0-a.md"), str(output), incremental=True, formats=["cursor"]
+    )
+
+    assert results["skipped"] == ["codeguard-0-a.md"]
+    assert results["removed"] == []
+    recorded = json.loads((output / MANIFEST_FILENAME).read_text())["rules"]
+    assert sorted(recorded) == ["codeguard-0-a.md", "codeguard-0-b.md"]
+    assert (output / "ide_rules" / ".cursor" / "rules" / "codeguard-0-b.mdc").exists()
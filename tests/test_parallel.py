@@ -0,0 +1,38 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests that parallel conversion writes the same outputs as a serial run."""
+
+import pytest
+
+from unified_to_all import convert_rules
+
+
+def _outputs(output):
+    return {
+        path.relative_to(output).as_posix(): path.read_bytes()
+        for path in sorted(output.rglob("*"))
+        if path.is_file() and not path.name.startswith(".codeguard")
+    }
+
+
+@pytest.mark.parametrize("options", [{}, {"layout": "aggregated"}, {"token_budget": 10000}])
+def test_jobs_match_serial_run(tmp_path, write_rule, capsys, options):
+    rules = tmp_path / "rules"
+    for index in range(6):
+        languages = ["python", "go"][: index % 3]
+        write_rule(rules, f"codeguard-0-rule{index}", languages, f"Body {index}.")
+    (rules / "codeguard-0-broken.md").write_text("---\ndescription: [\n---\n\nBody.\n")
+
+    serial = convert_rules(str(rules), str(tmp_path / "serial"), formats=["cursor"], **options)
+    serial_out = capsys.readouterr().out
+    parallel = convert_rules(
+        str(rules), str(tmp_path / "parallel"), formats=["cursor"], jobs=2, **options
+    )
+    parallel_out = capsys.readouterr().out
+
+    assert parallel == serial
+    assert len(serial["errors"]) == 1
+    assert parallel_out.replace("parallel", "serial") == serial_out
+    assert _outputs(tmp_path / "parallel") == _outputs(tmp_path / "serial")
@@ -0,0 +1,108 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of the repository language scan."""
+
+import pytest
+
+from repo_scan import scan_repository
+from unified_to_all import SKILL_OUTPUT_PATH, SKILL_TEMPLATE_NAME, convert_rules
+
+
+def _touch(root, *paths):
+    for path in paths:
+        file = root / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text("")
+
+
+def test_extensions_and_languages(tmp_path):
+    _touch(tmp_path, "main.go", "pkg/util.go", "web/app.ts", "README")
+
+    scan = scan_repository(tmp_path)
+
+    assert scan.files == 4
+    assert scan.extensions == {".go": 2, ".ts": 1}
+    assert scan.languages["go"] == 2
+    assert scan.languages["typescript"] == 1
+
+
+def test_filename_pattern_also_counts_extension(tmp_path):
+    _touch(tmp_path, "docker-compose.yml", "Dockerfile")
+
+    scan = scan_repository(tmp_path)
+
+    assert scan.languages["docker"] == 2
+    assert scan.languages["yaml"] == 1
+    assert scan.extensions == {".yml": 1}
+
+
+def test_gitignore_and_vcs_folders_are_skipped(tmp_path):
+    _touch(
+        tmp_path,
+        "main.py",
+        "build/generated.go",
+        "logs/run.log",
+        "src/.gitignore",
+        "src/keep.rs",
+        "src/tmp.rs",
+        ".git/hooks/pre-commit.py",
+    )
+    (tmp_path / ".gitignore").write_text("build/\n*.log\n")
+    (tmp_path / "src" / ".gitignore").write_text("tmp.rs\n")
+
+    scan = scan_repository(tmp_path)
+
+    assert scan.languages["python"] == 1
+    assert scan.languages["rust"] == 1
+    assert "go" not in scan.languages
+    assert ".log" not in scan.extensions
+
+
+def test_present_languages_include_aliases(tmp_path):
+    _touch(tmp_path, "main.cpp")
+
+    present = scan_repository(tmp_path).present_languages()
+
+    assert {"cpp", "c++"} <= present
+
+
+def test_not_a_directory(tmp_path):
+    _touch(tmp_path, "file.py")
+
+    with pytest.raises(NotADirectoryError):
+        scan_repository(tmp_path / "file.py")
+
+
+def test_target_repo_run_removes_outputs_of_excluded_rules(tmp_path, write_rule):
+    rules = tmp_path / "rules"
+    output = tmp_path / "out"
+    write_rule(rules, "codeguard-0-python", ["python"])
+    write_rule(rules, "codeguard-0-go", ["go"])
+    write_rule(rules, "codeguard-1-always", [])
+    (rules / SKILL_TEMPLATE_NAME).write_text(
+        "# Skill\n\n<!-- LANGUAGE_MAPPINGS_START -->\n<!-- LANGUAGE_MAPPINGS_END -->\n"
+    )
+    _touch(tmp_path / "repo", "main.go")
+    formats = ["cursor", "claudecode"]
+    convert_rules(str(rules), str(output), formats=formats)
+
+    # Not incremental: there is no manifest to prune
+    results = convert_rules(
+        str(rules), str(output), formats=formats, target_repo=str(tmp_path / "repo")
+    )
+
+    assert results["excluded"] == ["codeguard-0-python.md"]
+    assert results["removed"] == [
+        "ide_rules/.cursor/rules/codeguard-0-python.mdc",
+        "skills/software-security/rules/codeguard-0-python.md",
+    ]
+    cursor_rules = output / "ide_rules" / ".cursor" / "rules"
+    assert sorted(path.name for path in cursor_rules.iterdir()) == [
+        "codeguard-0-go.mdc",
+        "codeguard-1-always.mdc",
+    ]
+    skill = (output / SKILL_OUTPUT_PATH).read_text()
+    assert "python" not in skill
+    assert "| go | codeguard-0-go.md |" in skill
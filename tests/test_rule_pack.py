@@ -0,0 +1,118 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of compiling rules into a pack and looking them up."""
+
+from pathlib import Path
+
+import pytest
+
+from corpus import RuleCorpus, find_rule_files
+from formats import ProcessedRule
+from rule_pack import RulePack, write_pack
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _rule(
+    rule_id: str, languages: tuple[str, ...] = (), content: str = "Body.\n"
+) -> ProcessedRule:
+    return ProcessedRule(
+        description=f"Rule {rule_id} ✓",
+        languages=languages,
+        always_apply=not languages,
+        content=content,
+        filename=f"{rule_id}.md",
+    )
+
+
+@pytest.fixture
+def pack(tmp_path):
+    rules = [
+        _rule("codeguard-1-credentials"),
+        _rule("codeguard-0-python", ("python",), "Use secrets.\n"),
+        _rule("codeguard-0-c", ("c", "cpp", "c++")),
+        _rule("codeguard-0-web", ("javascript", "python", "typescript")),
+    ]
+    write_pack(rules, tmp_path / "rules.pack")
+    with RulePack(tmp_path / "rules.pack") as pack:
+        yield pack
+
+
+def test_lookup_by_id(pack):
+    assert len(pack) == 4
+    assert list(pack.rule_ids()) == sorted(pack.rule_ids())
+
+    rule = pack.get("codeguard-0-python")
+    assert rule.description == "Rule codeguard-0-python ✓"
+    assert rule.languages == ("python",)
+    assert not rule.always_apply
+    assert rule.content == "Use secrets.\n"
+    assert rule.filename == "codeguard-0-python.md"
+    assert bytes(pack.content("codeguard-0-python")) == b"Use secrets.\n"
+
+    assert pack.get("codeguard-0-c").languages == ("c", "cpp", "c++")
+    assert pack.get("codeguard-1-credentials").always_apply
+    assert "codeguard-0-web" in pack
+    assert "codeguard-0-missing" not in pack
+    with pytest.raises(KeyError):
+        pack.get("codeguard-0-missing")
+
+
+def test_rules_for_language(pack):
+    assert pack.rules_for_language("python") == [
+        "codeguard-0-python",
+        "codeguard-0-web",
+        "codeguard-1-credentials",
+    ]
+    assert pack.rules_for_language("python", include_always=False) == [
+        "codeguard-0-python",
+        "codeguard-0-web",
+    ]
+    assert pack.rules_for_language("c++", include_always=False) == ["codeguard-0-c"]
+    assert pack.rules_for_language("cobol") == ["codeguard-1-credentials"]
+    assert pack.rules_for_language("cobol", include_always=False) == []
+
+
+def test_unchanged_pack_is_not_rewritten(tmp_path):
+    rules = [_rule("codeguard-0-a", ("go",))]
+    assert write_pack(rules, tmp_path / "rules.pack")
+    assert not write_pack(rules, tmp_path / "rules.pack")
+
+
+def test_duplicate_ids(tmp_path):
+    with pytest.raises(ValueError):
+        write_pack([_rule("codeguard-0-a"), _rule("codeguard-0-a")], tmp_path / "rules.pack")
+
+
+@pytest.mark.parametrize("content", [b"", b"not a pack at all, just some text"])
+def test_not_a_pack(tmp_path, content):
+    (tmp_path / "rules.pack").write_bytes(content)
+    with pytest.raises(ValueError):
+        RulePack(tmp_path / "rules.pack")
+
+
+def test_empty_pack(tmp_path):
+    write_pack([], tmp_path / "rules.pack")
+    with RulePack(tmp_path / "rules.pack") as pack:
+        assert len(pack) == 0
+        assert "codeguard-0-a" not in pack
+        assert pack.rules_for_language("python") == []
+
+
+def test_pack_of_repository_rules(tmp_path):
+    corpus = RuleCorpus.load(find_rule_files(REPO_ROOT / "rules"))
+    write_pack(corpus.rules, tmp_path / "rules.pack")
+
+    with RulePack(tmp_path / "rules.pack") as pack:
+        assert len(pack) == len(corpus.rules)
+        for rule in corpus.rules:
+            packed = pack.get(Path(rule.filename).stem)
+            content = rule.content
+            if rule.body is not None:
+                content += rule.body.read_text()
+            assert packed.description == rule.description
+            assert packed.languages == rule.languages
+            assert packed.always_apply == rule.always_apply
+            assert packed.content == content
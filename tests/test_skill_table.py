@@ -0,0 +1,67 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of reading the language table back from SKILL.md."""
+
+from pathlib import Path
+
+import pytest
+
+from unified_to_all import (
+    SKILL_OUTPUT_PATH,
+    load_language_index,
+    parse_skill_table,
+    render_skill_md,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+TABLE = {
+    "c": ["codeguard-0-logging.md", "codeguard-1-safe-c-functions.md"],
+    "go": ["codeguard-0-logging.md"],
+}
+
+TEMPLATE = "# Skill\n\n<!-- LANGUAGE_MAPPINGS_START -->\n<!-- LANGUAGE_MAPPINGS_END -->\n\nMore text\n"
+
+
+def test_round_trip():
+    assert parse_skill_table(render_skill_md(TABLE, TEMPLATE)) == TABLE
+
+
+@pytest.mark.parametrize(
+    "header",
+    ["| 言語 | 適用するルールファイル |", "| Langage | Règles à appliquer |"],
+)
+def test_localized_header(header):
+    content = render_skill_md(TABLE, TEMPLATE).replace(
+        "| Language | Rule Files to Apply |", header
+    )
+    assert parse_skill_table(content) == TABLE
+
+
+def test_no_table():
+    assert parse_skill_table("# Skill\n\n| just | a | row |\n") == {}
+
+
+def test_committed_skill_md_is_parsed():
+    content = (REPO_ROOT / SKILL_OUTPUT_PATH).read_text(encoding="utf-8")
+    table = parse_skill_table(content)
+    assert "codeguard-0-logging.md" in table["c"]
+    assert "codeguard-0-iac-security.md" in table["d"]
+
+
+def test_language_index_seeded_from_localized_skill_md(tmp_path):
+    skill_file = tmp_path / SKILL_OUTPUT_PATH
+    skill_file.parent.mkdir(parents=True)
+    skill_file.write_text(
+        render_skill_md(TABLE, TEMPLATE).replace(
+            "| Language | Rule Files to Apply |", "| 言語 | 適用するルールファイル |"
+        ),
+        encoding="utf-8",
+    )
+
+    index = load_language_index(tmp_path)
+
+    assert index.rules["codeguard-0-logging.md"] == ["c", "go"]
+    assert index.rules["codeguard-1-safe-c-functions.md"] == ["c"]
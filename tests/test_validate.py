@@ -0,0 +1,22 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of the validation report."""
+
+from pathlib import Path
+
+from validate_unified_rules import ValidationResult, print_validation_report
+
+
+def test_stopped_early_is_part_of_the_summary(capsys):
+    results = [ValidationResult(Path("codeguard-0-a.md"), errors=["Missing description"])]
+
+    assert not print_validation_report(results, not_validated=3)
+
+    lines = [line for line in capsys.readouterr().out.splitlines() if line]
+    assert lines[-3:] == [
+        "📊 Results: 0 passed, 1 failed",
+        "   Stopped early: 3 rules not validated",
+        "❌ Validation failed",
+    ]
@@ -0,0 +1,36 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of the version lookup."""
+
+from pathlib import Path
+
+import pytest
+
+import utils
+from utils import get_version, get_version_from_pyproject
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_version_from_source_tree():
+    assert get_version() == get_version_from_pyproject(REPO_ROOT / "pyproject.toml")
+
+
+def test_version_is_resolved_once(monkeypatch):
+    expected = get_version()
+
+    def fail(*_):
+        raise AssertionError("pyproject.toml read again")
+
+    monkeypatch.setattr(utils, "get_version_from_pyproject", fail)
+    assert get_version() == expected
+
+
+def test_pyproject_without_version(tmp_path):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text('[project]\nname = "x"\n')
+
+    with pytest.raises(ValueError):
+        get_version_from_pyproject(pyproject)
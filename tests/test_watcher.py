@@ -0,0 +1,137 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of the rule file watcher."""
+
+import os
+import threading
+import time
+
+import pytest
+
+import watcher as watcher_module
+from unified_to_all import watch_rules
+from watcher import RuleWatcher
+
+
+def _bump(path, content):
+    """Write a file and move its mtime forward, so coarse clocks see a change."""
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_poll_reports_added_modified_and_removed(tmp_path):
+    (tmp_path / "a.md").write_text("a")
+    (tmp_path / "b.md").write_text("b")
+    watcher = RuleWatcher([tmp_path], backend="polling")
+
+    assert watcher.poll() == (set(), set())
+
+    _bump(tmp_path / "a.md", "changed")
+    (tmp_path / "b.md").unlink()
+    (tmp_path / "c.md").write_text("c")
+
+    assert watcher.poll() == ({tmp_path / "a.md", tmp_path / "c.md"}, {tmp_path / "b.md"})
+    assert watcher.poll() == (set(), set())
+
+
+def test_single_file_and_missing_paths(tmp_path):
+    template = tmp_path / "template.md"
+    watcher = RuleWatcher([template, tmp_path / "missing"], backend="polling")
+    assert watcher.current == {}
+
+    template.write_text("x")
+    assert watcher.poll() == ({template}, set())
+
+
+def test_auto_falls_back_to_polling_without_watchdog(tmp_path, monkeypatch):
+    def missing():
+        raise ImportError("No module named 'watchdog'")
+
+    monkeypatch.setattr(watcher_module, "_import_watchdog", missing)
+
+    assert RuleWatcher([tmp_path]).backend == "polling"
+    with pytest.raises(ImportError):
+        RuleWatcher([tmp_path], backend="native")
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        RuleWatcher([tmp_path], backend="inotify")
+
+
+@pytest.mark.parametrize("backend", ["polling", "native"])
+def test_wait_for_changes(tmp_path, backend):
+    if backend == "native":
+        pytest.importorskip("watchdog")
+    with RuleWatcher([tmp_path], interval=0.01, debounce=0.05, backend=backend) as watcher:
+        assert watcher.backend == backend
+        timer = threading.Timer(0.05, (tmp_path / "new.md").write_text, ["x"])
+        timer.start()
+        try:
+            assert watcher.wait_for_changes() == ({tmp_path / "new.md"}, set())
+        finally:
+            timer.join()
+    assert watcher.backend == "polling"
+
+
+def test_recursive_watch_skips_hidden_folders(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / ".git").mkdir()
+    watcher = RuleWatcher([tmp_path], backend="polling", recursive=True)
+
+    (tmp_path / "sub" / "a.md").write_text("a")
+    (tmp_path / ".git" / "HEAD").write_text("x")
+
+    assert watcher.poll() == ({tmp_path / "sub" / "a.md"}, set())
+    assert RuleWatcher([tmp_path], backend="polling").current == {}
+
+
+def test_wait_for_changes_timeout(tmp_path):
+    watcher = RuleWatcher([tmp_path], interval=0.01, backend="polling")
+    assert watcher.wait_for_changes(timeout=0.05) == (set(), set())
+
+
+def test_watch_rules_latency(tmp_path, write_rule):
+    first = tmp_path / "rules"
+    second = tmp_path / "more_rules"
+    write_rule(first, "codeguard-0-a", ["python"])
+    write_rule(second / "web", "codeguard-0-b", ["javascript"])
+    cursor_rules = tmp_path / "out" / "ide_rules" / ".cursor" / "rules"
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch_rules,
+        args=([str(first), str(second)], str(tmp_path / "out")),
+        kwargs={"formats": ["cursor"], "recursive": True, "stop": stop},
+    )
+    thread.start()
+
+    def wait_for(output, text):
+        started = time.monotonic()
+        while not (output.exists() and text in output.read_text()):
+            assert time.monotonic() - started < 5, f"{output} was not regenerated"
+            time.sleep(0.005)
+        return time.monotonic() - started
+
+    try:
+        wait_for(cursor_rules / "codeguard-0-b.mdc", "Body.")
+        latencies = []
+        for edit in range(1, 4):
+            # A new size, so coarse mtimes do not hide the edit
+            body = "Edited" + "!" * edit
+            write_rule(second / "web", "codeguard-0-b", ["javascript"], body)
+            latencies.append(wait_for(cursor_rules / "codeguard-0-b.mdc", body))
+
+        (first / "codeguard-0-a.md").unlink()
+        started = time.monotonic()
+        while (cursor_rules / "codeguard-0-a.mdc").exists():
+            assert time.monotonic() - started < 5, "outputs of a deleted rule were kept"
+            time.sleep(0.005)
+    finally:
+        stop.set()
+        thread.join()
+
+    # One poll interval plus the debounce, with room for a slow machine
+    assert min(latencies) < 0.15
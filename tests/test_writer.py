@@ -0,0 +1,108 @@
+# Copyright 2025 Cisco Systems, Inc. and its affiliates
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests of the atomic, change-detecting output writer."""
+
+import os
+
+import pytest
+
+import writer
+from writer import (
+    atomic_write_bytes,
+    atomic_write_parts,
+    parts_unchanged,
+    write_bytes_if_changed,
+    write_if_changed,
+    write_shared_body,
+)
+
+
+def _temporary_files(folder):
+    return [path.name for path in folder.iterdir() if path.name.endswith(".tmp")]
+
+
+def test_write_if_changed_creates_parents_and_skips_identical(tmp_path):
+    path = tmp_path / "a" / "b" / "rule.md"
+
+    assert write_if_changed(path, "héllo\n")
+    assert path.read_bytes() == "héllo\n".encode("utf-8")
+
+    mtime = path.stat().st_mtime_ns
+    assert not write_if_changed(path, "héllo\n")
+    assert path.stat().st_mtime_ns == mtime
+
+    assert write_if_changed(path, "changed\n")
+    assert path.read_text() == "changed\n"
+
+
+def test_same_size_change_is_detected(tmp_path):
+    path = tmp_path / "rule.md"
+    write_bytes_if_changed(path, b"aaaa")
+
+    assert write_bytes_if_changed(path, b"bbbb")
+    assert path.read_bytes() == b"bbbb"
+
+
+def test_existing_permissions_are_kept(tmp_path):
+    path = tmp_path / "rule.md"
+    path.write_bytes(b"old")
+    os.chmod(path, 0o640)
+
+    atomic_write_bytes(path, b"new")
+
+    assert path.read_bytes() == b"new"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert _temporary_files(tmp_path) == []
+
+
+def test_failed_write_keeps_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "rule.md"
+    path.write_bytes(b"old")
+
+    def fail(fd, parts):
+        os.write(fd, b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(writer, "_write_all", fail)
+    with pytest.raises(OSError):
+        atomic_write_bytes(path, b"new content")
+
+    assert path.read_bytes() == b"old"
+    assert _temporary_files(tmp_path) == []
+
+
+@pytest.mark.parametrize("count", [1, 3, writer._IOV_MAX + 5])
+def test_parts_are_concatenated(tmp_path, count):
+    path = tmp_path / "rule.md"
+    parts = [f"{index},".encode() for index in range(count)] + [b"", memoryview(b"end")]
+
+    atomic_write_parts(path, parts)
+
+    assert path.read_bytes() == b"".join(bytes(part) for part in parts)
+    assert parts_unchanged(path, parts)
+    assert not parts_unchanged(path, parts[:-1] + [b"END"])
+    assert not parts_unchanged(tmp_path / "missing.md", parts)
+
+
+def test_parts_unchanged_large_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "_COMPARE_CHUNK_SIZE", 4)
+    path = tmp_path / "rule.md"
+    parts = [b"header\n", b"x" * 21, b"\nsuffix"]
+    atomic_write_parts(path, parts)
+
+    assert parts_unchanged(path, parts)
+    assert not parts_unchanged(path, [b"header\n", b"x" * 20 + b"y", b"\nsuffix"])
+
+
+def test_write_shared_body(tmp_path):
+    body = memoryview(b"shared body\n")
+    files = [
+        (tmp_path / "a.mdc", b"---\na\n---\n", b""),
+        (tmp_path / "b.md", b"# b\n", b"footer\n"),
+    ]
+
+    assert write_shared_body(files, body) == [True, True]
+    assert (tmp_path / "b.md").read_bytes() == b"# b\nshared body\nfooter\n"
+    assert write_shared_body(files, body) == [False, False]